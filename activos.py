@@ -0,0 +1,73 @@
+# =============================================================================
+# 🖼️ ACTIVOS DE IMAGEN: variantes al tamaño en que se muestran, armadas una vez
+# Clave = archivo + fecha de modificación + ancho: un logo reemplazado se regenera solo
+# =============================================================================
+import base64
+import hashlib
+import io
+import os
+import threading
+import rendimiento as rend
+
+try:
+    from PIL import Image, features
+    FORMATO = "WEBP" if features.check("webp") else "PNG"
+except ImportError:  # Sin Pillow se sirve el archivo original
+    Image = None; FORMATO = None
+
+DIR_ACTIVOS = os.path.join(".cache", "activos")
+ESCALA = 2        # Píxeles reales por píxel CSS (pantallas de alta densidad)
+CALIDAD = 90
+MIME = {"WEBP": "image/webp", "PNG": "image/png", ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+_lock = threading.Lock()
+_variantes = {}  # (ruta, mtime, ancho) -> (bytes, mime)
+_uris = {}       # (ruta, mtime, ancho) -> data URI
+
+def _clave(ruta, ancho):
+    st = os.stat(ruta)
+    return (os.path.abspath(ruta), st.st_mtime_ns, ancho)
+
+def _original(ruta):
+    with open(ruta, "rb") as f: return f.read(), MIME.get(os.path.splitext(ruta)[1].lower(), "image/png")
+
+@rend.medido("activo_variante")
+def _armar(ruta, ancho, clave, directorio):
+    if Image is None: return _original(ruta)
+    nombre = hashlib.sha256(repr(clave + (FORMATO, ESCALA, CALIDAD)).encode()).hexdigest()[:24] + "." + FORMATO.lower()
+    destino = os.path.join(directorio, nombre)
+    if os.path.exists(destino):
+        with open(destino, "rb") as f: return f.read(), MIME[FORMATO]
+    with Image.open(ruta) as im:
+        im.thumbnail((ancho * ESCALA, ancho * ESCALA * 10), Image.LANCZOS)  # Nunca agranda
+        bio = io.BytesIO()
+        im.save(bio, FORMATO, **({'quality': CALIDAD, 'method': 6} if FORMATO == "WEBP" else {'optimize': True}))
+    datos = bio.getvalue()
+    os.makedirs(directorio, exist_ok=True)
+    tmp = destino + f".tmp{os.getpid()}"
+    with open(tmp, "wb") as f: f.write(datos)
+    os.replace(tmp, destino)  # Otro proceso nunca lee una variante a medias
+    return datos, MIME[FORMATO]
+
+def variante(ruta, ancho, directorio=DIR_ACTIVOS):
+    """(bytes, mime) de la imagen para mostrarse a `ancho` px CSS; se arma una vez por archivo y tamaño."""
+    clave = _clave(ruta, ancho)
+    with _lock: v = _variantes.get(clave)
+    rend.cache('activos', v is not None)
+    if v is None:
+        v = _armar(ruta, ancho, clave, directorio)
+        with _lock: _variantes[clave] = v
+    return v
+
+def data_uri(ruta, ancho):
+    """'data:<mime>;base64,...' de la variante (codificado una sola vez por proceso)."""
+    clave = _clave(ruta, ancho)
+    with _lock: uri = _uris.get(clave)
+    if uri is None:
+        datos, mime = variante(ruta, ancho)
+        uri = f"data:{mime};base64,{base64.b64encode(datos).decode()}"
+        with _lock: _uris[clave] = uri
+    return uri
+
+def img_html(ruta, ancho, estilo="text-align: center;"):
+    return f'<div style="{estilo}"><img src="{data_uri(ruta, ancho)}" width="{ancho}"></div>'
@@ -3,15 +3,21 @@
 # =============================================================================
 import streamlit as st
 import pandas as pd
+import html
 import os
-import base64
-import io
+import rendimiento as rend
+import activos
+import fragmentos
+import precalculo
+from datos import zona_carga
+from historial import inicializar, leer_semanal_stream, agregar_semana, agregar_semanas, inferir_semana, clave_temporada, leer_semanales, exportar_xlsx, leer_alias, guardar_alias, unir_nombres, version_db, respaldo_pendiente, marcar_respaldo
+from clubes import cargar_registro, Almacen
 
 # --- CONFIGURACIÓN ---
 st.set_page_config(page_title="Metri KM", page_icon="⏱️", layout="wide")
 
-# --- BASE DE DATOS PRINCIPAL ---
-ARCHIVO = "historico.xlsx"
+# --- CLUBES (cada uno con su histórico; ver clubes.py) ---
+CLUBES = cargar_registro()
 
 # --- LÓGICA INTELIGENTE DE LOGOS ---
 def encontrar_logo():
@@ -21,11 +27,7 @@ def encontrar_logo():
     return None
 
 LOGO_ACTIVO = encontrar_logo()
-LOGO_TYM_FILE = "Tym Logo.jpg"
-
-def get_img_as_base64(file_path):
-    with open(file_path, "rb") as f: data = f.read()
-    return base64.b64encode(data).decode()
+# Los logos se sirven al tamaño en que se muestran (activos.py), no el archivo original en cada rerun
 
 # --- ESTILOS CSS ---
 st.markdown("""
@@ -62,124 +64,126 @@ st.markdown("""
 if 'club_activo' not in st.session_state: st.session_state['club_activo'] = None
 if 'vista_actual' not in st.session_state: st.session_state['vista_actual'] = 'home'
 if 'admin_auth' not in st.session_state: st.session_state['admin_auth'] = False # Estado del candado Admin
+rend.nueva_corrida(st.session_state['vista_actual'])
 
 # --- HELPER SIDEBAR ---
 def render_logos_sidebar():
-    if LOGO_ACTIVO: st.sidebar.image(LOGO_ACTIVO, width=220)
+    if LOGO_ACTIVO: st.sidebar.image(activos.variante(LOGO_ACTIVO, 220)[0], width=220)
     else: st.sidebar.markdown("## 🟠 Metri KM")
 
-    if st.session_state['club_activo'] == "TYM Triathlon":
+    club = CLUBES.get(st.session_state['club_activo'])
+    if club is not None:
         st.sidebar.markdown("---")
-        if os.path.exists(LOGO_TYM_FILE):
+        if club.logo and os.path.exists(club.logo):
             c1,c2,c3 = st.sidebar.columns([1,2,1])
-            with c2: st.image(LOGO_TYM_FILE, width=150)
-        st.sidebar.markdown("<h3 style='text-align: center; color: inherit; font-size: 16px;'>TYM Triathlon</h3>", unsafe_allow_html=True)
+            with c2: st.image(activos.variante(club.logo, 150)[0], width=150)
+        st.sidebar.markdown(f"<h3 style='text-align: center; color: inherit; font-size: 16px;'>{html.escape(club.nombre)}</h3>", unsafe_allow_html=True)
     st.sidebar.markdown("---")
 
 # --- MOTOR DE PROCESAMIENTO DE DATOS ---
-@st.cache_data(ttl=60, show_spinner=False)
-def get_df_safe(nombre_hoja):
-    if not os.path.exists(ARCHIVO): return None
-    try:
-        with pd.ExcelFile(ARCHIVO, engine='openpyxl') as xls:
-            key = next((k for k in xls.sheet_names if nombre_hoja.lower() in k.lower().replace(":","")), None)
-            if key:
-                d = pd.read_excel(xls, sheet_name=key, dtype=str)
-                d.columns = [str(c).strip() for c in d.columns]
-                col = next((c for c in d.columns if c.lower() in ['nombre','deportista','atleta']), None)
-                if col: 
-                    d.rename(columns={col: 'Nombre'}, inplace=True)
-                    # 🔥 FILTRO ANTI-DUPLICADOS: Elimina espacios ocultos y convierte a Formato Título
-                    d['Nombre'] = d['Nombre'].astype(str).str.strip().str.title()
-                return d
+@st.cache_resource(show_spinner=False)
+def get_almacen():
+    # Un almacén por proceso, compartido por todas las sesiones y clubes
+    return Almacen()
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def respaldo_xlsx(db, historico, version):
+    # Una exportación por versión de datos: el aviso de respaldo pendiente no la rearma en cada rerun
+    return exportar_xlsx(db, historico)
+
+def get_cubo(club):
+    # Cada club se siembra desde su historico.xlsx una sola vez y se carga recién cuando alguien entra
+    try: return get_almacen().obtener(club)
     except: return None
-    return None
-
-def clean_time(val):
-    if pd.isna(val) or val == 'NC': return 0.0
-    s = str(val).strip().split(' ')[-1]
-    try:
-        if ':' in s:
-            p = [float(x) for x in s.split(':')]
-            return (p[0]*3600 + p[1]*60 + (p[2] if len(p)>2 else 0)) / 86400.0
-        return 0.0 if float(s) > 100 else float(s)
-    except: return 0.0
 
-def clean_num(val):
-    try: return float(str(val).replace(',','.'))
-    except: return 0.0
+def get_ficha(club, nombre):
+    # La Ficha no arma el plantel: la fila del atleta elegido y los agregados por semana de la versión
+    try: return get_almacen().ficha(club, nombre)
+    except: return None
 
+# Tiempos del cubo en segundos
 def fmt_h_m(v):
-    if v <= 0.0001: return "-"
+    if v < 1: return "-"
     try:
-        tot = v * 24; h = int(tot); m = int((tot - h) * 60)
+        h, m = divmod(int(v) // 60, 60)
         return f"{h}h {m:02d}m"
     except: return "-"
 
 def fmt_pace(v, sport):
-    if v <= 0.00001: return "-"
+    if v < 1: return "-"
     try:
-        tot = v * 24 * 60; m = int(tot); s = int((tot - m) * 60)
+        m, s = divmod(int(v), 60)
         return f"{m}:{s:02d} {'/100m' if sport=='swim' else '/km'}"
     except: return "-"
 
 def fmt_diff(v, is_t=False):
-    if abs(v) < 0.0001: return "-"
+    if abs(v) < (1 if is_t else 0.0001): return "-"
     signo = "+" if v > 0 else "-"
     v = abs(v)
     if is_t:
-        h = int(v * 24); m = int((v * 24 * 60) % 60)
+        h, m = divmod(int(v) // 60, 60)
         return f"{signo}{h}h {m}m"
     return f"{signo}{v:.1f}"
 
-# CARGA GLOBAL DE VISTAS 
-data = {}
-df_base = None
-ultima_sem = "N/A"
-cols_sem = []
-
-if os.path.exists(ARCHIVO):
-    with st.spinner("Cargando datos..."):
-        data = {
-            'Global': {'T': get_df_safe("Tiempo Total"), 'D': get_df_safe("Distancia Total"), 'A': get_df_safe("Altimetría Total")},
-            'Nat': {'T': get_df_safe("Natación"), 'D': get_df_safe("Nat Distancia"), 'R': get_df_safe("Nat Ritmo")},
-            'Bici': {'T': get_df_safe("Ciclismo"), 'D': get_df_safe("Ciclismo Distancia"), 'E': get_df_safe("Ciclismo Desnivel"), 'Max': get_df_safe("Ciclismo Max")},
-            'Trote': {'T': get_df_safe("Trote"), 'D': get_df_safe("Trote Distancia"), 'R': get_df_safe("Trote Ritmo"), 'E': get_df_safe("Trote Desnivel"), 'Max': get_df_safe("Trote Max")}
-        }
-    try:
-        df_base = data['Global']['D']
-        if df_base is not None:
-            cols_sem = [c for c in df_base.columns if c.startswith("Sem")]
-            if cols_sem: ultima_sem = cols_sem[-1] 
-    except:
-        pass
-
 # --- 1. PORTADA ---
 if st.session_state['club_activo'] is None:
     c1, c2, c3 = st.columns([1, 2, 1])
     with c2:
         if LOGO_ACTIVO: 
-            img_b64 = get_img_as_base64(LOGO_ACTIVO)
-            st.markdown(f'<div style="text-align: center;"><img src="data:image/png;base64,{img_b64}" width="300"></div>', unsafe_allow_html=True)
+            st.markdown(activos.img_html(LOGO_ACTIVO, 300), unsafe_allow_html=True)
         else: 
             st.markdown("<div class='cover-title'>Metri KM</div>", unsafe_allow_html=True)
         
         st.markdown("<div class='cover-sub'>Plataforma de Alto Rendimiento</div>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
         
-        club_sel = st.selectbox("Selecciona tu Club:", ["Seleccionar...", "TYM Triathlon"])
+        club_sel = st.selectbox("Selecciona tu Club:", ["Seleccionar..."] + list(CLUBES))
         
-        if club_sel == "TYM Triathlon":
-            if os.path.exists(LOGO_TYM_FILE):
-                img_tym_b64 = get_img_as_base64(LOGO_TYM_FILE)
-                st.markdown(f'<div style="text-align: center; margin: 20px 0;"><img src="data:image/png;base64,{img_tym_b64}" width="150"></div>', unsafe_allow_html=True)
+        if club_sel in CLUBES:
+            logo_club = CLUBES[club_sel].logo
+            if logo_club and os.path.exists(logo_club):
+                st.markdown(activos.img_html(logo_club, 150, "text-align: center; margin: 20px 0;"), unsafe_allow_html=True)
             
             if st.button("INGRESAR 🚀", type="primary", use_container_width=True):
-                st.session_state['club_activo'] = "TYM Triathlon"
+                st.session_state['club_activo'] = club_sel
                 st.session_state['vista_actual'] = 'menu'
                 st.rerun()
     st.stop()
 
+# CARGA DE VISTAS DEL CLUB ACTIVO (solo después de elegir club)
+club = CLUBES.get(st.session_state['club_activo'])
+if club is None:
+    st.session_state['club_activo'] = None; st.session_state['vista_actual'] = 'home'; st.rerun()
+
+data = {}
+hoja_base = None
+ultima_sem = "N/A"
+cols_sem = []
+
+# Solo las vistas que muestran datos cargan el cubo; menú y admin no lo tocan (el respaldo lee el almacén).
+# La Ficha carga solo al atleta elegido (el selector ya está en session_state al rerun): su fila y, del plantel,
+# la media y los puestos por semana que se guardan una vez por versión (agregados_ficha)
+VISTAS_CON_DATOS = {'resumen', 'ficha'}
+hay_datos = club.hay_datos()
+if hay_datos and st.session_state['vista_actual'] in VISTAS_CON_DATOS:
+    with st.spinner("Cargando datos..."), rend.etapa("carga_datos"):
+        if st.session_state['vista_actual'] == 'ficha':
+            elegido = st.session_state.get('atleta_selector')
+            cubo = get_ficha(club, elegido if elegido != " Selecciona..." else None)
+        else: cubo = get_cubo(club)
+        if cubo is not None: data = cubo.vistas()
+    hoja_base = data.get('Global', {}).get('D')
+    if hoja_base is not None:
+        cols_sem = hoja_base.semanas
+        if cols_sem: ultima_sem = cols_sem[-1]
+        # Ventana del "Vs Hist": desde la primera semana de la hoja base hasta la última
+        n_hist = len(cubo.semanas) - cubo.pos_sem[cols_sem[0]] if cols_sem else None
+    if precalculo.en_curso(club.nombre): st.caption("⏳ Preparando las vistas de la última carga en segundo plano; mientras tanto se calculan al abrirlas.")
+
+def html_cacheado(vista, fragmento, construir, atleta=None):
+    # HTML ya armado para esta versión de datos; fusionar una semana cambia la versión e invalida
+    return fragmentos.obtener((club.nombre, vista, ultima_sem, atleta, cubo.version or id(cubo), fragmento), construir)
+
 # ENCABEZADO DE NAVEGACIÓN
 if st.session_state['vista_actual'] != 'home' and st.session_state['vista_actual'] != 'menu':
     if st.button("⬅️ Volver al Menú Principal"):
@@ -199,7 +203,7 @@ if st.session_state['vista_actual'] == 'menu':
         st.session_state['admin_auth'] = False
         st.rerun()
 
-    st.markdown(f"<div class='cover-title'>Hola, Equipo {st.session_state['club_activo']}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='cover-title'>Hola, Equipo {html.escape(st.session_state['club_activo'])}</div>", unsafe_allow_html=True)
     c1, c2, c3 = st.columns(3)
     with c1:
         st.info("📊 **Resumen del Club**\n\nEstadísticas Globales")
@@ -230,12 +234,21 @@ elif st.session_state['vista_actual'] == 'admin':
     
     # --- PANEL ADMIN (SI ESTÁ DESBLOQUEADO) ---
     else:
+        def avisos_nombres(rep):
+            # Resultado de cruzar los nombres de la carga con el plantel del club
+            if rep['unidos']: st.info("🪪 Unidos a deportistas existentes: " + ", ".join(f"{a} → {n}" for a, n in rep['unidos'].items()))
+            if rep['sugeridos']: st.warning("🤔 Nombres parecidos a deportistas del histórico (quedaron aparte hasta que los confirmes abajo): " + ", ".join(f"{a} ≈ {n}" for a, n in rep['sugeridos'].items()))
+            st.session_state['sugerencias_nombres'] = (club.nombre, rep['sugeridos'])
+            if rep['ambiguos']: st.warning("⚠️ Nombres ambiguos (quedaron como deportistas aparte; defina un alias abajo): " + ", ".join(f"{a} ({' / '.join(c)})" for a, c in rep['ambiguos'].items()))
+            if rep['nuevos']: st.caption("🆕 Deportistas nuevos: " + ", ".join(rep['nuevos']))
+
         st.markdown("<div class='main-title'>⚙️ Cargar Nueva Semana</div>", unsafe_allow_html=True)
         st.write("Sube el Excel con los datos de la semana (con todas las columnas) para actualizar el Histórico automáticamente.")
         
-        if not os.path.exists(ARCHIVO):
-            st.error(f"⚠️ No se detecta el archivo base '{ARCHIVO}' en el sistema. Asegúrate de tenerlo en la carpeta de GitHub.")
+        if not hay_datos:
+            st.error(f"⚠️ No se detecta el archivo base '{club.historico}' en el sistema. Asegúrate de tenerlo en la carpeta de GitHub.")
         else:
+            inicializar(club.db, club.historico)  # Sembrar el almacén antes de leer/escribir en él (sin pasar por las vistas)
             col1, col2 = st.columns([1, 2])
             with col1:
                 nombre_sem = st.text_input("Nombre de la Semana (Ej: Sem 06)", placeholder="Sem 06")
@@ -246,86 +259,170 @@ elif st.session_state['vista_actual'] == 'admin':
                 if st.button("🔄 Fusionar y Actualizar Histórico", type="primary"):
                     with st.spinner("Cocinando datos..."):
                         try:
-                            if archivo_subido.name.endswith('.csv'):
-                                df_sem = pd.read_csv(archivo_subido)
-                            else:
-                                df_sem = pd.read_excel(archivo_subido)
-                                
-                            df_sem.columns = [str(c).strip() for c in df_sem.columns]
-                            
-                            mapeo_columnas = {
-                                'Tiempo Total': 'Tiempo Total (hh:mm:ss)', 'Distancia Total': 'Distancia Total (km)', 'Altimetría Total': 'Altimetría Total (m)',
-                                'Natación': 'Nat: Tiempo (hh:mm:ss)', 'Nat Distancia': 'Nat: Distancia (km)', 'Nat Ritmo': 'Nat: Ritmo (min/100m)',
-                                'Ciclismo': 'Ciclismo: Tiempo (hh:mm:ss)', 'Ciclismo Distancia': 'Ciclismo: Distancia (km)', 'Ciclismo Desnivel': 'Ciclismo: KOM/Desnivel (m)', 'Ciclismo Max': 'Ciclismo: Más larga (km)',
-                                'Trote': 'Trote: Tiempo (hh:mm:ss)', 'Trote Distancia': 'Trote: Distancia (km)', 'Trote Desnivel': 'Trote: KOM/Desnivel (m)', 'Trote Ritmo': 'Trote: Ritmo (min/km)', 'Trote Max': 'Trote: Más larga (km)',
-                                'CV': 'CV (Equilibrio)'
-                            }
-                            
-                            xls_hist = pd.ExcelFile(ARCHIVO, engine='openpyxl')
-                            output = io.BytesIO()
-                            
-                            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                                for sheet in xls_hist.sheet_names:
-                                    df_h = pd.read_excel(xls_hist, sheet_name=sheet)
-                                    if sheet in mapeo_columnas and 'Nombre' in df_h.columns:
-                                        col_origen = mapeo_columnas[sheet]
-                                        if col_origen in df_sem.columns:
-                                            # Formatear nombres en el reporte semanal antes de cruzar
-                                            dict_vals = dict(zip(df_sem['Deportista'].astype(str).str.strip().str.title(), df_sem[col_origen]))
-                                            # Formatear nombres en el histórico antes de hacer el cruce
-                                            df_h['Nombre_Clean'] = df_h['Nombre'].astype(str).str.strip().str.title()
-                                            df_h[nombre_sem] = df_h['Nombre_Clean'].map(dict_vals)
-                                            df_h = df_h.drop(columns=['Nombre_Clean'])
-                                            
-                                            if any(x in sheet for x in ['Tiempo', 'Natación', 'Ciclismo', 'Trote', 'Ritmo']) and sheet not in ['Ciclismo Distancia', 'Ciclismo Desnivel', 'Ciclismo Max', 'Trote Distancia', 'Trote Desnivel', 'Trote Max']:
-                                                df_h[nombre_sem] = df_h[nombre_sem].fillna('00:00:00')
-                                            else:
-                                                df_h[nombre_sem] = df_h[nombre_sem].fillna(0)
-                                                
-                                    df_h.to_excel(writer, sheet_name=sheet, index=False)
-                            
-                            st.success("✅ ¡Fusión completada con éxito!")
-                            st.download_button(
-                                label="📥 Descargar historico.xlsx Actualizado",
-                                data=output.getvalue(), file_name="historico.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                type="primary"
-                            )
-                            st.info("👆 Descarga el archivo y súbelo a tu GitHub reemplazando el antiguo. Luego refresca la página.")
+                            # Lectura por bloques (solo columnas mapeadas); filas repetidas de un deportista se agregan.
+                            # Solo se escriben las celdas de la semana nueva; el histórico existente no se reescribe
+                            tabla = leer_semanal_stream(archivo_subido.name, archivo_subido)
+                            rep = agregar_semana(club.db, nombre_sem.strip(), tabla)
+                            fragmentos.invalidar(club.nombre)  # El almacén ve la versión nueva y extiende sus acumulados
+                            precalculo.lanzar(get_almacen(), club)  # Las vistas de la versión nueva se arman en segundo plano
+                            st.success(f"✅ ¡{nombre_sem.strip()} agregada al histórico! ({tabla['nombre'].nunique()} deportistas)")
+                            avisos_nombres(rep)
                             
                         except Exception as e:
                             st.error(f"❌ Error al procesar: {str(e)}")
 
+            # --- CARGA POR LOTE (VARIAS SEMANAS DE UNA VEZ) ---
+            st.markdown("---")
+            st.markdown("**📦 Carga por Lote (varias semanas)**")
+            st.caption("Para completar una temporada o recuperar semanas perdidas. El nombre de cada semana se deduce del archivo (ej: '06 Sem.xlsx' → Sem 06) y se puede corregir antes de fusionar.")
+            archivos_lote = st.file_uploader("Sube los Excel/CSV semanales", type=["xlsx", "csv"], accept_multiple_files=True, key="lote_semanas")
+            if archivos_lote:
+                # Orden de temporada (Sem 52 antes que Sem 01; Sem 6 antes que Sem 10); cada semana queda en su lugar igual
+                inferidas = {a.name: inferir_semana(a.name) for a in archivos_lote}
+                clave = clave_temporada([s for s in inferidas.values() if s])
+                archivos_lote = sorted(archivos_lote, key=lambda a: (clave.get(inferidas[a.name]) is None, clave.get(inferidas[a.name]) or 0, a.name))
+                plan = st.data_editor(pd.DataFrame({'Archivo': [a.name for a in archivos_lote], 'Semana': [inferir_semana(a.name) or "" for a in archivos_lote]}),
+                                      disabled=['Archivo'], hide_index=True, use_container_width=True, key="lote_plan")
+                semanas_lote = [str(s).strip() for s in plan['Semana']]
+                if any(not s for s in semanas_lote): st.warning("⚠️ Falta el nombre de semana de algún archivo.")
+                elif len(set(semanas_lote)) < len(semanas_lote): st.warning("⚠️ Hay semanas repetidas en el lote.")
+                elif st.button(f"🔄 Fusionar {len(semanas_lote)} semanas", type="primary"):
+                    with st.spinner("Cocinando datos..."):
+                        try:
+                            # Parseo en paralelo; la escritura es una sola transacción (todo el lote o nada)
+                            tablas = leer_semanales([(a.name, a.getvalue()) for a in archivos_lote])
+                            rep = agregar_semanas(club.db, list(zip(semanas_lote, tablas)))
+                            fragmentos.invalidar(club.nombre)  # El almacén ve la versión nueva y extiende sus acumulados
+                            precalculo.lanzar(get_almacen(), club)  # Las vistas de la versión nueva se arman en segundo plano
+                            st.success(f"✅ {len(semanas_lote)} semanas agregadas al histórico: {', '.join(semanas_lote)}")
+                            avisos_nombres(rep)
+                        except Exception as e:
+                            st.error(f"❌ Error al procesar: {str(e)}")
+
+            # --- RESPALDO DEL HISTÓRICO (OBLIGATORIO TRAS CADA FUSIÓN) ---
+            # historico.db vive en el disco del servidor: un reinicio del hosting lo borra y se vuelve a sembrar
+            # desde el historico.xlsx del repo. Hasta subir el Excel exportado, las fusiones siguen pendientes
+            st.markdown("---")
+            st.markdown("**📤 Respaldo del Histórico**")
+            pendientes = respaldo_pendiente(club.db)
+            if pendientes: st.warning(f"⚠️ {pendientes} fusión(es) sin respaldar. El servidor no conserva las semanas fusionadas si se reinicia: descarga historico.xlsx y súbelo a tu GitHub reemplazando el antiguo.")
+            else: st.caption("✅ El último historico.xlsx descargado tiene todas las semanas fusionadas.")
+            version = version_db(club.db)
+            with st.spinner("Exportando..."):
+                st.download_button(
+                    label="📥 Descargar historico.xlsx Actualizado",
+                    data=respaldo_xlsx(club.db, club.historico, version), file_name=os.path.basename(club.historico),
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    type="primary" if pendientes else "secondary", on_click=marcar_respaldo, args=(club.db, version)
+                )
+
+            # --- PRECÁLCULO DE LAS VISTAS (TRAS CADA FUSIÓN) ---
+            pre = precalculo.estado(club.nombre)
+            if pre is not None:
+                st.markdown("---")
+                if pre['error']: st.error(f"❌ Precálculo de vistas: {pre['error']} (las vistas se calculan al abrirlas)")
+                elif pre['fin'] is None:
+                    st.progress(pre['hecho'] / pre['total'], text=f"⚙️ Preparando vistas de la versión nueva: {pre['etapa']} ({pre['hecho']}/{pre['total']})")
+                    if st.button("🔄 Ver avance"): st.rerun()
+                else: st.caption(f"✅ Vistas de la versión {pre['version']} listas ({pre['total']} partes en {pre['fin'] - pre['inicio']:.1f} s)")
+
+            # --- PARECIDOS POR CONFIRMAR (NUNCA SE UNEN SOLOS: 'Mario' ≈ 'María') ---
+            club_sug, sugeridos = st.session_state.get('sugerencias_nombres', (None, {}))
+            if club_sug == club.nombre and sugeridos:
+                st.markdown("---")
+                st.markdown("**🤔 Nombres Parecidos de la Última Fusión**")
+                st.caption("Quedaron como deportistas aparte. Marca los que son la misma persona: sus semanas pasan al deportista del histórico y el nombre queda como alias.")
+                conf = st.data_editor(pd.DataFrame({'Unir': False, 'En la carga': list(sugeridos), 'Deportista del histórico': list(sugeridos.values())}),
+                                      disabled=['En la carga'], hide_index=True, use_container_width=True, key="sugerencias_editor")
+                if st.button("✅ Confirmar uniones"):
+                    pares = {o: str(d).strip() for u, o, d in conf.itertuples(index=False) if u and pd.notna(d) and str(d).strip()}
+                    if pares:
+                        unir_nombres(club.db, pares); fragmentos.invalidar(club.nombre)
+                        precalculo.lanzar(get_almacen(), club)
+                    st.session_state['sugerencias_nombres'] = (None, {})
+                    st.success(f"✅ {len(pares)} nombre(s) unidos al histórico.")
+
+            # --- ALIAS DE NOMBRES (PERSISTENTES POR CLUB) ---
+            st.markdown("---")
+            st.markdown("**🪪 Alias de Nombres**")
+            st.caption("Cómo aparece un deportista en las cargas → su nombre en el histórico. Los parecidos confirmados se agregan solos.")
+            alias = st.data_editor(leer_alias(club.db), num_rows="dynamic", hide_index=True, key="alias_nombres")
+            if st.button("💾 Guardar alias"):
+                guardar_alias(club.db, alias.dropna())
+                st.success(f"✅ {len(alias.dropna())} alias guardados.")
+
+        # --- PANEL DE RENDIMIENTO ---
+        st.markdown("---")
+        st.markdown("**📈 Rendimiento**")
+        r = rend.resumen()
+        k1, k2, k3 = st.columns(3)
+        k1.metric("Memoria (RSS)", f"{r['mem_mb']:.0f} MB" if r['mem_mb'] else "-")
+        k2.metric("Reruns registrados", len(r['corridas']))
+        c_cubo = r['cache'].get('almacen')
+        k3.metric("Aciertos caché de datos", f"{c_cubo['tasa']:.0%}" if c_cubo else "-")
+        almacen = get_almacen()
+        st.caption(f"Fragmentos HTML en caché: {fragmentos.cantidad()}")
+        if os.path.exists(club.db): st.caption(f"Versión de datos de {club.nombre}: {version_db(club.db)} (id del almacén : fusiones)")
+        st.caption(f"Clubes en memoria: {', '.join(almacen.cargados()) or '-'} ({almacen.bytes_en_uso() / 2**20:.1f} MB de {almacen.presupuesto / 2**20:.0f} MB)")
+        if r['etapas']:
+            st.caption("Tiempos por etapa (ms, acumulados desde el arranque del servidor; las etapas anidadas incluyen a las internas)")
+            st.dataframe(pd.DataFrame(r['etapas']).T.assign(total_s=lambda d: d['total_s']*1000, prom_s=lambda d: d['prom_s']*1000, max_s=lambda d: d['max_s']*1000)
+                         .rename(columns={'veces': 'Veces', 'total_s': 'Total', 'prom_s': 'Promedio', 'max_s': 'Máximo'}).round(2), use_container_width=True)
+        if r['cache']:
+            st.caption("Cachés")
+            st.dataframe(pd.DataFrame(r['cache']).T.rename(columns={'aciertos': 'Aciertos', 'fallos': 'Fallos', 'tasa': 'Tasa'}), use_container_width=True)
+        corridas = [{'Inicio': c['inicio'], 'Vista': c['vista'], 'Memoria MB': round(c['mem_mb'] or 0), **{k: round(v*1000, 2) for k, v in c['etapas'].items()}}
+                    for c in reversed(r['corridas'])]
+        if corridas:
+            st.caption("Últimos reruns (ms por etapa)")
+            st.dataframe(pd.DataFrame(corridas), use_container_width=True, hide_index=True)
+        c1, c2 = st.columns(2)
+        with c1: st.download_button("📥 Exportar JSON", data=rend.exportar_json(), file_name="rendimiento.json", mime="application/json")
+        with c2:
+            if st.button("🧹 Reiniciar contadores"): rend.reiniciar(); st.rerun()
+
 # 3. RESUMEN DEL CLUB
 elif st.session_state['vista_actual'] == 'resumen':
     render_logos_sidebar()
     if st.sidebar.button("🏠 Cerrar Sesión"):
         st.session_state['club_activo'] = None; st.session_state['vista_actual'] = 'home'; st.rerun()
 
-    if df_base is None: st.warning("No hay datos cargados."); st.stop()
+    if hoja_base is None: st.warning("No hay datos cargados."); st.stop()
     st.markdown(f"<div class='main-title'>📊 Resumen Ejecutivo ({ultima_sem})</div>", unsafe_allow_html=True)
     
+    @rend.medido("agregacion_resumen")
     def calc_tot(df, is_t=False):
-        if df is None or ultima_sem not in df.columns: return 0
-        return sum([clean_time(x) if is_t else clean_num(x) for x in df[ultima_sem]])
+        if df is None or not df.tiene(ultima_sem): return 0
+        return float(df.col(ultima_sem).sum())
 
-    tt = calc_tot(data['Global']['T'], True); td = calc_tot(data['Global']['D'], False)
-    act = sum(1 for x in data['Global']['D'][ultima_sem] if clean_num(x) > 0.1)
-    
+    def kpis_club():
+        pre = precalculo.kpis(club.nombre, cubo.version)  # Listos si el precálculo de la fusión ya pasó por acá
+        if pre is not None: tt, td, act = pre['T'], pre['D'], pre['activos']
+        else:
+            tt = calc_tot(data['Global']['T'], True); td = calc_tot(data['Global']['D'], False)
+            act = int((data['Global']['D'].col(ultima_sem) > 0.1).sum())
+        return (f"<div class='kpi-club-box'><div class='kpi-club-val'>{fmt_h_m(tt)}</div><div class='kpi-club-lbl'>Tiempo Total</div></div>",
+                f"<div class='kpi-club-box'><div class='kpi-club-val'>{td:,.0f} km</div><div class='kpi-club-lbl'>Distancia Total</div></div>",
+                f"<div class='kpi-club-box'><div class='kpi-club-val'>{act}</div><div class='kpi-club-lbl'>Activos</div></div>")
+
+    cajas = html_cacheado('resumen', 'kpis', kpis_club)
     k1, k2, k3 = st.columns(3)
-    with k1: st.markdown(f"<div class='kpi-club-box'><div class='kpi-club-val'>{fmt_h_m(tt)}</div><div class='kpi-club-lbl'>Tiempo Total</div></div>", unsafe_allow_html=True)
-    with k2: st.markdown(f"<div class='kpi-club-box'><div class='kpi-club-val'>{td:,.0f} km</div><div class='kpi-club-lbl'>Distancia Total</div></div>", unsafe_allow_html=True)
-    with k3: st.markdown(f"<div class='kpi-club-box'><div class='kpi-club-val'>{act}</div><div class='kpi-club-lbl'>Activos</div></div>", unsafe_allow_html=True)
+    with k1: st.markdown(cajas[0], unsafe_allow_html=True)
+    with k2: st.markdown(cajas[1], unsafe_allow_html=True)
+    with k3: st.markdown(cajas[2], unsafe_allow_html=True)
 
     st.markdown("<h3 style='margin-top:20px;'>🏆 Top 10: Mejores Desempeños</h3>", unsafe_allow_html=True)
     def top10(df, tit, is_t=False, u=""):
-        if df is None or ultima_sem not in df.columns: return
-        d = df.copy(); d['v'] = d[ultima_sem].apply(lambda x: clean_time(x) if is_t else clean_num(x))
-        d = d[d['v']>0.001].sort_values('v', ascending=False).head(10)
+        if df is None or not df.tiene(ultima_sem): return
+        @rend.medido("html_top10")
+        def tabla():
+            v = df.col(ultima_sem); nom = df.nombres
+            idx = df.top(ultima_sem)  # Precalculado por versión de datos (selección parcial)
+            h = "<table class='top10-table'>"
+            for i, j in enumerate(idx, 1): h += f"<tr><td style='width:30px; font-weight:bold; color:var(--primary-orange);'>#{i}</td><td>{nom[j]}</td><td style='text-align:right; font-weight:bold; color:#333 !important;'>{fmt_h_m(v[j]) if is_t else f'{v[j]:.1f} {u}'}</td></tr>"
+            return h+"</table><br>"
         st.markdown(f"<div class='top10-header'>{tit}</div>", unsafe_allow_html=True)
-        h = "<table class='top10-table'>"
-        for i, r in enumerate(d.itertuples(), 1): h += f"<tr><td style='width:30px; font-weight:bold; color:var(--primary-orange);'>#{i}</td><td>{r.Nombre}</td><td style='text-align:right; font-weight:bold; color:#333 !important;'>{fmt_h_m(r.v) if is_t else f'{r.v:.1f} {u}'}</td></tr>"
-        st.markdown(h+"</table><br>", unsafe_allow_html=True)
+        st.markdown(html_cacheado('resumen', ('top10', df.metrica), tabla), unsafe_allow_html=True)
 
     c1, c2, c3 = st.columns(3)
     with c1: top10(data['Global']['T'], "⏱️ Tiempo Total", True)
@@ -350,34 +447,25 @@ elif st.session_state['vista_actual'] == 'resumen':
     cc1, cc2 = st.columns([1, 2])
     with cc1:
         with st.expander("🚨 Ver Semáforo de Desbalance", expanded=False):
-            st.caption("Atletas activos sin disciplina.")
-            alertas_html = ""
-            df_act = data['Global']['D']
-            if df_act is not None:
-                for _, row in df_act.iterrows():
-                    nom = row['Nombre']
-                    if clean_num(row[ultima_sem]) > 0: 
-                        nat_val = 0; bici_val = 0; trote_val = 0
-                        if data['Nat']['D'] is not None:
-                            r = data['Nat']['D'][data['Nat']['D']['Nombre']==nom]
-                            if not r.empty: nat_val = clean_num(r[ultima_sem].values[0])
-                        if data['Bici']['D'] is not None:
-                            r = data['Bici']['D'][data['Bici']['D']['Nombre']==nom]
-                            if not r.empty: bici_val = clean_num(r[ultima_sem].values[0])
-                        if data['Trote']['D'] is not None:
-                            r = data['Trote']['D'][data['Trote']['D']['Nombre']==nom]
-                            if not r.empty: trote_val = clean_num(r[ultima_sem].values[0])
-
-                        missing = []
-                        if nat_val == 0: missing.append("Agua")
-                        if bici_val == 0: missing.append("Bici")
-                        if trote_val == 0: missing.append("Trote")
-                        
-                        if missing:
-                            alertas_html += f"<div class='alert-box alert-red'>{nom}: Sin {' / '.join(missing)}</div>"
-            
-            if alertas_html == "": alertas_html = "<div style='color:green;'>✅ Todos cumplieron.</div>"
-            st.markdown(alertas_html, unsafe_allow_html=True)
+            st.caption("Atletas activos sin disciplina (entre paréntesis, semanas seguidas sin ella).")
+            @rend.medido("semaforo")
+            def semaforo():
+                alertas_html = ""; rachas_html = ""
+                df_act = data['Global']['D']
+                if df_act is not None:
+                    # Faltas y rachas de todas las semanas, precalculadas por versión de datos (datos.Cumplimiento)
+                    cump = cubo.cumplimiento
+                    for i, faltas in cump.alertas(cubo.pos_sem[ultima_sem], df_act.filas):
+                        missing = [d + (f" ({r} sem)" if r > 1 else "") for d, r in faltas]
+                        alertas_html += f"<div class='alert-box alert-red'>{cubo.nombres[i]}: Sin {' / '.join(missing)}</div>"
+                    rachas = cump.temporada()
+                    if rachas:
+                        rachas_html = "<div style='margin-top:10px; font-weight:bold;'>📅 Rachas más largas de la temporada</div>"
+                        rachas_html += "".join(f"<div class='alert-box'>{cubo.nombres[i]}: {r} sem seguidas sin {d}</div>" for i, d, r in rachas)
+
+                if alertas_html == "": alertas_html = "<div style='color:green;'>✅ Todos cumplieron.</div>"
+                return alertas_html + rachas_html
+            st.markdown(html_cacheado('resumen', 'semaforo', semaforo), unsafe_allow_html=True)
 
     with cc2:
         st.markdown("**🔥 El Podio de Resistencia (Sesión Más Larga)**")
@@ -388,11 +476,11 @@ elif st.session_state['vista_actual'] == 'resumen':
 # 4. FICHA INDIVIDUAL
 elif st.session_state['vista_actual'] == 'ficha':
     st.markdown(f"<div class='main-title'>REPORTE INDIVIDUAL</div>", unsafe_allow_html=True)
-    if df_base is None: st.warning("No hay datos cargados."); st.stop()
+    if hoja_base is None: st.warning("No hay datos cargados."); st.stop()
     
     with st.container():
         st.info("👇 **Busca tu nombre aquí:**")
-        nombres = sorted([str(x) for x in df_base['Nombre'].unique() if str(x).lower() not in ['nan','0']])
+        nombres = sorted(str(x) for x in hoja_base.nombres)
         nombres.insert(0, " Selecciona...")
         sel = st.selectbox("Atleta:", nombres, key="atleta_selector", label_visibility="collapsed")
     
@@ -404,46 +492,65 @@ elif st.session_state['vista_actual'] == 'ficha':
     if sel == " Selecciona...":
         st.info("👈 Selecciona tu nombre en el buscador de arriba.")
     else:
+        atleta = cubo.buscar(sel)  # Fila del atleta en el cubo, compartida por todas las hojas
+
+        @rend.medido("ranking")
         def get_rank(df):
-            if df is None or ultima_sem not in df.columns: return "-"
-            d = df.copy()
-            it = ':' in str(d[ultima_sem].iloc[0])
-            d['v'] = d[ultima_sem].apply(lambda x: clean_time(x) if it else clean_num(x))
-            d['r'] = d['v'].rank(ascending=False, method='min')
-            mask = d['Nombre'].astype(str).str.lower() == str(sel).lower()
-            return int(d[mask]['r'].values[0]) if not d[mask].empty else "-"
+            if df is None or not df.tiene(ultima_sem) or not df.contiene(atleta): return "-"
+            return df.rango(atleta, ultima_sem)
 
-        rd = get_rank(data['Global']['D'])
-        rt = get_rank(data['Global']['T'])
+        def ranking_html():
+            rd = get_rank(data['Global']['D'])
+            rt = get_rank(data['Global']['T'])
+            h = f"<div class='rank-container'><span class='rank-badge-lg'>#{rd} en Distancia</span><span class='rank-badge-lg'>#{rt} en Tiempo</span></div>"
+            if not data['Global']['D'].contiene(atleta): return h, None
+            tray = " → ".join(f"{s.replace('Sem ', 'S')}: #{r}" for s, r in data['Global']['D'].trayectoria(atleta))
+            return h, f"<div class='comp-text'>📈 Trayectoria en Distancia: {tray}</div>"
 
         st.markdown(f"<div class='sub-title'>Atleta: {sel} | Semana: {ultima_sem}</div>", unsafe_allow_html=True)
         st.markdown("<div class='rank-section-title'>🏆 RANKING EN EL CLUB</div>", unsafe_allow_html=True)
-        st.markdown(f"<div class='rank-container'><span class='rank-badge-lg'>#{rd} en Distancia</span><span class='rank-badge-lg'>#{rt} en Tiempo</span></div>", unsafe_allow_html=True)
+        rank_html, tray_html = html_cacheado('ficha', 'ranking', ranking_html, sel)
+        st.markdown(rank_html, unsafe_allow_html=True)
+        if tray_html: st.markdown(tray_html, unsafe_allow_html=True)
 
+        @rend.medido("kpi")
         def kpi(cat, k, is_t=False):
             df = data[cat].get(k)
             if df is None: return 0,0,0
-            vt = [clean_time(x) if is_t else clean_num(x) for x in df[ultima_sem]] if ultima_sem in df.columns else []
-            at = sum(vt)/len(vt) if vt else 0
-            row = df[df['Nombre'].astype(str).str.lower() == str(sel).lower()]
+            hay_sem = df.tiene(ultima_sem)
+            at = df.media_semana(ultima_sem) if hay_sem else 0
             val, ah = 0, 0
-            if not row.empty:
-                val = clean_time(row[ultima_sem].values[0]) if is_t else clean_num(row[ultima_sem].values[0])
-                h_vals = [clean_time(row[c].values[0]) if is_t else clean_num(row[c].values[0]) for c in cols_sem if c in row.columns]
-                ah = sum(h_vals)/len(h_vals) if h_vals else 0
+            if df.contiene(atleta):
+                val = df.valor(atleta, ultima_sem) if hay_sem else 0
+                ah = df.media(atleta, n_hist)  # Sumas acumuladas del cubo: sin recorrer las semanas
             return val, at, ah
 
-        tv, ta, th = kpi('Global', 'T', True)
-        dv, da, dh = kpi('Global', 'D', False)
-        av, aa, ah = kpi('Global', 'A', False)
-
+        def forma(cat, k, fmt):
+            # Forma reciente: promedio de las últimas 4 y 12 semanas
+            df = data[cat].get(k)
+            if df is None or not df.contiene(atleta): return ""
+            return f"<div class='comp-text'>🔁 4 sem: {fmt(df.media(atleta, 4))} | 12 sem: {fmt(df.media(atleta, 12))}</div>"
+
+        def tarjetas():
+            tv, ta, th = kpi('Global', 'T', True)
+            dv, da, dh = kpi('Global', 'D', False)
+            av, aa, ah = kpi('Global', 'A', False)
+            return (f"<div class='card-box'><div class='stat-label'>⏱️ Tiempo</div><div class='stat-value'>{fmt_h_m(tv)}</div><div class='comp-text'>👥 {fmt_diff(tv-ta, True)} | 📅 {fmt_diff(tv-th, True)}</div>{forma('Global', 'T', fmt_h_m)}</div>",
+                    f"<div class='card-box'><div class='stat-label'>📏 Distancia</div><div class='stat-value'>{dv:.1f} km</div><div class='comp-text'>👥 {fmt_diff(dv-da)} | 📅 {fmt_diff(dv-dh)}</div>{forma('Global', 'D', lambda x: f'{x:.1f} km')}</div>",
+                    f"<div class='card-box'><div class='stat-label'>⛰️ Altimetría</div><div class='stat-value'>{av:.0f} m</div><div class='comp-text'>Acumulado Semanal</div></div>")
+
+        cards = html_cacheado('ficha', 'tarjetas', tarjetas, sel)
         c1, c2, c3 = st.columns(3)
-        with c1: st.markdown(f"<div class='card-box'><div class='stat-label'>⏱️ Tiempo</div><div class='stat-value'>{fmt_h_m(tv)}</div><div class='comp-text'>👥 {fmt_diff(tv-ta, True)} | 📅 {fmt_diff(tv-th, True)}</div></div>", unsafe_allow_html=True)
-        with c2: st.markdown(f"<div class='card-box'><div class='stat-label'>📏 Distancia</div><div class='stat-value'>{dv:.1f} km</div><div class='comp-text'>👥 {fmt_diff(dv-da)} | 📅 {fmt_diff(dv-dh)}</div></div>", unsafe_allow_html=True)
-        with c3: st.markdown(f"<div class='card-box'><div class='stat-label'>⛰️ Altimetría</div><div class='stat-value'>{av:.0f} m</div><div class='comp-text'>Acumulado Semanal</div></div>", unsafe_allow_html=True)
+        with c1: st.markdown(cards[0], unsafe_allow_html=True)
+        with c2: st.markdown(cards[1], unsafe_allow_html=True)
+        with c3: st.markdown(cards[2], unsafe_allow_html=True)
 
         def draw_disc(tit, icon, cat, xtype):
             st.markdown(f"<div class='disc-header'>{icon} {tit}</div>", unsafe_allow_html=True)
+            st.markdown(html_cacheado('ficha', cat, lambda: tabla_disc(cat, xtype), sel), unsafe_allow_html=True)
+
+        @rend.medido("html_ficha")
+        def tabla_disc(cat, xtype):
             t_v, t_a, t_h = kpi(cat, 'T', True)
             d_v, d_a, d_h = kpi(cat, 'D', False)
             
@@ -462,8 +569,8 @@ elif st.session_state['vista_actual'] == 'ficha':
             if xtype == 'elev': 
                 e_v, e_a, e_h = kpi(cat, 'E', False)
                 h += f"<tr><td><b>Desnivel</b></td><td>{e_v:.0f} m</td><td>-</td><td>-</td></tr>"
-                sp_v = d_v/(t_v*24) if t_v>0.001 else 0
-                sp_a = d_a/(t_a*24) if t_a>0.001 else 0
+                sp_v = d_v/(t_v/3600) if t_v>60 else 0
+                sp_a = d_a/(t_a/3600) if t_a>60 else 0
                 h += row("Velocidad", f"{sp_v:.1f} km/h", sp_v-sp_a, fmt_diff(sp_v-sp_a), 0, "-")
             elif xtype == 'run': 
                 r_v, r_a, r_h = kpi(cat, 'R', True)
@@ -473,18 +580,42 @@ elif st.session_state['vista_actual'] == 'ficha':
             else:
                 r_v, r_a, r_h = kpi(cat, 'R', True)
                 h += f"<tr><td><b>Ritmo</b></td><td>{fmt_pace(r_v, 'swim')}</td><td>-</td><td>-</td></tr>"
-            st.markdown(h+"</table>", unsafe_allow_html=True)
+            return h+"</table>"
 
         c1, c2, c3 = st.columns(3)
         with c1: draw_disc("NATACIÓN", "🏊", "Nat", "swim")
         with c2: draw_disc("CICLISMO", "🚴", "Bici", "elev")
         with c3: draw_disc("TROTE", "🏃", "Trote", "run")
 
+        # --- CARGA DE ENTRENAMIENTO (AGUDA / CRÓNICA) ---
+        COLOR_ZONA = {'Baja': '#1565C0', 'Óptima': '#2E7D32', 'Alta': '#EF6C00', 'Riesgo': '#C62828'}
+
+        @rend.medido("html_carga")
+        def tabla_carga():
+            h = "<table style='width:100%; font-size:14px;'><tr style='color:#666; border-bottom:1px solid #ddd;'><th>Carga</th><th>Aguda (7d)</th><th>Crónica (28d)</th><th>Razón A:C</th></tr>"
+            for l, cat, k, fmt in (("Tiempo Total", 'Global', 'T', fmt_h_m), ("Distancia Total", 'Global', 'D', lambda x: f"{x:.1f} km"),
+                                   ("🏊 Natación", 'Nat', 'T', fmt_h_m), ("🚴 Ciclismo", 'Bici', 'T', fmt_h_m), ("🏃 Trote", 'Trote', 'T', fmt_h_m)):
+                df = data[cat].get(k)
+                if df is None or not df.contiene(atleta): continue
+                ag, cr, r = df.carga(atleta, ultima_sem); z = zona_carga(r)
+                h += f"<tr><td><b>{l}</b></td><td>{fmt(ag)}</td><td>{fmt(cr)}</td><td style='color:{COLOR_ZONA.get(z, '#666')}; font-weight:bold;'>{r:.2f} {z}</td></tr>" if r > 0 else f"<tr><td><b>{l}</b></td><td>-</td><td>-</td><td>-</td></tr>"
+            h += "</table>"
+            base = data['Global']['T']
+            if base is not None and base.contiene(atleta):
+                serie = " → ".join(f"{s.replace('Sem ', 'S')}: {r:.2f}" for s, r in base.serie_carga(atleta))
+                h += f"<div class='comp-text'>📈 Razón A:C (Tiempo Total): {serie}</div>"
+            return h
+
+        st.markdown("<div class='disc-header'>⚖️ CARGA DE ENTRENAMIENTO</div>", unsafe_allow_html=True)
+        st.markdown(html_cacheado('ficha', 'carga', tabla_carga, sel), unsafe_allow_html=True)
+
         # --- NOTA EXPLICATIVA DE MÉTRICAS ---
         st.markdown("""
         <div style='background-color: #F8F9FA; padding: 15px; border-radius: 8px; border-left: 5px solid var(--primary-orange); margin-top: 30px; font-size: 14px; color: #555;'>
             <b>💡 Guía de lectura:</b><br>
             <span style='color: #333;'><b>• Vs Eq (Equipo):</b></span> Compara tu registro de esta semana con el promedio general del club en esta misma semana.<br>
-            <span style='color: #333;'><b>• Vs Hist (Histórico):</b></span> Compara tu registro de esta semana con tu propio promedio de las semanas anteriores.
+            <span style='color: #333;'><b>• Vs Hist (Histórico):</b></span> Compara tu registro de esta semana con tu propio promedio de las semanas anteriores.<br>
+            <span style='color: #333;'><b>• 🔁 4 sem / 12 sem:</b></span> Tu promedio semanal de las últimas 4 y 12 semanas (forma reciente).<br>
+            <span style='color: #333;'><b>• ⚖️ Carga aguda / crónica:</b></span> Promedio exponencial de tu entrenamiento de los últimos ~7 y ~28 días. Una razón A:C entre 0.8 y 1.3 es la zona óptima; sobre 1.5, riesgo de sobrecarga.
         </div>
         """, unsafe_allow_html=True)
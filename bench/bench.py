@@ -0,0 +1,139 @@
+# =============================================================================
+# ⏱️ BENCHMARKS DE RUTAS CALIENTES (club sintético a varias escalas)
+# Uso: python bench/bench.py --escalas 50x10,200x26 --base bench/base.json
+# =============================================================================
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sintetico import generar_club
+from datos import Cubo, cargar_cubo, cubo_ficha
+from historial import inicializar, cargar_cubo_db, _leer_db
+from snapshot import agregados_versionados
+import logic
+
+ESCALAS = "50x10,200x26,500x52"
+UMBRAL = 0.25  # Regresión: más de 25% sobre la base...
+MINIMO_S = 0.005  # ...y al menos 5 ms (evita falsas alarmas en etapas muy cortas)
+
+def medir(fn, repeticiones, preparar=None):
+    """Mejor tiempo (s) de `repeticiones` corridas y el resultado de la última. Con `preparar`, cada corrida
+    mide fn(preparar()) y preparar queda fuera del tiempo: así ninguna corrida reusa lo cacheado por la anterior."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        x = preparar() if preparar else None
+        t = time.perf_counter(); r = fn(x) if preparar else fn(); mejor = min(mejor, time.perf_counter() - t)
+    return mejor, r
+
+def frio(cubo):
+    """Mismo cubo sin rankings, acumulados, carga ni cumplimiento ya calculados."""
+    return Cubo(cubo.nombres, cubo.semanas, cubo.metricas, cubo.valores, cubo.filas, cubo.tiene_sem)
+
+def sin_agregados(ruta_db, snaps, directorio):
+    shutil.rmtree(directorio, ignore_errors=True)
+    return cargar_cubo_db(ruta_db, snaps)
+
+# --- MISMAS OPERACIONES QUE LAS VISTAS DE app.py ---
+def resumen(cubo):
+    data = cubo.vistas(); base = data['Global']['D']; sem = base.semanas[-1]
+    tot = [float(h.col(sem).sum()) for h in (data['Global']['T'], base) if h is not None and h.tiene(sem)]
+    act = int((base.col(sem) > 0.1).sum())
+    tops = []
+    for h in (h for v in data.values() for h in v.values()):
+        if h is None or not h.tiene(sem): continue
+        tops.append(h.top(sem))
+    alertas = cubo.cumplimiento.alertas(cubo.pos_sem[sem], base.filas)
+    return tot, act, tops, alertas, cubo.cumplimiento.temporada()
+
+def ficha(cubo):
+    data = cubo.vistas(); base = data['Global']['D']; sem = base.semanas[-1]
+    n_hist = len(cubo.semanas) - cubo.pos_sem[base.semanas[0]]
+    salida = []
+    for nom in base.nombres:
+        a = cubo.buscar(nom)
+        ranks = [h.rango(a, sem) for h in (base, data['Global']['T']) if h.contiene(a)]
+        kpis = [(h.valor(a, sem), h.media_semana(sem), h.media(a, n_hist)) for v in data.values() for h in v.values()
+                if h is not None and h.tiene(sem) and h.contiene(a)]
+        salida.append((ranks, kpis))
+    return salida
+
+def ficha_atleta(ruta_db, snaps, nombre):
+    # Ficha sin el cubo del club en memoria: snapshot mapeado, agregados de la versión y la fila del atleta
+    cubo = cargar_cubo_db(ruta_db, snaps)
+    f = cubo_ficha(cubo, agregados_versionados(cubo, snaps), nombre); a = f.buscar(nombre)
+    data = f.vistas(); sem = data['Global']['D'].semanas[-1]
+    return [(h.valor(a, sem), h.media_semana(sem), h.media(a), h.rango(a, sem), h.carga(a, sem)) for v in data.values() for h in v.values()
+            if h is not None and h.tiene(sem) and h.contiene(a)]
+
+def correr_escala(n, w, directorio, repeticiones):
+    ruta_h, ruta_s = generar_club(directorio, n, w)
+    ruta_db = os.path.join(directorio, "historico.db")
+    r = {}
+    r['cargar_cubo_xlsx'], cubo = medir(lambda: cargar_cubo(ruta_h), repeticiones)
+    snaps = os.path.join(directorio, "snapshots")
+    inicializar(ruta_db, ruta_h, snaps)
+    r['cargar_cubo_db'], _ = medir(lambda: _leer_db(ruta_db), repeticiones)
+    cargar_cubo_db(ruta_db, snaps)
+    r['cargar_snapshot'], _ = medir(lambda: cargar_cubo_db(ruta_db, snaps), repeticiones)
+    sin_snap = os.path.join(directorio, "sin_snapshot")
+    r['agregados_ficha'], _ = medir(lambda c: agregados_versionados(c, sin_snap), repeticiones, lambda: sin_agregados(ruta_db, snaps, sin_snap))
+    agregados_versionados(cargar_cubo_db(ruta_db, snaps), snaps)
+    r['ficha_atleta_snapshot'], _ = medir(lambda: ficha_atleta(ruta_db, snaps, cubo.nombres[len(cubo.nombres) // 2]), repeticiones)
+    # Frío: primera vista de una versión nueva (arma rankings, acumulados...); caliente: las siguientes visitas
+    r['resumen_frio'], _ = medir(resumen, repeticiones, lambda: frio(cubo))
+    r['resumen_caliente'], _ = medir(lambda: resumen(cubo), repeticiones)
+    r['ficha_todos_frio'], _ = medir(ficha, repeticiones, lambda: frio(cubo))
+    r['ficha_todos_caliente'], _ = medir(lambda: ficha(cubo), repeticiones)
+    r['ficha_por_atleta'] = r['ficha_todos_caliente'] / n
+    r['logic_cargar_procesar'], (data, at, ah, err) = medir(lambda: logic.procesar_datos.__wrapped__(ruta_h, ruta_s), repeticiones)
+    if err: raise RuntimeError(err)
+    r['word_v35'], _ = medir(lambda: logic.generar_word_v35(data, at, ah), 1)
+    r['word_lote_zip'], _ = medir(lambda: logic.generar_lote_v35(data, at, ah), 1)
+    return r
+
+def regresiones(actual, base, umbral=UMBRAL):
+    """[(escala, etapa, base, actual)] de etapas más lentas que la base por sobre el umbral."""
+    out = []
+    for esc, etapas in actual.items():
+        for etapa, t in etapas.items():
+            t0 = base.get(esc, {}).get(etapa)
+            if t0 is not None and t > t0 * (1 + umbral) and t - t0 > MINIMO_S: out.append((esc, etapa, t0, t))
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks de Metri KM sobre un club sintético")
+    ap.add_argument("--escalas", default=ESCALAS, help="atletas x semanas, separadas por coma (ej: 50x10,500x52)")
+    ap.add_argument("--repeticiones", type=int, default=3)
+    ap.add_argument("--salida", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados.json"))
+    ap.add_argument("--base", help="JSON de una corrida anterior para detectar regresiones")
+    ap.add_argument("--umbral", type=float, default=UMBRAL)
+    args = ap.parse_args(argv)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for esc in args.escalas.split(","):
+            n, w = (int(x) for x in esc.lower().split("x"))
+            print(f"--- {n} atletas × {w} semanas ---", flush=True)
+            resultados[esc] = correr_escala(n, w, os.path.join(tmp, esc), args.repeticiones)
+            for etapa, t in resultados[esc].items(): print(f"  {etapa:<24} {t*1000:10.2f} ms")
+
+    salida = {'fecha': time.strftime("%Y-%m-%d %H:%M:%S"), 'python': platform.python_version(),
+              'cpus': os.cpu_count(), 'resultados': resultados}
+    with open(args.salida, "w", encoding="utf-8") as f: json.dump(salida, f, indent=2)
+    print(f"Resultados en {args.salida}")
+
+    if not args.base: return 0
+    with open(args.base, encoding="utf-8") as f: base = json.load(f)['resultados']
+    malas = regresiones(resultados, base, args.umbral)
+    for esc, etapa, t0, t in malas: print(f"⚠️ REGRESIÓN {esc} {etapa}: {t0*1000:.2f} ms -> {t*1000:.2f} ms ({t/t0 - 1:+.0%})")
+    if not malas: print(f"✅ Sin regresiones sobre {args.base} (umbral {args.umbral:.0%})")
+    return 1 if malas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# =============================================================================
+# 🧪 CLUB SINTÉTICO: históricos y semanales con la forma de los Excel reales
+# Determinístico (misma semilla -> mismos archivos) para comparar corridas
+# =============================================================================
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from datos import METRICAS, METRICAS_TIEMPO
+from historial import MAPEO_COLUMNAS, fmt_hms
+
+NOMBRES = ["Francisco", "Claudio", "Gabriel", "Andrés", "María José", "Rodrigo", "Alejandra", "Cristóbal", "Valentina", "José Tomás"]
+APELLIDOS = ["Wendt", "Correa", "San Martín", "Sánchez", "Araya", "Tobar", "Silva", "Zárate", "Muñoz", "Rodríguez", "Pérez", "León"]
+
+# Rango realista por hoja (segundos para tiempos)
+RANGOS = {
+    'Tiempo Total': (3600, 60000), 'Distancia Total': (10, 450), 'Altimetría Total': (0, 6000), 'CV': (0.2, 1.6),
+    'Natación': (900, 9000), 'Nat Distancia': (0.5, 12), 'Nat Ritmo': (95, 160),
+    'Ciclismo': (1800, 50000), 'Ciclismo Distancia': (20, 400), 'Ciclismo Desnivel': (0, 5500), 'Ciclismo Max': (15, 230),
+    'Trote': (900, 20000), 'Trote Distancia': (3, 90), 'Trote Ritmo': (240, 420), 'Trote Desnivel': (0, 1200), 'Trote Max': (3, 35),
+}
+
+def nombres_atletas(n):
+    base = [f"{a} {b}" for b in APELLIDOS for a in NOMBRES]
+    return [base[i % len(base)] + (f" {i // len(base) + 1}" if i >= len(base) else "") for i in range(n)]
+
+def semanas(n):
+    return [f"Sem {i:02d}" for i in range(1, n + 1)]
+
+def _valores(rng, hoja, forma):
+    lo, hi = RANGOS[hoja]
+    v = rng.uniform(lo, hi, forma) * (rng.random(forma) > 0.25)  # ~25% semanas sin actividad
+    return v.round() if hoja in METRICAS_TIEMPO else v.round(1)
+
+def _celdas(hoja, v):
+    return fmt_hms(v.ravel()).reshape(v.shape) if hoja in METRICAS_TIEMPO else v
+
+def generar_historico(ruta, n_atletas, n_semanas, semilla=0):
+    """historico.xlsx con las 16 hojas (Nombre + Sem NN), tiempos como 'hh:mm:ss'."""
+    rng = np.random.default_rng(semilla)
+    noms, sems = nombres_atletas(n_atletas), semanas(n_semanas)
+    with pd.ExcelWriter(ruta, engine='openpyxl') as writer:
+        for hoja in METRICAS:
+            df = pd.DataFrame(_celdas(hoja, _valores(rng, hoja, (n_atletas, n_semanas))), columns=sems)
+            df.insert(0, 'Nombre', noms)
+            df.to_excel(writer, sheet_name=hoja, index=False)
+    return ruta
+
+def generar_semana(ruta, n_atletas, semilla=1):
+    """Excel semanal con las columnas de '06 Sem (tst).xlsx' (una fila por deportista)."""
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({'Clasificación': np.arange(1, n_atletas + 1), 'Deportista': nombres_atletas(n_atletas)})
+    for hoja, col in MAPEO_COLUMNAS.items():
+        df[col] = _celdas(hoja, _valores(rng, hoja, n_atletas))
+    df['Ciclismo: Vel. Media (km/h)'] = rng.uniform(18, 36, n_atletas).round(1)
+    df.to_excel(ruta, index=False)
+    return ruta
+
+def generar_club(directorio, n_atletas, n_semanas, semilla=0):
+    """-> (ruta historico.xlsx, ruta semanal.xlsx) dentro de `directorio`."""
+    os.makedirs(directorio, exist_ok=True)
+    return (generar_historico(os.path.join(directorio, "historico.xlsx"), n_atletas, n_semanas, semilla),
+            generar_semana(os.path.join(directorio, "semana.xlsx"), n_atletas, semilla + 1))
@@ -0,0 +1,171 @@
+# =============================================================================
+# 🖥️ LÍNEA DE COMANDOS (sin Streamlit): fusión semanal y reportes Word para cron
+# Uso: python cli.py semana --semana "Sem 07" --entrada "TYM Triathlon=07 Sem.xlsx" --entrada "Otro Club=07.csv"
+#      python cli.py fusionar --club "TYM Triathlon" semanas/*.xlsx
+#      python cli.py reporte --historico historico.xlsx --semanal "06 Sem (tst).xlsx" --salida reporte.docx
+#      python cli.py exportar --club "TYM Triathlon"   (respaldo: historico.xlsx con todas las semanas fusionadas)
+# =============================================================================
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import rendimiento as rend
+from clubes import CLUB_BASE, cargar_registro
+from historial import MAPEO_COLUMNAS, inicializar, leer_semanal_stream, agregar_semanas, inferir_semana, cargar_cubo_db, exportar_xlsx, version_db, respaldo_pendiente, marcar_respaldo
+from logic import cargar_procesar_datos, procesar_con_cubo, generar_word_v35, generar_lote_v35
+
+def leer_mapeo(ruta):
+    """JSON {hoja del histórico: columna del Excel semanal} o el mapeo por defecto."""
+    if not ruta: return MAPEO_COLUMNAS
+    with open(ruta, encoding="utf-8") as f: return json.load(f)
+
+def obtener_club(nombre, registro=None):
+    registro = registro or cargar_registro()
+    if nombre not in registro: raise ValueError(f"Club desconocido: '{nombre}' (registrados: {', '.join(registro)})")
+    club = registro[nombre]
+    if not club.hay_datos(): raise ValueError(f"No se encuentra el histórico de '{nombre}' ({club.historico})")
+    inicializar(club.db, club.historico)
+    return club
+
+def fusionar(club, archivos, semanas=None, mapeo=MAPEO_COLUMNAS):
+    """Excel/CSV semanales -> almacén del club (una transacción). Sin semanas: se deducen del nombre del archivo."""
+    semanas = semanas or [inferir_semana(a) for a in archivos]
+    faltan = [a for a, s in zip(archivos, semanas) if not s]
+    if faltan: raise ValueError(f"No se pudo deducir la semana de: {', '.join(faltan)} (use --semana)")
+    tablas = [leer_semanal_stream(os.path.basename(a), a, mapeo) for a in archivos]
+    return agregar_semanas(club.db, list(zip(semanas, tablas)))
+
+def reporte(historico, semanal, salida, lote=False, procesos=None):
+    """Word del equipo (o ZIP con uno por atleta) a partir del histórico y del Excel semanal -> nº de atletas."""
+    return _escribir(cargar_procesar_datos(historico, semanal), salida, lote, procesos)
+
+def _escribir(procesado, salida, lote, procesos):
+    data, avs_team, avs_hist, err = procesado
+    if err: raise RuntimeError(err)
+    bio = generar_lote_v35(data, avs_team, avs_hist, procesos) if lote else generar_word_v35(data, avs_team, avs_hist)
+    os.makedirs(os.path.dirname(salida) or ".", exist_ok=True)
+    with open(salida, "wb") as f: f.write(bio.getvalue())
+    return len(data)
+
+def procesar_club(nombre, archivo, semana, salida, lote=False, procesos=1, mapeo=MAPEO_COLUMNAS):
+    """Semana completa de un club: reporte contra el histórico previo a la semana y luego la fusión.
+    Volver a correrla es seguro: la semana se excluye del histórico del reporte y la fusión la reemplaza."""
+    t = time.perf_counter()
+    club = obtener_club(nombre)
+    procesado = procesar_con_cubo(cargar_cubo_db(club.db), archivo, excluir={semana})  # Sin re-armar el Excel del histórico
+    carpeta = os.path.join(salida, re.sub(r'[\\/:*?"<>|]', '', club.nombre).strip() or "club")
+    ruta = os.path.join(carpeta, f"{semana}.{'zip' if lote else 'docx'}")
+    atletas = _escribir(procesado, ruta, lote, procesos)
+    nombres = fusionar(club, [archivo], [semana], mapeo)
+    return {'club': club.nombre, 'semana': semana, 'atletas': atletas, 'reporte': ruta, 'nombres': nombres, 'seg': time.perf_counter() - t}
+
+def _entrada(texto):
+    # 'Club=ruta' o solo 'ruta' (club base)
+    club, sep, ruta = texto.rpartition("=")
+    return (club.strip(), ruta) if sep else (CLUB_BASE.nombre, texto)
+
+def _respaldo(nombre):
+    n = respaldo_pendiente(obtener_club(nombre).db)
+    if n: print(f"   ⚠️ {n} fusión(es) sin respaldar: python cli.py exportar --club \"{nombre}\" y suba el Excel al repo")
+
+def _avisos(rep):
+    for a, n in rep['unidos'].items(): print(f"   🪪 {a} → {n}")
+    for a, n in rep['sugeridos'].items(): print(f"   🤔 Parecido sin unir: {a} ≈ {n} (si es la misma persona, confirmar en Admin)")
+    for a, c in rep['ambiguos'].items(): print(f"   ⚠️ Ambiguo: {a} ({' / '.join(c)})")
+    if rep['nuevos']: print(f"   🆕 Nuevos: {', '.join(rep['nuevos'])}")
+
+def cmd_semana(args):
+    entradas = [_entrada(e) for e in args.entrada]
+    semanas = [args.semana or inferir_semana(r) for _, r in entradas]
+    if not all(semanas): raise ValueError("No se pudo deducir la semana de todos los archivos (use --semana)")
+    mapeo = leer_mapeo(args.mapeo)
+    procesos = args.procesos or os.cpu_count() or 1
+    trabajos = [(c, r, s, args.salida, args.lote, 1 if len(entradas) > 1 else procesos, mapeo) for (c, r), s in zip(entradas, semanas)]
+    if len(trabajos) > 1 and procesos > 1:
+        # Un proceso por club; cada club arma sus Word en serie para no sobresuscribir la máquina
+        with ProcessPoolExecutor(max_workers=min(procesos, len(trabajos))) as ex:
+            futuros = [ex.submit(procesar_club, *t) for t in trabajos]
+            resultados = [(t[0], f.exception() or f.result()) for t, f in zip(trabajos, futuros)]
+    else:
+        resultados = []
+        for t in trabajos:
+            try: resultados.append((t[0], procesar_club(*t)))
+            except Exception as e: resultados.append((t[0], e))
+    errores = 0
+    for club, r in resultados:
+        if isinstance(r, Exception):
+            errores += 1; print(f"❌ {club}: {r}"); continue
+        print(f"✅ {r['club']} {r['semana']}: {r['atletas']} atletas, reporte en {r['reporte']} ({r['seg']:.1f} s)")
+        _avisos(r['nombres']); _respaldo(r['club'])
+    return 1 if errores else 0
+
+def cmd_fusionar(args):
+    club = obtener_club(args.club)
+    rep = fusionar(club, args.archivos, [args.semana] if args.semana else None, leer_mapeo(args.mapeo))
+    print(f"✅ {club.nombre}: {len(args.archivos)} semana(s) fusionadas")
+    _avisos(rep); _respaldo(club.nombre)
+    return 0
+
+def cmd_exportar(args):
+    club = obtener_club(args.club)
+    version = version_db(club.db)
+    salida = args.salida or club.historico
+    contenido = exportar_xlsx(club.db, club.historico)
+    with open(salida, "wb") as f: f.write(contenido)
+    marcar_respaldo(club.db, version)
+    print(f"✅ {club.nombre}: histórico exportado en {salida}")
+    return 0
+
+def cmd_reporte(args):
+    n = reporte(args.historico, args.semanal, args.salida, args.lote, args.procesos)
+    print(f"✅ Reporte de {n} atletas en {args.salida}")
+    return 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Metri KM sin interfaz: fusión semanal y reportes Word")
+    ap.add_argument("--tiempos", action="store_true", help="mostrar los tiempos por etapa al terminar")
+    sub = ap.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("semana", help="reporte + fusión de la semana para uno o varios clubes")
+    p.add_argument("--entrada", action="append", required=True, help="'Club=archivo.xlsx' (sin 'Club=': club base); repetible")
+    p.add_argument("--semana", help="nombre de la semana (ej: 'Sem 07'); por defecto se deduce del archivo")
+    p.add_argument("--salida", default="reportes", help="carpeta de reportes (una subcarpeta por club)")
+    p.add_argument("--lote", action="store_true", help="ZIP con un Word por atleta en vez de un solo documento")
+    p.add_argument("--procesos", type=int, help="procesos en paralelo (por defecto: uno por CPU)")
+    p.add_argument("--mapeo", help="JSON hoja -> columna del Excel semanal")
+    p.set_defaults(fn=cmd_semana)
+
+    p = sub.add_parser("fusionar", help="agregar semanas al histórico de un club")
+    p.add_argument("archivos", nargs="+")
+    p.add_argument("--club", default=CLUB_BASE.nombre)
+    p.add_argument("--semana", help="nombre de la semana (un solo archivo); por defecto se deduce del archivo")
+    p.add_argument("--mapeo", help="JSON hoja -> columna del Excel semanal")
+    p.set_defaults(fn=cmd_fusionar)
+
+    p = sub.add_parser("exportar", help="respaldo: historico.xlsx del club con todas las semanas fusionadas")
+    p.add_argument("--club", default=CLUB_BASE.nombre)
+    p.add_argument("--salida", help="ruta del Excel (por defecto: reemplaza el historico.xlsx del club)")
+    p.set_defaults(fn=cmd_exportar)
+
+    p = sub.add_parser("reporte", help="Word a partir de un historico.xlsx y un Excel semanal")
+    p.add_argument("--historico", default=CLUB_BASE.historico, help="ruta o URL")
+    p.add_argument("--semanal", required=True, help="ruta o URL")
+    p.add_argument("--salida", default="reporte.docx")
+    p.add_argument("--lote", action="store_true", help="ZIP con un Word por atleta")
+    p.add_argument("--procesos", type=int)
+    p.set_defaults(fn=cmd_reporte)
+
+    args = ap.parse_args(argv)
+    if args.comando == "fusionar" and args.semana and len(args.archivos) > 1: ap.error("--semana solo con un archivo")
+    try: codigo = args.fn(args)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"❌ {e}"); codigo = 1
+    if args.tiempos:
+        for etapa, t in rend.resumen()['etapas'].items(): print(f"  {etapa:<24} {t['total_s']*1000:10.2f} ms")
+    return codigo
+
+if __name__ == "__main__":
+    sys.exit(main())
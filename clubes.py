@@ -0,0 +1,110 @@
+# =============================================================================
+# 🏟️ MULTI-CLUB: registro de clubes + almacén LRU de cubos con presupuesto de memoria
+# Cada club se carga recién cuando alguien entra a él; los menos usados se liberan
+# =============================================================================
+import json
+import os
+import threading
+from collections import OrderedDict
+import rendimiento as rend
+from datos import cubo_ficha, normalizar_nombre
+from historial import inicializar, cargar_cubo_db, version_db, semanas_cambiadas
+from snapshot import agregados_versionados
+
+ARCHIVO_CLUBES = "clubes.json"
+PRESUPUESTO_MB = float(os.environ.get("METRIKM_MEMORIA_MB", 512))
+MAX_FICHAS = 64  # Fichas de atleta guardadas (cada una: una fila del cubo y los agregados de su versión)
+
+class Club:
+    def __init__(self, nombre, historico, db=None, logo=None):
+        self.nombre = nombre
+        self.historico = historico                                # Semilla / formato de exportación
+        self.db = db or os.path.splitext(historico)[0] + ".db"    # Almacén append-only del club
+        self.logo = logo
+
+    def hay_datos(self):
+        return os.path.exists(self.db) or os.path.exists(self.historico)
+
+# Club original: archivos en la raíz del repo
+CLUB_BASE = Club("TYM Triathlon", "historico.xlsx", "historico.db", "Tym Logo.png")  # Original en alta; se sirve reducido (activos.py)
+
+def cargar_registro(ruta=ARCHIVO_CLUBES):
+    """{nombre: Club}. clubes.json (lista de {nombre, historico, db?, logo?}) agrega clubes al base."""
+    clubes = {CLUB_BASE.nombre: CLUB_BASE}
+    if os.path.exists(ruta):
+        with open(ruta, encoding="utf-8") as f:
+            for c in json.load(f): clubes[c['nombre']] = Club(c['nombre'], c['historico'], c.get('db'), c.get('logo'))
+    return clubes
+
+class Almacen:
+    """Cubos por club en orden LRU. Al pasar el presupuesto se descartan los menos usados
+    (nunca el recién pedido). La carga de un club no bloquea a los usuarios de otro.
+    Cada pedido compara la versión del almacén (una lectura de `meta`, sin recorrer celdas):
+    una fusión -de esta sesión, de otra o de cli.py- se ve en el rerun siguiente, sin TTL."""
+    def __init__(self, presupuesto_mb=PRESUPUESTO_MB):
+        self.presupuesto = presupuesto_mb * 2**20
+        self._cubos = OrderedDict()  # nombre -> cubo (cubo.version = versión del almacén que refleja)
+        self._lock = threading.Lock()
+        self._carga = {}             # nombre -> lock de carga de ese club
+        self._fichas = OrderedDict() # (club, versión, atleta) -> CuboFicha
+
+    def obtener(self, club):
+        inicializar(club.db, club.historico)
+        version = version_db(club.db)
+        with self._lock:
+            cubo = self._cubos.get(club.nombre)
+            if cubo is not None and cubo.version == version:
+                self._cubos.move_to_end(club.nombre); rend.cache('almacen', True)
+                self._recortar(conservar=club.nombre)  # Rankings/acumulados creados desde la carga también pesan
+                return cubo
+            lock_club = self._carga.setdefault(club.nombre, threading.Lock())
+        with lock_club:
+            with self._lock: cubo = self._cubos.get(club.nombre)
+            if cubo is not None and cubo.version == version: return cubo  # Lo cargó otro hilo mientras se esperaba
+            rend.cache('almacen', False)
+            anterior = cubo
+            cubo = cargar_cubo_db(club.db)
+            if anterior is not None:
+                # Fusión que solo agregó semanas al final: los acumulados del cubo anterior se extienden, no se rehacen
+                nuevas = semanas_cambiadas(club.db, anterior.version, cubo.version)
+                rend.cache('incremental', nuevas is not None and cubo.heredar(anterior, nuevas))
+            with self._lock:
+                self._cubos[club.nombre] = cubo
+                self._cubos.move_to_end(club.nombre)
+                self._recortar(conservar=club.nombre)
+            return cubo
+
+    def ficha(self, club, nombre=None):
+        """CuboFicha del atleta (sin nombre: solo el buscador) en la versión actual. Usa el cubo del club si ya está
+        en memoria; si no, el snapshot mapeado de la versión, sin sumarlo a la LRU de cubos: del plantel se leen
+        los agregados por semana y la fila del atleta."""
+        inicializar(club.db, club.historico)
+        version = version_db(club.db)
+        clave = (club.nombre, version, normalizar_nombre(nombre) if nombre else None)
+        with self._lock:
+            ficha = self._fichas.get(clave)
+            if ficha is not None:
+                self._fichas.move_to_end(clave); rend.cache('fichas', True)
+                return ficha
+            cubo = self._cubos.get(club.nombre)
+        rend.cache('fichas', False)
+        if cubo is None or cubo.version != version: cubo = cargar_cubo_db(club.db)
+        ficha = cubo_ficha(cubo, agregados_versionados(cubo), nombre)
+        with self._lock:
+            for k in [k for k in self._fichas if k[0] == club.nombre and k[1] != version]: del self._fichas[k]  # Versiones viejas del club
+            self._fichas[clave] = ficha
+            while len(self._fichas) > MAX_FICHAS: self._fichas.popitem(last=False)
+        return ficha
+
+    def bytes_en_uso(self):
+        with self._lock: return sum(c.nbytes() for c in self._cubos.values())
+
+    def cargados(self):
+        with self._lock: return list(self._cubos)
+
+    def _recortar(self, conservar):
+        total = sum(c.nbytes() for c in self._cubos.values())
+        for nombre in list(self._cubos):
+            if total <= self.presupuesto: break
+            if nombre == conservar: continue
+            total -= self._cubos.pop(nombre).nbytes()
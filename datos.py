@@ -0,0 +1,570 @@
+# =============================================================================
+# 🧊 MOTOR DE DATOS - CUBO ATLETA × SEMANA × MÉTRICA
+# =============================================================================
+import threading
+import numpy as np
+import pandas as pd
+from rendimiento import etapa, medido
+
+# --- CATÁLOGO DE MÉTRICAS (VISTA -> CLAVE -> HOJA DEL HISTÓRICO) ---
+VISTAS = {
+    'Global': {'T': "Tiempo Total", 'D': "Distancia Total", 'A': "Altimetría Total", 'CV': "CV"},
+    'Nat': {'T': "Natación", 'D': "Nat Distancia", 'R': "Nat Ritmo"},
+    'Bici': {'T': "Ciclismo", 'D': "Ciclismo Distancia", 'E': "Ciclismo Desnivel", 'Max': "Ciclismo Max"},
+    'Trote': {'T': "Trote", 'D': "Trote Distancia", 'R': "Trote Ritmo", 'E': "Trote Desnivel", 'Max': "Trote Max"},
+}
+METRICAS = [h for v in VISTAS.values() for h in v.values()]
+METRICAS_TIEMPO = {"Tiempo Total", "Natación", "Nat Ritmo", "Ciclismo", "Trote", "Trote Ritmo"}
+NOMBRES_INVALIDOS = {'nan', '0', '', 'none'}
+
+# --- KERNEL DE PARSEO VECTORIZADO (COLUMNA COMPLETA POR LLAMADA) ---
+# Acepta 'hh:mm:ss', 'mm:ss', '1 day, 02:00:00', '1900-01-01 14:48:00' (se ignora la fecha, como Excel la muestra)
+_RE_TIEMPO = r'^(?:(\d+) days?,? )?(?:\d{4}-\d{2}-\d{2}[ T])?(\d+):(\d{1,2})(?::(\d{1,2}(?:\.\d*)?))?$'
+
+def _serie(valores):
+    return valores if isinstance(valores, pd.Series) else pd.Series(np.asarray(valores, dtype=object).ravel())
+
+def parse_tiempos(valores):
+    """Celdas de tiempo -> (segundos int32, válido bool). 'NC', '-', vacíos y basura quedan en 0 / inválido."""
+    s = _serie(valores)
+    if pd.api.types.is_timedelta64_dtype(s):
+        seg = s.dt.total_seconds()
+    elif pd.api.types.is_datetime64_any_dtype(s):
+        seg = (s.dt.hour*3600 + s.dt.minute*60 + s.dt.second).astype(float)
+    elif pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        x = s.astype(float)   # Hora de Excel: fracción de día
+        seg = (x * 86400).where(x.between(0, 100))
+    else:
+        txt = s.astype(str).str.strip()
+        p = txt.str.extract(_RE_TIEMPO).astype(float)
+        hms = (p[0].fillna(0)*86400 + p[1]*3600 + p[2]*60 + p[3]).where(p[3].notna(), p[1]*60 + p[2])
+        x = pd.to_numeric(txt.str.replace(',', '.', regex=False), errors='coerce')
+        seg = hms.fillna((x * 86400).where(x.between(0, 100)))
+    seg = seg.to_numpy(dtype=float)
+    ok = np.isfinite(seg)
+    return np.where(ok, np.round(seg), 0).astype(np.int32), ok
+
+def parse_numeros(valores):
+    """Celdas numéricas (admite coma decimal) -> (float32, válido bool)."""
+    s = _serie(valores)
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        x = s.astype(float)
+    else:
+        x = pd.to_numeric(s.astype(str).str.strip().str.replace(',', '.', regex=False), errors='coerce')
+    x = x.to_numpy(dtype=float)
+    ok = np.isfinite(x)
+    return np.where(ok, x, 0).astype(np.float32), ok
+
+def parse_col(valores, es_tiempo):
+    return parse_tiempos(valores) if es_tiempo else parse_numeros(valores)
+
+def normalizar_nombre(nombre):
+    # Clave de búsqueda: sin espacios sobrantes y sin distinguir mayúsculas
+    return " ".join(str(nombre).split()).casefold()
+
+def buscar_hoja(sheet_names, nombre_hoja):
+    return next((k for k in sheet_names if nombre_hoja.lower() in k.lower().replace(":","")), None)
+
+# --- AGREGADOS ACUMULADOS (SUMAS PREFIJO POR SEMANA) ---
+class Acumulados:
+    """Sumas y conteos acumulados semana a semana: el promedio de cualquier ventana sale de dos restas.
+    Agregar una semana suma una fila (O(1) por atleta y métrica), sin recorrer el histórico."""
+    def __init__(self, forma, capacidad=16):
+        self.n = 0  # Semanas acumuladas
+        self._buf = {k: np.zeros((capacidad + 1,) + tuple(forma)) for k in ('suma', 'cant', 'suma_pos', 'cant_pos')}
+        self._memo = {}
+        self._lock = threading.Lock()  # El memo no guarda una media de antes de agregar una semana
+
+    @classmethod
+    def desde(cls, valores, hay=True):
+        """valores[semana, ...] -> Acumulados (una sola pasada vectorizada; hay = la semana cuenta)."""
+        valores = np.asarray(valores, dtype=np.float64)
+        hay = np.broadcast_to(hay, valores.shape)
+        pos = hay & (valores > 0)
+        acum = cls(valores.shape[1:], capacidad=len(valores))
+        for k, x in (('suma', np.where(hay, valores, 0)), ('cant', hay), ('suma_pos', np.where(pos, valores, 0)), ('cant_pos', pos)):
+            np.cumsum(x, axis=0, out=acum._buf[k][1:len(valores) + 1])
+        acum.n = len(valores)
+        return acum
+
+    def agregar(self, valores, hay=True):
+        """Suma una semana nueva a los acumulados."""
+        valores = np.asarray(valores, dtype=np.float64)
+        hay = np.broadcast_to(hay, valores.shape)
+        pos = hay & (valores > 0)
+        with self._lock:
+            if self.n + 1 >= len(self._buf['suma']):
+                self._buf = {k: np.concatenate([b, np.zeros_like(b)]) for k, b in self._buf.items()}
+            for k, x in (('suma', np.where(hay, valores, 0)), ('cant', hay), ('suma_pos', np.where(pos, valores, 0)), ('cant_pos', pos)):
+                self._buf[k][self.n + 1] = self._buf[k][self.n] + x
+            self.n += 1; self._memo.clear()
+
+    def ampliar(self, total, cant=0):
+        """Agrega atletas sin semanas previas hasta tener `total`; `cant` = conteo acumulado (n+1,) que igual les
+        corresponde (en el cubo cuentan las semanas que tiene la hoja, haya dato o no)."""
+        extra = total - self._buf['suma'].shape[1]
+        if extra <= 0: return
+        with self._lock:
+            for k, b in self._buf.items():
+                nuevo = np.zeros((len(b), extra))
+                if k == 'cant': nuevo[:self.n + 1] = np.reshape(cant, (-1, 1))
+                self._buf[k] = np.concatenate([b, nuevo], axis=1)
+            self._memo.clear()
+
+    def copia(self):
+        """Acumulados independientes con las mismas semanas (para extenderlos sin tocar los de otra versión)."""
+        otro = Acumulados((), capacidad=0)
+        with self._lock: otro._buf = {k: b.copy() for k, b in self._buf.items()}; otro.n = self.n
+        return otro
+
+    def _ventana(self, k, ultimas, hasta):
+        fin = self.n if hasta is None else hasta
+        ini = 0 if ultimas is None else max(0, fin - ultimas)
+        return self._buf[k][fin] - self._buf[k][ini]
+
+    def media(self, ultimas=None, hasta=None, positiva=False):
+        """Promedio de las `ultimas` semanas (None = temporada) terminando en `hasta` (excluida; None = todas).
+        positiva=True promedia solo semanas con actividad (>0). NaN donde no hay semanas."""
+        clave = (ultimas, hasta, positiva)
+        with self._lock:
+            if clave not in self._memo:
+                s, c = ('suma_pos', 'cant_pos') if positiva else ('suma', 'cant')
+                suma, cant = self._ventana(s, ultimas, hasta), self._ventana(c, ultimas, hasta)
+                self._memo[clave] = np.divide(suma, cant, out=np.full(suma.shape, np.nan), where=cant > 0)
+            return self._memo[clave]
+
+# --- CARGA DE ENTRENAMIENTO (PROMEDIOS EXPONENCIALES AGUDO / CRÓNICO) ---
+DIAS_AGUDA, DIAS_CRONICA = 7, 28
+ZONAS_CARGA = ((0.8, "Baja"), (1.3, "Óptima"), (1.5, "Alta"), (np.inf, "Riesgo"))  # Razón aguda:crónica
+
+def lambda_semanal(dias):
+    """Constante de una EWMA diaria de N días (2/(N+1)) aplicada a pasos de una semana: 1-(1-λ)^7."""
+    return 1 - (1 - 2 / (dias + 1)) ** 7
+
+def zona_carga(razon):
+    return next(z for tope, z in ZONAS_CARGA if razon < tope) if razon > 0 else "-"
+
+class Carga:
+    """Carga aguda (7 días) y crónica (28 días) semana a semana, como promedios exponenciales.
+    Agregar una semana es un paso de la recurrencia (O(1) por atleta), sin recorrer el histórico."""
+    def __init__(self, forma, capacidad=16, inicial=None):
+        self.n = 0
+        self.la, self.lc = lambda_semanal(DIAS_AGUDA), lambda_semanal(DIAS_CRONICA)
+        self._buf = {k: np.zeros((capacidad,) + tuple(forma)) for k in ('aguda', 'cronica')}
+        self._ini = inicial or (np.zeros(forma), np.zeros(forma))  # Estado previo a la primera semana
+        self._razon = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde(cls, valores, inicial=None):
+        """valores[semana, ...] -> Carga (inicial = (aguda, crónica) de la semana anterior a la primera)."""
+        valores = np.asarray(valores, dtype=np.float64)
+        carga = cls(valores.shape[1:], capacidad=max(1, len(valores)), inicial=inicial)
+        for x in valores: carga.agregar(x)
+        return carga
+
+    def agregar(self, valores):
+        """Suma una semana nueva: E = E_prev + λ (x - E_prev)."""
+        with self._lock:
+            if self.n >= len(self._buf['aguda']):
+                self._buf = {k: np.concatenate([b, np.zeros_like(b)]) for k, b in self._buf.items()}
+            ag, cr = self.ultima()
+            self._buf['aguda'][self.n] = ag + self.la * (valores - ag)
+            self._buf['cronica'][self.n] = cr + self.lc * (valores - cr)
+            self.n += 1; self._razon = None
+
+    def ampliar(self, total):
+        """Agrega atletas sin carga previa (0 en todas las semanas ya agregadas) hasta tener `total`."""
+        extra = total - self._buf['aguda'].shape[1]
+        if extra <= 0: return
+        with self._lock:
+            self._buf = {k: np.concatenate([b, np.zeros((len(b), extra))], axis=1) for k, b in self._buf.items()}
+            self._ini = tuple(np.concatenate([x, np.zeros(extra)]) for x in self._ini)
+            self._razon = None
+
+    def copia(self):
+        """Carga independiente con las mismas semanas (para extenderla sin tocar la de otra versión)."""
+        otra = Carga((), capacidad=0, inicial=self._ini)
+        with self._lock: otra._buf = {k: b.copy() for k, b in self._buf.items()}; otra.n = self.n
+        return otra
+
+    def ultima(self):
+        """(aguda, crónica) de la última semana agregada."""
+        return (self._buf['aguda'][self.n - 1], self._buf['cronica'][self.n - 1]) if self.n else self._ini
+
+    @property
+    def aguda(self): return self._buf['aguda'][:self.n]
+
+    @property
+    def cronica(self): return self._buf['cronica'][:self.n]
+
+    def razon(self):
+        """Aguda / crónica por semana (0 donde no hay carga crónica)."""
+        with self._lock:
+            if self._razon is None:
+                self._razon = np.divide(self.aguda, self.cronica, out=np.zeros_like(self.aguda), where=self.cronica > 0)
+            return self._razon
+
+    def nbytes(self):
+        return sum(b.nbytes for b in list(self._buf.values())) + (self._razon.nbytes if self._razon is not None else 0)
+
+# --- RANKINGS (TODAS LAS MÉTRICAS Y SEMANAS, UNA VEZ POR VERSIÓN DE DATOS) ---
+TOP_K = 10
+UMBRAL_TOP = 0.001  # Un podio solo muestra valores con actividad
+
+def top_k(v, k=TOP_K, minimo=UMBRAL_TOP):
+    """Posiciones de los k mayores (> minimo) en orden descendente; empates por orden de la hoja.
+    Selección parcial: solo se ordenan los candidatos, no la columna completa."""
+    cand = np.flatnonzero(v > minimo)
+    if len(cand) > k:
+        corte = np.partition(v[cand], len(cand) - k)[len(cand) - k]
+        cand = cand[v[cand] >= corte]  # Incluye todos los empatados con el k-ésimo
+    return cand[np.argsort(-v[cand], kind='stable')][:k]
+
+class Rankings:
+    """Puestos por hoja y semana (1 = mayor valor; empates comparten puesto) y top-k. Cada columna
+    se calcula recién cuando una vista la pide y queda guardada para esta versión de datos."""
+    def __init__(self, cubo):
+        self.cubo = cubo
+        self._rangos = {}
+        self._top = {}
+
+    def _columna(self, m, w):
+        return np.asarray(self.cubo.valores[self.cubo.filas[m], w, m])
+
+    def rangos(self, m, w):
+        """Puesto de cada atleta de la hoja en la semana (alineado con filas[m])."""
+        r = self._rangos.get((m, w))
+        if r is None:
+            with self.cubo._lock:
+                if (m, w) not in self._rangos:
+                    v = self._columna(m, w)
+                    # puesto = cuántos valores son estrictamente mayores + 1
+                    self._rangos[(m, w)] = (len(v) - np.searchsorted(np.sort(v), v, side='right') + 1).astype(np.int32)
+                r = self._rangos[(m, w)]
+        return r
+
+    def top(self, m, w, k=TOP_K):
+        t = self._top.get((m, w, k))
+        if t is None:
+            with self.cubo._lock:
+                if (m, w, k) not in self._top: self._top[(m, w, k)] = top_k(self._columna(m, w), k)
+                t = self._top[(m, w, k)]
+        return t
+
+    def nbytes(self):
+        return sum(r.nbytes for r in list(self._rangos.values())) + sum(t.nbytes for t in list(self._top.values()))
+
+# --- CUMPLIMIENTO POR DISCIPLINA (SEMÁFORO DE DESBALANCE) ---
+DISCIPLINAS = {'Agua': "Nat Distancia", 'Bici': "Ciclismo Distancia", 'Trote': "Trote Distancia"}
+
+def rachas(f):
+    """Semanas seguidas en True que terminan en cada semana (eje 1): [1,1,0,1] -> [1,2,0,1]."""
+    c = np.cumsum(f, axis=1, dtype=np.int32)
+    return c - np.maximum.accumulate(np.where(f, 0, c), axis=1)
+
+class Cumplimiento:
+    """Disciplinas faltantes de cada atleta activo en cada semana, y rachas de semanas seguidas sin ellas.
+    Todo el cubo en una pasada vectorizada (se arma al pedirse, una vez por versión de datos)."""
+    def __init__(self, cubo, base="Distancia Total", disciplinas=DISCIPLINAS):
+        b = cubo.pos_met[base]
+        self.disciplinas = list(disciplinas)
+        self.activo = (np.asarray(cubo.valores[:, :, b]) > 0) & cubo.tiene_sem[:, b]                # (A, W)
+        d = [cubo.pos_met[m] for m in disciplinas.values()]
+        # Falta = activo, con la semana en la hoja de la disciplina y 0 en ella (semana ausente de la hoja: no se sabe)
+        self.faltas = self.activo[:, :, None] & (np.asarray(cubo.valores[:, :, d]) == 0) & cubo.tiene_sem[:, d][None]  # (A, W, D)
+        self.rachas = rachas(self.faltas)                                                           # (A, W, D)
+        self.mejor = self.rachas.max(axis=1, initial=0)                                             # (A, D)
+
+    def alertas(self, w, filas):
+        """[(fila, [(disciplina, racha)])] de los atletas de `filas` (en ese orden) a los que les faltó algo en la semana w."""
+        filas = filas[self.faltas[filas, w].any(axis=1)]
+        return [(a, [(d, int(self.rachas[a, w, j])) for j, d in enumerate(self.disciplinas) if self.faltas[a, w, j]]) for a in filas]
+
+    def temporada(self, k=5, minimo=2):
+        """Las k rachas más largas de la temporada: [(fila, disciplina, semanas)]."""
+        a, j = np.nonzero(self.mejor >= minimo)
+        orden = np.argsort(-self.mejor[a, j], kind='stable')[:k]
+        return [(int(a[i]), self.disciplinas[j[i]], int(self.mejor[a[i], j[i]])) for i in orden]
+
+    def nbytes(self):
+        return self.activo.nbytes + self.faltas.nbytes + self.rachas.nbytes + self.mejor.nbytes
+
+# --- CUBO ---
+class Cubo:
+    """Histórico completo como arreglos densos: valores[atleta, semana, métrica]."""
+    def __init__(self, nombres, semanas, metricas, valores, filas, tiene_sem):
+        self.nombres = nombres          # np.ndarray[str] (A)
+        self.semanas = semanas          # list[str] (W)
+        self.metricas = metricas        # list[str] (M)
+        self.valores = valores          # float64 (A, W, M); tiempos en segundos, 0 donde no hay dato
+        self.filas = filas              # list[np.ndarray] (M): atletas de cada hoja, en el orden del Excel
+        self.tiene_sem = tiene_sem      # bool (W, M): la hoja tiene la columna de esa semana
+        self.pos_sem = {s: i for i, s in enumerate(semanas)}
+        self.pos_met = {m: i for i, m in enumerate(metricas)}
+        # Índices construidos una vez por versión de datos: nombre -> fila del cubo -> fila de cada hoja
+        self.indice = {normalizar_nombre(n): i for i, n in enumerate(nombres)}
+        self.pos_hoja = np.full((len(nombres), len(metricas)), -1, dtype=np.intp)
+        for m, f in enumerate(filas): self.pos_hoja[f, m] = np.arange(len(f))
+        # Derivados perezosos: se arman una sola vez aunque el precálculo y las sesiones los pidan a la vez
+        self._lock = threading.RLock()
+        self._acum = {}  # métrica -> Acumulados (se arman al pedirse)
+        self._carga = {}  # métrica -> Carga
+        self._ranking = Rankings(self)
+        self._cumplimiento = None
+        self._agregados = None  # (media, puestos) de la Ficha: agregados_ficha, una vez por versión
+        self.version = None  # Versión de los datos de origen: hash del Excel o 'id:generación' del almacén
+
+    def acum(self, m):
+        """Acumulados (semana, atleta) de una métrica; cuentan las semanas que la hoja tiene."""
+        a = self._acum.get(m)
+        if a is None:
+            with self._lock:
+                if m not in self._acum:
+                    with etapa("acumulados"):
+                        self._acum[m] = Acumulados.desde(np.asarray(self.valores[:, :, m]).T, self.tiene_sem[:, m][:, None])
+                a = self._acum[m]
+        return a
+
+    def carga(self, m):
+        """Carga aguda/crónica (semana, atleta) de una métrica; semana sin dato = carga 0."""
+        c = self._carga.get(m)
+        if c is None:
+            with self._lock:
+                if m not in self._carga:
+                    with etapa("carga"): self._carga[m] = Carga.desde(np.asarray(self.valores[:, :, m]).T)
+                c = self._carga[m]
+        return c
+
+    @property
+    def ranking(self):
+        return self._ranking
+
+    @property
+    def cumplimiento(self):
+        if self._cumplimiento is None:
+            with self._lock:
+                if self._cumplimiento is None:
+                    with etapa("cumplimiento"): self._cumplimiento = Cumplimiento(self)
+        return self._cumplimiento
+
+    def heredar(self, anterior, nuevas):
+        """Toma los acumulados y cargas de `anterior` cuando esta versión es la misma temporada con las semanas `nuevas`
+        agregadas al final, y les suma solo esas semanas (O(semanas nuevas × atletas) por métrica). Devuelve si pudo;
+        si no (semana re-subida o intercalada, otras métricas), los derivados se arman de cero al pedirse."""
+        w0, a0 = len(anterior.semanas), len(anterior.nombres)
+        if (anterior.metricas != self.metricas or self.semanas[:w0] != anterior.semanas or set(self.semanas[w0:]) != set(nuevas)
+                or list(self.nombres[:a0]) != list(anterior.nombres)): return False
+        # Se extienden copias: una sesión que sigue leyendo el cubo anterior ve sus semanas, no las nuevas
+        with anterior._lock: acum, carga = {m: a.copia() for m, a in anterior._acum.items()}, {m: c.copia() for m, c in anterior._carga.items()}
+        for m, a in acum.items():
+            a.ampliar(len(self.nombres), np.concatenate([[0], np.cumsum(anterior.tiene_sem[:, m])]))
+            for w in range(w0, len(self.semanas)): a.agregar(self.valores[:, w, m], self.tiene_sem[w, m])
+            self._acum[m] = a
+        for m, c in carga.items():
+            c.ampliar(len(self.nombres))
+            for w in range(w0, len(self.semanas)): c.agregar(np.asarray(self.valores[:, w, m]))
+            self._carga[m] = c
+        return True
+
+    def nbytes(self):
+        """Memoria aproximada del cubo y de sus derivados ya construidos (nombres ~64 B c/u).
+        Se llama mientras el precálculo llena los derivados: se recorren copias (list() de un dict es atómico)."""
+        n = self.valores.nbytes + self.tiene_sem.nbytes + self.pos_hoja.nbytes + sum(f.nbytes for f in self.filas)
+        n += 64 * len(self.nombres) + 100 * len(self.indice)
+        n += sum(b.nbytes for a in list(self._acum.values()) for b in list(a._buf.values()))
+        n += self._ranking.nbytes() + sum(c.nbytes() for c in list(self._carga.values()))
+        if self._cumplimiento is not None: n += self._cumplimiento.nbytes()
+        if self._agregados is not None: n += sum(x.nbytes for x in self._agregados)
+        return n
+
+    def buscar(self, nombre):
+        """Fila del atleta en el cubo (O(1)) o None."""
+        return self.indice.get(normalizar_nombre(nombre))
+
+    def hoja(self, metrica):
+        m = self.pos_met.get(metrica)
+        if m is None or not len(self.filas[m]): return None
+        return Hoja(self, m)
+
+    def vistas(self):
+        return {cat: {k: self.hoja(h) for k, h in claves.items()} for cat, claves in VISTAS.items()}
+
+class Hoja:
+    """Vista sin copia de una métrica del cubo (equivalente a una hoja del Excel)."""
+    def __init__(self, cubo, m):
+        self.cubo = cubo; self.m = m
+        self.metrica = cubo.metricas[m]
+        self.es_tiempo = self.metrica in METRICAS_TIEMPO
+        self.filas = cubo.filas[m]
+
+    @property
+    def nombres(self): return self.cubo.nombres[self.filas]
+
+    @property
+    def semanas(self): return [s for i, s in enumerate(self.cubo.semanas) if self.cubo.tiene_sem[i, self.m]]
+
+    def tiene(self, sem):
+        w = self.cubo.pos_sem.get(sem)
+        return w is not None and bool(self.cubo.tiene_sem[w, self.m])
+
+    def col(self, sem):
+        """Valores de la semana para los atletas de la hoja (alineado con .nombres)."""
+        return self.cubo.valores[self.filas, self.cubo.pos_sem[sem], self.m]
+
+    def media_semana(self, sem):
+        """Promedio del plantel de la hoja en la semana."""
+        return float(self.col(sem).mean())
+
+    def contiene(self, a):
+        return a is not None and self.cubo.pos_hoja[a, self.m] >= 0
+
+    def valor(self, a, sem):
+        return self.cubo.valores[a, self.cubo.pos_sem[sem], self.m]
+
+    def top(self, sem, k=TOP_K):
+        """Posiciones en la hoja (alineadas con .nombres / .col) de los k mejores de la semana."""
+        return self.cubo.ranking.top(self.m, self.cubo.pos_sem[sem], k)
+
+    def rango(self, a, sem):
+        return int(self.cubo.ranking.rangos(self.m, self.cubo.pos_sem[sem])[self.cubo.pos_hoja[a, self.m]])
+
+    def trayectoria(self, a):
+        """[(semana, puesto)] del atleta en las semanas que tiene la hoja."""
+        p = self.cubo.pos_hoja[a, self.m]
+        return [(s, int(self.cubo.ranking.rangos(self.m, w)[p])) for w, s in enumerate(self.cubo.semanas) if self.cubo.tiene_sem[w, self.m]]
+
+    def media(self, a, ultimas=None):
+        """Promedio del atleta en la temporada o en las últimas N semanas (0 si no hay semanas)."""
+        v = self.cubo.acum(self.m).media(ultimas)[a]
+        return 0 if np.isnan(v) else float(v)
+
+    def carga(self, a, sem):
+        """(aguda, crónica, razón) del atleta al cierre de la semana."""
+        c = self.cubo.carga(self.m); w = self.cubo.pos_sem[sem]
+        return float(c.aguda[w, a]), float(c.cronica[w, a]), float(c.razon()[w, a])
+
+    def serie_carga(self, a, ultimas=6):
+        """[(semana, razón)] de las últimas semanas del atleta."""
+        c = self.cubo.carga(self.m); r = c.razon()[:, a]
+        return [(s, float(r[w])) for w, s in enumerate(self.cubo.semanas)][-ultimas:]
+
+# --- FICHA DE UN ATLETA (SIN ARMAR EL PLANTEL) ---
+def agregados_ficha(cubo):
+    """Lo único de las columnas completas que compara la Ficha: (media del plantel (W, M), puestos (A, W, M) int32).
+    Se calcula una vez por versión; después cada Ficha lee solo la fila de su atleta."""
+    media = np.zeros((len(cubo.semanas), len(cubo.metricas))); puestos = np.zeros(cubo.valores.shape, np.int32)
+    for m, f in enumerate(cubo.filas):
+        if not len(f): continue
+        for w in np.flatnonzero(cubo.tiene_sem[:, m]):
+            media[w, m] = Hoja(cubo, m).col(cubo.semanas[w]).mean()
+            puestos[f, w, m] = cubo.ranking.rangos(m, w)
+    return media, puestos
+
+class CuboFicha(Cubo):
+    """Cubo con la fila de un solo atleta (o ninguna: índice del buscador) y, por semana y hoja, lo que la Ficha
+    compara con el plantel ya agregado: la media de la columna y el puesto del atleta."""
+    def __init__(self, nombres, semanas, metricas, valores, filas, tiene_sem, plantel, media, puestos):
+        super().__init__(nombres, semanas, metricas, valores, filas, tiene_sem)
+        self.plantel = plantel          # list[np.ndarray[str]] (M): atletas de cada hoja, en el orden del Excel
+        self.media = media              # float64 (W, M): media de la hoja en la semana
+        self.puestos = puestos          # int32 (A, W, M): puesto del atleta cargado
+
+    def hoja(self, metrica):
+        m = self.pos_met.get(metrica)
+        if m is None or not len(self.plantel[m]): return None
+        return HojaFicha(self, m)
+
+    def nbytes(self):
+        return super().nbytes() + self.media.nbytes + self.puestos.nbytes + 8 * sum(len(p) for p in self.plantel)
+
+class HojaFicha(Hoja):
+    """Hoja de un CuboFicha: lo que la Ficha pide de una Hoja; las columnas del plantel no están."""
+    @property
+    def nombres(self): return self.cubo.plantel[self.m]
+
+    def col(self, sem):
+        raise NotImplementedError("La Ficha no carga las columnas del plantel")
+
+    def top(self, sem, k=TOP_K):
+        raise NotImplementedError("La Ficha no carga las columnas del plantel")
+
+    def media_semana(self, sem):
+        return float(self.cubo.media[self.cubo.pos_sem[sem], self.m])
+
+    def rango(self, a, sem):
+        return int(self.cubo.puestos[a, self.cubo.pos_sem[sem], self.m])
+
+    def trayectoria(self, a):
+        return [(s, int(self.cubo.puestos[a, w, self.m])) for w, s in enumerate(self.cubo.semanas) if self.cubo.tiene_sem[w, self.m]]
+
+def cubo_ficha(cubo, agregados, nombre=None):
+    """CuboFicha del atleta `nombre` (None: sin atleta). Del cubo (mapeado desde el snapshot) y de los puestos
+    se copia solo la fila del atleta: el resto del plantel no se lee."""
+    media, puestos = agregados
+    a = cubo.buscar(nombre) if nombre is not None else None
+    sel = [] if a is None else [a]
+    filas = [np.arange(len(sel)) if sel and cubo.pos_hoja[a, m] >= 0 else np.zeros(0, np.intp) for m in range(len(cubo.metricas))]
+    ficha = CuboFicha(cubo.nombres[sel], cubo.semanas, cubo.metricas, np.array(cubo.valores[sel]), filas, cubo.tiene_sem,
+                      [cubo.nombres[f] for f in cubo.filas], media, np.array(puestos[sel]))
+    ficha.version = cubo.version
+    return ficha
+
+def _fusionar_semanas(orden, nuevas):
+    # Une el orden de columnas de cada hoja respetando la secuencia de la temporada (Sem 50 ... Sem 07)
+    for i, s in enumerate(nuevas):
+        if s in orden: continue
+        prev = next((p for p in reversed(nuevas[:i]) if p in orden), None)
+        orden.insert(orden.index(prev) + 1 if prev else 0, s)
+
+def tabla_hoja(d, met):
+    """Hoja ancha (Nombre + columnas Sem) -> tabla larga semana/hoja/nombre/valor (NaN = celda sin dato)."""
+    cols = [c for c in d.columns if c.startswith("Sem")]
+    # Todo el bloque de semanas de la hoja en una sola pasada del kernel
+    v, ok = parse_col(d[cols].to_numpy(dtype=object).ravel(), met in METRICAS_TIEMPO)
+    return pd.DataFrame({'semana': np.tile(np.array(cols, dtype=object), len(d)), 'hoja': met,
+                         'nombre': np.repeat(d['Nombre'].to_numpy(dtype=object), len(cols)),
+                         'valor': np.where(ok, v, np.nan)})
+
+@medido("parseo_xlsx")
+def leer_xlsx(ruta):
+    """Lee el histórico UNA sola vez -> (tabla larga de todas las métricas, orden de semanas)."""
+    partes, semanas = [], []
+    with pd.ExcelFile(ruta, engine='openpyxl') as xls:
+        for met in METRICAS:
+            key = buscar_hoja(xls.sheet_names, met)
+            if not key: continue
+            d = pd.read_excel(xls, sheet_name=key, dtype=str)
+            d.columns = [str(c).strip() for c in d.columns]
+            col = next((c for c in d.columns if c.lower() in ['nombre','deportista','atleta']), None)
+            if not col: continue
+            # 🔥 FILTRO ANTI-DUPLICADOS: Elimina espacios ocultos y convierte a Formato Título
+            d['Nombre'] = d[col].astype(str).str.strip().str.title()
+            d = d[~d['Nombre'].str.lower().isin(NOMBRES_INVALIDOS)]
+            partes.append(tabla_hoja(d, met))
+            _fusionar_semanas(semanas, [c for c in d.columns if c.startswith("Sem")])
+    tabla = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=['semana', 'hoja', 'nombre', 'valor'])
+    return tabla, semanas
+
+@medido("armado_cubo")
+def cubo_desde_tabla(tabla, semanas):
+    """Tabla larga -> Cubo. Celdas repetidas (mismo atleta/semana/hoja): gana la última válida."""
+    nombres = pd.unique(tabla['nombre'].to_numpy(dtype=object))
+    a = pd.Index(nombres).get_indexer(tabla['nombre'])
+    w = pd.Index(semanas).get_indexer(tabla['semana'])
+    m = pd.Index(METRICAS).get_indexer(tabla['hoja'])
+    ok = (w >= 0) & (m >= 0)
+    a, w, m, v = a[ok], w[ok], m[ok], tabla['valor'].to_numpy(dtype=float)[ok]
+
+    A, W, M = len(nombres), len(semanas), len(METRICAS)
+    valores = np.zeros((A, W, M)); tiene_sem = np.zeros((W, M), bool)
+    tiene_sem[w, m] = True
+    filas_hoja = [pd.unique(a[m == i]) for i in range(M)]
+    celdas = pd.DataFrame({'a': a, 'w': w, 'm': m, 'v': v}).dropna(subset=['v'])
+    celdas = celdas.drop_duplicates(['a', 'w', 'm'], keep='last')
+    valores[celdas['a'].to_numpy(), celdas['w'].to_numpy(), celdas['m'].to_numpy()] = celdas['v'].to_numpy()
+    return Cubo(np.asarray(nombres, dtype=object), list(semanas), list(METRICAS), valores, filas_hoja, tiene_sem)
+
+def cargar_cubo(ruta):
+    """Lee el histórico UNA sola vez y arma el cubo con todas las métricas."""
+    return cubo_desde_tabla(*leer_xlsx(ruta))
@@ -0,0 +1,88 @@
+# =============================================================================
+# 🌐 DESCARGAS DE PLANILLAS REMOTAS: en paralelo, conexiones reutilizadas y pedidos condicionales
+# Un archivo sin cambios responde 304 y se reutiliza la copia (y su parseo) que ya se tiene
+# =============================================================================
+import hashlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import rendimiento as rend
+
+TIMEOUT_S = 30
+CONEXIONES = 8
+
+_lock = threading.Lock()
+_sesion = None
+_copias = {}  # url -> Descarga (última versión recibida)
+
+class Descarga:
+    """Contenido de una URL y su versión (ETag, Last-Modified o hash del contenido).
+    Se compara y hashea por (url, versión): sirve directo como clave de caché."""
+    __slots__ = ('url', 'version', 'contenido', 'etag', 'modificado')
+
+    def __init__(self, url, contenido, etag=None, modificado=None):
+        self.url, self.contenido, self.etag, self.modificado = url, contenido, etag, modificado
+        self.version = etag or modificado or hashlib.sha256(contenido).hexdigest()[:16]
+
+    def abrir(self):
+        return io.BytesIO(self.contenido)
+
+    def __eq__(self, otro):
+        return isinstance(otro, Descarga) and (self.url, self.version) == (otro.url, otro.version)
+
+    def __hash__(self):
+        return hash((self.url, self.version))
+
+def es_url(x):
+    return isinstance(x, str) and x.lower().startswith(("http://", "https://"))
+
+def sesion():
+    """Sesión compartida por el proceso (pool de conexiones keep-alive, reintentos ante 5xx)."""
+    global _sesion
+    with _lock:
+        if _sesion is None:
+            s = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=CONEXIONES, pool_maxsize=CONEXIONES,
+                                    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)))
+            s.mount("http://", adaptador); s.mount("https://", adaptador)
+            _sesion = s
+        return _sesion
+
+@rend.medido("descarga")
+def obtener(url):
+    """Descarga de `url`; si ya hay una copia, pide solo si cambió (If-None-Match / If-Modified-Since).
+    Si el servidor no responde y hay copia, se sigue con la copia."""
+    with _lock: copia = _copias.get(url)
+    encabezados = {}
+    if copia is not None:
+        if copia.etag: encabezados['If-None-Match'] = copia.etag
+        if copia.modificado: encabezados['If-Modified-Since'] = copia.modificado
+    try:
+        r = sesion().get(url, headers=encabezados, timeout=TIMEOUT_S)
+        if r.status_code == 304 and copia is not None:
+            rend.cache('descargas', True)
+            return copia
+        r.raise_for_status()
+    except requests.RequestException:
+        if copia is None: raise
+        rend.cache('descargas', True)
+        return copia
+    rend.cache('descargas', False)
+    d = Descarga(url, r.content, r.headers.get('ETag'), r.headers.get('Last-Modified'))
+    with _lock: _copias[url] = d
+    return d
+
+def resolver(fuentes):
+    """Misma lista con cada URL reemplazada por su Descarga (todas en paralelo); rutas y buffers pasan igual."""
+    urls = list(dict.fromkeys(f for f in fuentes if es_url(f)))
+    if not urls: return list(fuentes)
+    if len(urls) == 1: bajadas = {urls[0]: obtener(urls[0])}
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(urls), CONEXIONES)) as ex: bajadas = dict(zip(urls, ex.map(obtener, urls)))
+    return [bajadas.get(f, f) if es_url(f) else f for f in fuentes]
+
+def olvidar():
+    with _lock: _copias.clear()
@@ -0,0 +1,33 @@
+# =============================================================================
+# 🧩 CACHÉ DE FRAGMENTOS HTML (clave = club, vista, semana, atleta, versión de datos, fragmento)
+# Con datos sin cambios, un rerun arma las vistas con búsquedas en vez de reconstruir el HTML
+# =============================================================================
+import threading
+from collections import OrderedDict
+import rendimiento as rend
+
+MAX_FRAGMENTOS = 20000
+
+_lock = threading.Lock()
+_frag = OrderedDict()
+
+def obtener(clave, construir):
+    """Fragmento cacheado para `clave` (tupla cuyo primer elemento es el club) o construir() si no está."""
+    with _lock:
+        if clave in _frag:
+            _frag.move_to_end(clave); rend.cache('html', True)
+            return _frag[clave]
+    rend.cache('html', False)
+    valor = construir()  # Fuera del lock: dos viewers pueden construir el mismo fragmento, nunca se bloquean
+    with _lock:
+        _frag[clave] = valor
+        while len(_frag) > MAX_FRAGMENTOS: _frag.popitem(last=False)
+    return valor
+
+def invalidar(club):
+    """Descarta los fragmentos de un club (datos nuevos fusionados)."""
+    with _lock:
+        for k in [k for k in _frag if k[0] == club]: del _frag[k]
+
+def cantidad():
+    with _lock: return len(_frag)
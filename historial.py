@@ -0,0 +1,414 @@
+# =============================================================================
+# 🗄️ HISTÓRICO APPEND-ONLY (SQLite): agregar una semana solo escribe esa semana
+# historico.xlsx queda como semilla inicial y como respaldo: el almacén vive en el disco del servidor
+# (no sobrevive a un reinicio del hosting), así que cada fusión queda pendiente hasta exportarlo y subirlo
+# =============================================================================
+import io
+import os
+import re
+import sqlite3
+import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import openpyxl
+import pandas as pd
+from datos import METRICAS, METRICAS_TIEMPO, NOMBRES_INVALIDOS, parse_col, buscar_hoja, leer_xlsx, cubo_desde_tabla
+from snapshot import DIR_SNAPSHOTS, cubo_versionado, tabla_cacheada
+from nombres import IndiceNombres, plegar, resolver_lote
+from rendimiento import medido
+
+DB_HISTORIAL = "historico.db"
+
+# Hoja del histórico -> columna del Excel semanal
+MAPEO_COLUMNAS = {
+    'Tiempo Total': 'Tiempo Total (hh:mm:ss)', 'Distancia Total': 'Distancia Total (km)', 'Altimetría Total': 'Altimetría Total (m)',
+    'Natación': 'Nat: Tiempo (hh:mm:ss)', 'Nat Distancia': 'Nat: Distancia (km)', 'Nat Ritmo': 'Nat: Ritmo (min/100m)',
+    'Ciclismo': 'Ciclismo: Tiempo (hh:mm:ss)', 'Ciclismo Distancia': 'Ciclismo: Distancia (km)', 'Ciclismo Desnivel': 'Ciclismo: KOM/Desnivel (m)', 'Ciclismo Max': 'Ciclismo: Más larga (km)',
+    'Trote': 'Trote: Tiempo (hh:mm:ss)', 'Trote Distancia': 'Trote: Distancia (km)', 'Trote Desnivel': 'Trote: KOM/Desnivel (m)', 'Trote Ritmo': 'Trote: Ritmo (min/km)', 'Trote Max': 'Trote: Más larga (km)',
+    'CV': 'CV (Equilibrio)'
+}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS semanas (semana TEXT PRIMARY KEY, orden INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS celdas (semana TEXT NOT NULL, hoja TEXT NOT NULL, nombre TEXT NOT NULL, valor REAL);
+CREATE INDEX IF NOT EXISTS idx_celdas_semana ON celdas(semana);
+CREATE TABLE IF NOT EXISTS alias (alias TEXT PRIMARY KEY, nombre TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor);
+CREATE TABLE IF NOT EXISTS cambios (generacion INTEGER NOT NULL, semana TEXT NOT NULL);
+"""
+
+def fmt_hms(seg):
+    """Segundos -> 'hh:mm:ss' (columna completa)."""
+    seg = pd.Series(np.asarray(seg, dtype=np.int64))
+    dos = lambda x: x.astype(str).str.zfill(2)
+    return (dos(seg // 3600) + ":" + dos(seg % 3600 // 60) + ":" + dos(seg % 60)).to_numpy()
+
+def _conectar(ruta_db):
+    con = sqlite3.connect(ruta_db)
+    con.executescript(ESQUEMA)
+    # Identidad del almacén: un histórico re-sembrado no reutiliza snapshots de otro con la misma generación
+    if con.execute("SELECT 1 FROM meta WHERE clave = 'id'").fetchone() is None:
+        with con: con.execute("INSERT OR IGNORE INTO meta (clave, valor) VALUES ('id', ?)", (uuid.uuid4().hex[:12],))
+    return con
+
+def _version(con):
+    meta = dict(con.execute("SELECT clave, valor FROM meta"))
+    g = int(meta.get('generacion', 0))
+    # Recién sembrado, la versión es la del Excel semilla: un almacén re-sembrado del mismo Excel reutiliza sus snapshots
+    return f"{meta['semilla'] if g == 0 and 'semilla' in meta else meta['id']}:{g}"
+
+def _generacion(version):
+    return int(version.rsplit(":", 1)[1])
+
+def version_db(ruta_db):
+    """Versión de los datos ('id:generación'); la generación sube con cada fusión. Leerla no recorre las celdas."""
+    con = _conectar(ruta_db)
+    try: return _version(con)
+    finally: con.close()
+
+def _subir_generacion(con, semanas):
+    con.execute("INSERT INTO meta (clave, valor) VALUES ('generacion', 1) ON CONFLICT(clave) DO UPDATE SET valor = valor + 1")
+    g = _generacion(_version(con))
+    con.executemany("INSERT INTO cambios (generacion, semana) VALUES (?, ?)", ((g, s) for s in semanas))
+
+def semanas_cambiadas(ruta_db, desde, hasta):
+    """Semanas escritas por las fusiones entre dos versiones (desde excluida), o None si no se puede saber
+    (otro almacén, o generaciones sin registro)."""
+    if desde is None or hasta is None: return None
+    g0, g1 = _generacion(desde), _generacion(hasta)
+    con = _conectar(ruta_db)
+    try:
+        meta = dict(con.execute("SELECT clave, valor FROM meta"))
+        # La versión de la semilla (generación 0) es del mismo almacén que las que siguen
+        mismo = desde.split(":")[0] == hasta.split(":")[0] or (g0 == 0 and desde.split(":")[0] == meta.get('semilla') and hasta.split(":")[0] == meta['id'])
+        if not mismo: return None
+        filas = con.execute("SELECT generacion, semana FROM cambios WHERE generacion > ? AND generacion <= ?", (g0, g1)).fetchall()
+    finally: con.close()
+    if len({g for g, _ in filas}) != g1 - g0: return None
+    return {s for _, s in filas}
+
+def respaldo_pendiente(ruta_db):
+    """Fusiones que todavía no están en un historico.xlsx exportado (0 = el respaldo está al día)."""
+    con = _conectar(ruta_db)
+    try:
+        fila = con.execute("SELECT valor FROM meta WHERE clave = 'respaldo'").fetchone()
+        return _generacion(_version(con)) - int(fila[0] if fila else 0)
+    finally: con.close()
+
+def marcar_respaldo(ruta_db, version):
+    """Registra que se exportó el histórico de `version` (una exportación vieja no borra fusiones posteriores)."""
+    con = _conectar(ruta_db)
+    with con:
+        if _version(con).split(":")[0] == version.split(":")[0]:
+            con.execute("INSERT INTO meta (clave, valor) VALUES ('respaldo', ?) ON CONFLICT(clave) DO UPDATE SET valor = MAX(valor, excluded.valor)",
+                        (_generacion(version),))
+    con.close()
+
+def _registrar_semana(con, semana):
+    # Una semana nueva se intercala en su lugar de la temporada (una recuperada no pasa a ser la última);
+    # el orden de las que ya están no se toca. Sin número de semana: al final
+    existentes = [r[0] for r in con.execute("SELECT semana FROM semanas ORDER BY orden")]
+    if semana in existentes: return
+    clave = clave_temporada(existentes + [semana]); k = clave[semana]
+    pos = len(existentes) if k is None else next((i for i, s in enumerate(existentes) if clave[s] is not None and clave[s] > k), len(existentes))
+    _ordenar_semanas(con, existentes[:pos] + [semana] + existentes[pos:])
+
+def _ordenar_semanas(con, semanas):
+    con.execute("DELETE FROM semanas")
+    con.executemany("INSERT INTO semanas (semana, orden) VALUES (?, ?)", ((s, i) for i, s in enumerate(semanas, 1)))
+
+def _insertar_celdas(con, semanas, tabla):
+    valores = tabla['valor'].astype(object).where(tabla['valor'].notna(), None)
+    con.executemany("INSERT INTO celdas (semana, hoja, nombre, valor) VALUES (?, ?, ?, ?)",
+                    zip(semanas, tabla['hoja'], tabla['nombre'], valores))
+
+def _insertar(con, semana, tabla):
+    # Re-subir una semana reemplaza solo esa semana; el resto del histórico no se toca
+    con.execute("DELETE FROM celdas WHERE semana = ?", (semana,))
+    _registrar_semana(con, semana)
+    _insertar_celdas(con, [semana] * len(tabla), tabla)
+
+def inicializar(ruta_db, ruta_xlsx, directorio=DIR_SNAPSHOTS):
+    """Crea el almacén a partir de historico.xlsx la primera vez. Se siembra con la tabla leída (no con el cubo):
+    las celdas vacías quedan vacías y la exportación devuelve lo mismo que se leyó. La tabla sale del snapshot
+    del Excel (clave = hash del contenido): sin cambios en el Excel, re-sembrar no vuelve a pasar por openpyxl."""
+    if os.path.exists(ruta_db) or not os.path.exists(ruta_xlsx): return
+    tabla, semanas, semilla = tabla_cacheada(ruta_xlsx, leer_xlsx, directorio)
+    tmp = ruta_db + ".tmp"
+    if os.path.exists(tmp): os.remove(tmp)
+    con = _conectar(tmp)
+    with con:
+        _ordenar_semanas(con, semanas)  # El orden de columnas del Excel manda
+        _insertar_celdas(con, tabla['semana'], tabla)  # Orden original de filas del Excel
+        con.execute("INSERT INTO meta (clave, valor) VALUES ('semilla', ?)", (semilla,))
+    con.close()
+    os.replace(tmp, ruta_db)
+
+# --- INGESTA SEMANAL EN STREAMING: bloques de filas -> acumulado por deportista ---
+TAMANO_BLOQUE = 5000
+EXCLUIDOS = NOMBRES_INVALIDOS | {'totales', 'promedio'}
+# Cómo se combinan varias filas (actividades) del mismo deportista; el resto se suma.
+# Ritmos: promedio ponderado por la distancia de la disciplina
+AGREGACION = {'Ciclismo Max': 'max', 'Trote Max': 'max', 'CV': 'ultimo', 'Nat Ritmo': 'Nat Distancia', 'Trote Ritmo': 'Trote Distancia'}
+
+class AgregadorSemana:
+    """Acumula el Excel semanal bloque a bloque: la memoria crece con el plantel, no con las filas."""
+    def __init__(self, mapeo=MAPEO_COLUMNAS):
+        self.mapeo = {h: c for h, c in mapeo.items() if h in METRICAS}
+        self.indice = {}   # nombre -> posición (orden de aparición)
+        self.acc = {}      # hoja -> acumuladores por deportista
+
+    def _acumuladores(self, hoja):
+        if hoja not in self.acc:
+            self.acc[hoja] = {'v': np.zeros(0), 'n': np.zeros(0, np.int64), 'peso': np.zeros(0), 'ultimo': np.zeros(0)}
+        a = self.acc[hoja]; faltan = len(self.indice) - len(a['v'])
+        if faltan > 0:
+            ini = -np.inf if AGREGACION.get(hoja) == 'max' else 0
+            for k in a: a[k] = np.concatenate([a[k], np.full(faltan, ini if k == 'v' else 0, dtype=a[k].dtype)])
+        return a
+
+    def agregar(self, bloque):
+        bloque.columns = [str(c).strip() for c in bloque.columns]
+        if 'Deportista' not in bloque.columns: raise ValueError("El archivo no tiene la columna 'Deportista'")
+        nombres = bloque['Deportista'].astype(str).str.strip().str.title()
+        validos = ~nombres.str.lower().isin(EXCLUIDOS).to_numpy()
+        pos = np.array([self.indice.setdefault(n, len(self.indice)) for n in nombres.to_numpy()[validos]], dtype=np.intp)
+        leidas = {}
+        for hoja, col in self.mapeo.items():
+            if col not in bloque.columns: continue
+            v, ok = parse_col(bloque[col], hoja in METRICAS_TIEMPO)
+            leidas[hoja] = (v[validos].astype(float), ok[validos])
+        for hoja, (v, ok) in leidas.items():
+            a = self._acumuladores(hoja); p, x = pos[ok], v[ok]
+            modo = AGREGACION.get(hoja, 'suma')
+            if modo == 'max': np.maximum.at(a['v'], p, x)
+            elif modo in leidas:  # Ponderado por distancia
+                d, ok_d = leidas[modo]; w = np.where(ok_d, d, 0)[ok]
+                np.add.at(a['v'], p, x * w); np.add.at(a['peso'], p, w)
+            elif modo == 'suma': np.add.at(a['v'], p, x)
+            # Último valor válido de cada deportista en el bloque (índices repetidos: gana el último)
+            _, ult = np.unique(p[::-1], return_index=True); ult = len(p) - 1 - ult
+            a['ultimo'][p[ult]] = x[ult]
+            np.add.at(a['n'], p, 1)
+
+    def tabla(self):
+        nombres = np.array(list(self.indice), dtype=object)
+        partes = []
+        for hoja in self.mapeo:
+            if hoja not in self.acc: continue
+            a = self._acumuladores(hoja); modo = AGREGACION.get(hoja, 'suma')
+            if modo in ('suma', 'max'): v = a['v']
+            elif modo == 'ultimo': v = a['ultimo']
+            else: v = np.divide(a['v'], a['peso'], out=a['ultimo'].copy(), where=a['peso'] > 0)
+            if hoja in METRICAS_TIEMPO: v = np.round(v)  # Segundos enteros, como el kernel
+            partes.append(pd.DataFrame({'hoja': hoja, 'nombre': nombres, 'valor': np.where(a['n'] > 0, v, np.nan)}))
+        return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=['hoja', 'nombre', 'valor'])
+
+def _bloques_xlsx(archivo, columnas):
+    # openpyxl en modo solo lectura: recorre filas sin cargar el libro; solo se guardan las columnas mapeadas
+    wb = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        filas = wb.worksheets[0].iter_rows(values_only=True)
+        enc = [str(c).strip() if c is not None else "" for c in next(filas, ())]
+        usar = [i for i, c in enumerate(enc) if c in columnas]
+        buf = []
+        for fila in filas:
+            buf.append([fila[i] if i < len(fila) else None for i in usar])
+            if len(buf) >= TAMANO_BLOQUE: yield pd.DataFrame(buf, columns=[enc[i] for i in usar]); buf = []
+        if buf or not usar: yield pd.DataFrame(buf, columns=[enc[i] for i in usar])
+    finally: wb.close()
+
+def _bloques_csv(archivo, columnas):
+    yield from pd.read_csv(archivo, usecols=lambda c: str(c).strip() in columnas, chunksize=TAMANO_BLOQUE)
+
+@medido("parseo_semanal")
+def leer_semanal_stream(nombre_archivo, archivo, mapeo=MAPEO_COLUMNAS):
+    """Excel/CSV semanal (ruta o archivo abierto) -> tabla larga, leyendo por bloques con memoria acotada."""
+    columnas = {'Deportista', *mapeo.values()}
+    bloques = _bloques_csv if nombre_archivo.lower().endswith('.csv') else _bloques_xlsx
+    ag = AgregadorSemana(mapeo)
+    for b in bloques(archivo, columnas): ag.agregar(b)
+    return ag.tabla()
+
+@medido("escritura_semana")
+def agregar_semana(ruta_db, semana, tabla):
+    """Escribe solo las celdas de la semana nueva (una transacción); devuelve el reporte de nombres."""
+    return agregar_semanas(ruta_db, [(semana, tabla)])
+
+@medido("escritura_lote")
+def agregar_semanas(ruta_db, semanas):
+    """[(semana, tabla)] en cualquier orden, todas en UNA transacción (o ninguna); cada semana queda en su lugar
+    de la temporada. Los nombres se resuelven contra el plantel (acentos, orden, alias) recorriendo las semanas
+    en orden de temporada; devuelve el reporte de la resolución."""
+    clave = clave_temporada([s for s, _ in semanas])
+    semanas = sorted(semanas, key=lambda p: (clave[p[0]] is None, clave[p[0]] or 0))
+    con = _conectar(ruta_db)
+    reporte = {'unidos': {}, 'sugeridos': {}, 'ambiguos': {}, 'nuevos': []}
+    with con:
+        indice = _indice_nombres(con)
+        for semana, tabla in semanas:
+            mapa, rep = resolver_lote(indice, tabla['nombre'])
+            tabla = tabla.assign(nombre=tabla['nombre'].map(mapa))
+            for n in mapa.values(): indice.agregar(n)  # Nombres nuevos de una semana valen para las siguientes del lote
+            for k in ('unidos', 'sugeridos', 'ambiguos'): reporte[k].update(rep[k])
+            reporte['nuevos'] += [n for n in rep['nuevos'] if n not in reporte['nuevos']]
+            _insertar(con, semana, tabla)
+        _subir_generacion(con, [s for s, _ in semanas])  # En la misma transacción: quien lee la versión nueva ve todas las semanas
+    con.close()
+    return reporte
+
+@medido("union_nombres")
+def unir_nombres(ruta_db, pares):
+    """{nombre en el almacén: deportista del plantel} confirmados por el admin: las celdas del primero pasan al
+    segundo y el par queda como alias para las próximas cargas (una transacción)."""
+    con = _conectar(ruta_db)
+    with con:
+        semanas = set()
+        for origen, destino in pares.items():
+            semanas |= {r[0] for r in con.execute("SELECT DISTINCT semana FROM celdas WHERE nombre = ?", (origen,))}
+            con.execute("UPDATE celdas SET nombre = ? WHERE nombre = ?", (destino, origen))
+        _guardar_alias(con, pares)
+        if semanas: _subir_generacion(con, sorted(semanas))
+    con.close()
+
+def _indice_nombres(con):
+    plantel = [r[0] for r in con.execute("SELECT nombre FROM celdas GROUP BY nombre ORDER BY MIN(rowid)")]
+    return IndiceNombres(plantel, dict(con.execute("SELECT alias, nombre FROM alias")))
+
+def _guardar_alias(con, pares):
+    con.executemany("INSERT OR REPLACE INTO alias (alias, nombre) VALUES (?, ?)", ((plegar(a), n) for a, n in pares.items()))
+
+def leer_alias(ruta_db):
+    """Tabla de alias del club: alias (plegado) -> nombre del plantel."""
+    con = _conectar(ruta_db)
+    try: return pd.read_sql_query("SELECT alias, nombre FROM alias ORDER BY nombre, alias", con)
+    finally: con.close()
+
+def guardar_alias(ruta_db, tabla):
+    """Reemplaza la tabla de alias (DataFrame alias/nombre; filas incompletas se ignoran)."""
+    con = _conectar(ruta_db)
+    with con:
+        con.execute("DELETE FROM alias")
+        _guardar_alias(con, {a: n for a, n in zip(tabla['alias'], tabla['nombre']) if str(a).strip() and str(n).strip() and pd.notna(a) and pd.notna(n)})
+    con.close()
+
+# --- CARGA POR LOTE (VARIOS EXCEL SEMANALES) ---
+_RE_SEMANA = [re.compile(r'sem(?:ana)?[\s_.-]*(\d{1,2})(?!\d)', re.I),   # 'Sem 06', 'semana_6'
+              re.compile(r'^(\d{1,2})(?!\d)')]                              # '06 Sem (tst).xlsx'
+
+SEMANAS_ANIO = 53
+
+def numero_semana(semana):
+    """'Sem 06' -> 6 (None si el nombre no trae un número de semana válido)."""
+    for rx in _RE_SEMANA:
+        m = rx.search(str(semana).strip())
+        if m: return int(m.group(1)) if 1 <= int(m.group(1)) <= SEMANAS_ANIO else None
+    return None
+
+def clave_temporada(semanas):
+    """{semana: posición en la temporada} (None sin número). La temporada cruza el año (Sem 50, 51, 52, 01...):
+    empieza después del hueco más largo entre los números de semana presentes."""
+    nums = {s: numero_semana(s) for s in semanas}
+    ns = sorted({n for n in nums.values() if n is not None})
+    ini = max(((ns[(i + 1) % len(ns)] - n - 1) % SEMANAS_ANIO, ns[(i + 1) % len(ns)]) for i, n in enumerate(ns))[1] if ns else 1
+    return {s: (n - ini) % SEMANAS_ANIO if n is not None else None for s, n in nums.items()}
+
+def inferir_semana(nombre_archivo):
+    """Nombre de archivo -> 'Sem NN' (None si no se reconoce)."""
+    base = os.path.splitext(os.path.basename(nombre_archivo))[0].strip()
+    for rx in _RE_SEMANA:
+        m = rx.search(base)
+        if m: return f"Sem {int(m.group(1)):02d}"
+    return None
+
+def leer_semanal(nombre_archivo, contenido):
+    """Bytes de un Excel/CSV semanal -> tabla larga (función de módulo: se puede mandar a otro proceso)."""
+    return leer_semanal_stream(nombre_archivo, io.BytesIO(contenido))
+
+@medido("parseo_lote")
+def leer_semanales(archivos, procesos=None):
+    """[(nombre, bytes)] -> [tabla] en el mismo orden, parseando en paralelo (procesos=1: en serie)."""
+    procesos = min(procesos or os.cpu_count() or 1, len(archivos))
+    if procesos <= 1: return [leer_semanal(n, c) for n, c in archivos]
+    with ProcessPoolExecutor(max_workers=procesos) as ex:
+        return list(ex.map(leer_semanal, *zip(*archivos)))
+
+def cargar_cubo_db(ruta_db, directorio=DIR_SNAPSHOTS):
+    """Cubo de la versión actual del almacén: snapshot de esa generación o lectura de la base."""
+    return cubo_versionado(version_db(ruta_db), lambda: _leer_db(ruta_db), directorio)
+
+def _leer_celdas(ruta_db):
+    con = _conectar(ruta_db)
+    try:
+        con.execute("BEGIN")  # Lectura consistente: versión, semanas y celdas de la misma generación
+        version = _version(con)
+        semanas = [r[0] for r in con.execute("SELECT semana FROM semanas ORDER BY orden")]
+        tabla = pd.read_sql_query("SELECT semana, hoja, nombre, valor FROM celdas ORDER BY rowid", con)
+        con.rollback()
+    finally: con.close()
+    return version, semanas, tabla
+
+@medido("lectura_db")
+def _leer_db(ruta_db):
+    version, semanas, tabla = _leer_celdas(ruta_db)
+    cubo = cubo_desde_tabla(tabla, semanas)
+    cubo.version = version
+    return cubo
+
+def _hoja_metrica(filas, met, celdas, semanas):
+    """Filas (encabezado + datos) de una hoja de métrica: columnas propias de la plantilla + semanas del almacén."""
+    enc = list(filas[0]) if filas else ["Nombre"]
+    datos = [list(f) + [None] * (len(enc) - len(f)) for f in filas[1:]]
+    txt = [str(c).strip() if c is not None else "" for c in enc]
+    col = next((i for i, c in enumerate(txt) if c.lower() in ('nombre', 'deportista', 'atleta')), None)
+    if col is None: enc, txt, datos, col = ["Nombre"] + enc, ["Nombre"] + txt, [[None] + f for f in datos], 0
+    propias = [i for i, c in enumerate(txt) if not c.startswith("Sem")]   # Posición, Nombre, Promedio, Tiempo Acumulado...
+    viejas = {c: i for i, c in enumerate(txt) if c.startswith("Sem")}
+    presentes = set(celdas['semana']); sems = [s for s in semanas if s in presentes]
+    # Valores de cada atleta y semana en el orden en que se leyeron: la k-ésima fila repetida de un nombre recibe
+    # su k-ésimo valor, así la hoja se relee igual. Sin dato = celda vacía
+    x = celdas['valor'].to_numpy(dtype=float); ok = ~np.isnan(x)
+    vals = np.full(len(x), None, dtype=object)
+    vals[ok] = fmt_hms(x[ok]).tolist() if met in METRICAS_TIEMPO else x[ok].tolist()
+    valores = defaultdict(list)
+    for n, s, v in zip(celdas['nombre'], celdas['semana'], vals): valores[(n, s)].append(v)
+    usados = defaultdict(int)
+    def semv(n):
+        k = usados[n]; usados[n] += 1
+        return [valores[(n, s)][k] if k < len(valores[(n, s)]) else None for s in sems]
+    del_almacen = set(celdas['nombre'])
+    salida = [[enc[i] for i in propias] + sems]
+    for f in datos:
+        n = str(f[col]).strip().title() if f[col] is not None else None
+        if n in del_almacen: salida.append([f[i] for i in propias] + semv(n))
+        else: salida.append([f[i] for i in propias] + [f[viejas[s]] if s in viejas else None for s in sems])  # Filas que no se leen (vacías, totales)
+    for n in pd.unique(celdas['nombre']):  # Deportistas que llegaron con las fusiones
+        for _ in range(max((len(valores[(n, s)]) for s in sems), default=0) - usados[n]):
+            fila = [None] * len(propias); fila[propias.index(col)] = n
+            salida.append(fila + semv(n))
+    return salida
+
+@medido("exportar_xlsx")
+def exportar_xlsx(ruta_db, plantilla=None, excluir=()):
+    """historico.xlsx desde el almacén sobre el Excel `plantilla` (la semilla del club): las hojas de métricas se
+    rearman con las semanas del almacén conservando sus otras columnas, las demás hojas quedan intactas y las
+    celdas sin dato quedan vacías. Leer el archivo exportado devuelve lo que hay en el almacén (sin `excluir`)."""
+    _, semanas, tabla = _leer_celdas(ruta_db)
+    tabla = tabla[~tabla['semana'].isin(set(excluir))]
+    if plantilla and os.path.exists(plantilla): wb = openpyxl.load_workbook(plantilla)
+    else: wb = openpyxl.Workbook(); wb.remove(wb.active)
+    usadas = set()
+    for met in METRICAS:
+        celdas = tabla[tabla['hoja'] == met]
+        key = buscar_hoja(wb.sheetnames, met)
+        if key in usadas: key = None  # Cada hoja de la plantilla es de una sola métrica
+        if key is None and celdas.empty: continue
+        filas = list(wb[key].values) if key else []
+        pos = wb.sheetnames.index(key) if key else None
+        if key: wb.remove(wb[key])
+        ws = wb.create_sheet(key or met, pos); usadas.add(key or met)
+        for f in _hoja_metrica(filas, met, celdas, semanas): ws.append(f)
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
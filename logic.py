@@ -1,26 +1,33 @@
 import pandas as pd
-import datetime
+import numpy as np
 import io
-import streamlit as st
+import copy
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
 from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.opc.oxml import serialize_part_xml
+
+from datos import parse_col, normalizar_nombre, Acumulados, Carga, zona_carga
+from nombres import IndiceNombres, resolver_lote
+import descargas
+from rendimiento import medido, cache
 
 # --- FUNCIONES DE LIMPIEZA Y FORMATO ---
-def clean_time(val):
-    if pd.isna(val) or str(val).strip() in ['NC', '0', '', 'NAN', '-']: return pd.Timedelta(0)
-    try:
-        if isinstance(val, (datetime.time, datetime.datetime)):
-            return pd.Timedelta(hours=val.hour, minutes=val.minute, seconds=val.second)
-        parts = list(map(int, str(val).split(':')))
-        if len(parts) == 3: return pd.Timedelta(hours=parts[0], minutes=parts[1], seconds=parts[2])
-        if len(parts) == 2: return pd.Timedelta(minutes=parts[0], seconds=parts[1])
-    except: pass
-    return pd.Timedelta(0)
-
-def clean_float(val):
-    try: return float(str(val).replace(',', '.'))
-    except: return 0.0
+def a_valor(x, is_time):
+    # Segundos del kernel -> Timedelta para tiempos (formato del reporte); float32 -> float sin ruido de redondeo
+    return pd.Timedelta(seconds=float(x)) if is_time else round(float(x), 6)
+
+def media_positiva(vals, is_time):
+    v = vals[vals > 0]
+    return a_valor(v.mean(dtype=np.float64), is_time) if len(v) else None
 
 def fmt_time(td):
     if not isinstance(td, pd.Timedelta) or td.total_seconds() == 0: return "-"
@@ -52,111 +59,218 @@ def calc_diff(val, avg, is_time, invert_logic=False):
     color = "green" if is_good else "red"
     return txt, color
 
+# --- CONFIGURACIÓN V25 ---
+METRICAS_V25 = {
+    'tot_tiempo': {'c': 'Tiempo Total (hh:mm:ss)', 'h': 'Total', 't': 'time', 'l': 'Tiempo Total', 'u': '', 'inv': False},
+    'tot_dist':   {'c': 'Distancia Total (km)', 'h': 'Distancia Total', 't': 'float', 'l': 'Distancia Total', 'u': 'km', 'inv': False},
+    'tot_elev':   {'c': 'Altimetría Total (m)', 'h': 'Altimetría', 't': 'float', 'l': 'Desnivel Total', 'u': 'm', 'inv': False},
+    'cv':         {'c': 'CV (Equilibrio)', 'h': 'CV', 't': 'float', 'l': 'Consistencia', 'u': '', 'inv': False},
+    'nat_tiempo': {'c': 'Nat: Tiempo (hh:mm:ss)', 'h': 'Natación', 't': 'time', 'l': 'Tiempo', 'u': '', 'inv': False},
+    'nat_dist':   {'c': 'Nat: Distancia (km)', 'h': 'Nat Distancia', 't': 'float', 'l': 'Distancia', 'u': 'km', 'inv': False},
+    'nat_ritmo':  {'c': 'Nat: Ritmo (min/100m)', 'h': 'Nat Ritmo', 't': 'time', 'l': 'Ritmo', 'u': '/100m', 'inv': True},
+    'bike_tiempo': {'c': 'Ciclismo: Tiempo (hh:mm:ss)', 'h': 'Ciclismo', 't': 'time', 'l': 'Tiempo', 'u': '', 'inv': False},
+    'bike_dist':   {'c': 'Ciclismo: Distancia (km)', 'h': 'Ciclismo Distancia', 't': 'float', 'l': 'Distancia', 'u': 'km', 'inv': False},
+    'bike_elev':   {'c': 'Ciclismo: KOM/Desnivel (m)', 'h': 'Ciclismo Desnivel', 't': 'float', 'l': 'Desnivel', 'u': 'm', 'inv': False},
+    'bike_vel':    {'c': 'Ciclismo: Vel. Media (km/h)', 'h': 'Ciclismo Velocidad', 't': 'float', 'l': 'Vel. Media', 'u': ' km/h', 'inv': False},
+    'run_tiempo': {'c': 'Trote: Tiempo (hh:mm:ss)', 'h': 'Trote', 't': 'time', 'l': 'Tiempo', 'u': '', 'inv': False},
+    'run_dist':   {'c': 'Trote: Distancia (km)', 'h': 'Trote Distancia', 't': 'float', 'l': 'Distancia', 'u': 'km', 'inv': False},
+    'run_elev':   {'c': 'Trote: KOM/Desnivel (m)', 'h': 'Trote Desnivel', 't': 'float', 'l': 'Desnivel', 'u': 'm', 'inv': False},
+    'run_ritmo':  {'c': 'Trote: Ritmo (min/km)', 'h': 'Trote Ritmo', 't': 'time', 'l': 'Ritmo', 'u': '/km', 'inv': True},
+}
+
+def promedios_por_atleta(nombres, vals):
+    """Promedio de semanas con actividad (>0) de TODOS los atletas de una hoja, indexado por nombre normalizado."""
+    medias = pd.Series(Acumulados.desde(vals.T).media(positiva=True), index=pd.Index(nombres).map(normalizar_nombre))
+    return medias[~medias.index.duplicated()]  # Nombre repetido: gana la primera fila, como antes
+
+# Carga de entrenamiento del reporte: (clave de METRICAS_V25, etiqueta)
+CARGAS_V25 = [('tot_tiempo', "Tiempo Total"), ('tot_dist', "Distancia Total"), ('nat_tiempo', "🏊 Natación"), ('bike_tiempo', "🚴 Ciclismo"), ('run_tiempo', "🏃 Trote")]
+
+def cargas_por_atleta(nombres, vals):
+    """Carga (aguda, crónica) al cierre del histórico de TODOS los atletas de una hoja, indexada por nombre normalizado."""
+    ag, cr = Carga.desde(vals.T).ultima()
+    est = pd.DataFrame({'ag': ag, 'cr': cr}, index=pd.Index(nombres).map(normalizar_nombre))
+    return est[~est.index.duplicated()]
+
+# --- CACHÉ LOCAL (sin Streamlit: logic.py se usa también desde cli.py) ---
+def _version_arg(a):
+    # Una ruta vale por su versión (fecha de modificación + tamaño): archivo reemplazado = clave nueva
+    if isinstance(a, str) and os.path.exists(a):
+        st = os.stat(a); return (a, st.st_mtime_ns, st.st_size)
+    return a
+
+def _en_memoria(a):
+    # BytesIO, archivos abiertos, subidas de Streamlit: hashean por identidad, no por contenido
+    return hasattr(a, 'read') or hasattr(a, 'getvalue')
+
+def memo_versionado(maximo=8):
+    """Resultados por versión de los archivos de entrada, sin vencimiento: mientras no cambien no se re-parsean,
+    y apenas cambian se recalculan. Archivos en memoria o abiertos no se cachean: el mismo objeto puede traer
+    otro contenido (o ya estar leído) y uno igual llega como objeto nuevo; tampoco los argumentos no hasheables."""
+    def deco(fn):
+        memo = OrderedDict(); lock = threading.Lock()
+        @wraps(fn)
+        def envuelta(*args):
+            if any(_en_memoria(a) for a in args): return fn(*args)
+            clave = tuple(_version_arg(a) for a in args)
+            try: hash(clave)
+            except TypeError: return fn(*args)
+            with lock:
+                if clave in memo:
+                    memo.move_to_end(clave); cache('logic', True)
+                    return memo[clave]
+            cache('logic', False)
+            r = fn(*args)
+            with lock:
+                memo[clave] = r
+                while len(memo) > maximo: memo.popitem(last=False)
+            return r
+        envuelta.limpiar = memo.clear
+        return envuelta
+    return deco
+
 # --- PROCESAMIENTO DE DATOS ---
-@st.cache_data(ttl=600)
 def cargar_procesar_datos(url_h, url_s):
+    """Histórico + semana (rutas, URLs o archivos en memoria). Las URLs se bajan en paralelo con pedidos
+    condicionales: si ninguna cambió (304), se reutiliza el resultado ya procesado de esas versiones."""
+    try: fuentes = descargas.resolver([url_h, url_s])
+    except Exception as e: return [], {}, {}, str(e)
+    return procesar_datos(*fuentes)
+
+def _abrir(fuente):
+    return fuente.abrir() if isinstance(fuente, descargas.Descarga) else fuente
+
+def _hoja(hojas, m):
+    # Primera hoja cuyo nombre contiene el de la métrica ('Total' -> 'Tiempo Total'), como siempre
+    return next((h for h in hojas if m['h'].lower() in h.lower()), None)
+
+def bloques_xlsx(dfs_hist):
+    """Hojas del Excel histórico -> {métrica: (nombres o None, valores atletas × semanas)}."""
+    bloques = {}
+    for k, m in METRICAS_V25.items():
+        target = _hoja(dfs_hist, m)
+        if not target: continue
+        dfh = dfs_hist[target]
+        cols = [c for c in dfh.columns if 'sem' in c.lower()]
+        vals = parse_col(dfh[cols].to_numpy(dtype=object).ravel(), m['t']=='time')[0].reshape(len(dfh), len(cols))
+        cnh = next((c for c in dfh.columns if c.lower() in ['nombre','deportista']), None)
+        bloques[k] = (dfh[cnh].astype(str) if cnh else None, vals)
+    return bloques
+
+def bloques_cubo(cubo, excluir=()):
+    """Lo mismo desde el cubo del almacén, sin armar ni parsear un Excel: semanas de cada hoja menos las excluidas."""
+    bloques = {}
+    for k, m in METRICAS_V25.items():
+        h = _hoja(cubo.metricas, m)
+        if h is None: continue
+        j = cubo.pos_met[h]; f = cubo.filas[j]
+        ws = [w for w, s in enumerate(cubo.semanas) if cubo.tiene_sem[w, j] and s not in excluir]
+        bloques[k] = (cubo.nombres[f], np.asarray(cubo.valores[np.ix_(f, ws, [j])])[:, :, 0])
+    return bloques
+
+@memo_versionado()
+@medido("logic_procesar")
+def procesar_datos(url_h, url_s):
     try:
-        df_sem = pd.read_excel(url_s, engine='openpyxl')
-        df_sem.columns = [str(c).strip() for c in df_sem.columns]
-        xls = pd.ExcelFile(url_h, engine='openpyxl')
+        df_sem = _leer_semana(url_s)
+        xls = pd.ExcelFile(_abrir(url_h), engine='openpyxl')
         dfs_hist = {s: pd.read_excel(xls, sheet_name=s) for s in xls.sheet_names}
+        return _procesar(df_sem, bloques_xlsx(dfs_hist))
+    except Exception as e:
+        return [], {}, {}, str(e)
 
-        # Configuración V25
-        M = {
-            'tot_tiempo': {'c': 'Tiempo Total (hh:mm:ss)', 'h': 'Total', 't': 'time', 'l': 'Tiempo Total', 'u': '', 'inv': False},
-            'tot_dist':   {'c': 'Distancia Total (km)', 'h': 'Distancia Total', 't': 'float', 'l': 'Distancia Total', 'u': 'km', 'inv': False},
-            'tot_elev':   {'c': 'Altimetría Total (m)', 'h': 'Altimetría', 't': 'float', 'l': 'Desnivel Total', 'u': 'm', 'inv': False},
-            'cv':         {'c': 'CV (Equilibrio)', 'h': 'CV', 't': 'float', 'l': 'Consistencia', 'u': '', 'inv': False},
-            'nat_tiempo': {'c': 'Nat: Tiempo (hh:mm:ss)', 'h': 'Natación', 't': 'time', 'l': 'Tiempo', 'u': '', 'inv': False},
-            'nat_dist':   {'c': 'Nat: Distancia (km)', 'h': 'Nat Distancia', 't': 'float', 'l': 'Distancia', 'u': 'km', 'inv': False},
-            'nat_ritmo':  {'c': 'Nat: Ritmo (min/100m)', 'h': 'Nat Ritmo', 't': 'time', 'l': 'Ritmo', 'u': '/100m', 'inv': True},
-            'bike_tiempo': {'c': 'Ciclismo: Tiempo (hh:mm:ss)', 'h': 'Ciclismo', 't': 'time', 'l': 'Tiempo', 'u': '', 'inv': False},
-            'bike_dist':   {'c': 'Ciclismo: Distancia (km)', 'h': 'Ciclismo Distancia', 't': 'float', 'l': 'Distancia', 'u': 'km', 'inv': False},
-            'bike_elev':   {'c': 'Ciclismo: KOM/Desnivel (m)', 'h': 'Ciclismo Desnivel', 't': 'float', 'l': 'Desnivel', 'u': 'm', 'inv': False},
-            'bike_vel':    {'c': 'Ciclismo: Vel. Media (km/h)', 'h': 'Ciclismo Velocidad', 't': 'float', 'l': 'Vel. Media', 'u': ' km/h', 'inv': False},
-            'run_tiempo': {'c': 'Trote: Tiempo (hh:mm:ss)', 'h': 'Trote', 't': 'time', 'l': 'Tiempo', 'u': '', 'inv': False},
-            'run_dist':   {'c': 'Trote: Distancia (km)', 'h': 'Trote Distancia', 't': 'float', 'l': 'Distancia', 'u': 'km', 'inv': False},
-            'run_elev':   {'c': 'Trote: KOM/Desnivel (m)', 'h': 'Trote Desnivel', 't': 'float', 'l': 'Desnivel', 'u': 'm', 'inv': False},
-            'run_ritmo':  {'c': 'Trote: Ritmo (min/km)', 'h': 'Trote Ritmo', 't': 'time', 'l': 'Ritmo', 'u': '/km', 'inv': True},
-        }
-
-        # Promedios
-        avgs_team = {}
-        for k, m in M.items():
-            if m['c'] in df_sem.columns:
-                raw = df_sem[m['c']].apply(lambda x: clean_time(x) if m['t']=='time' else clean_float(x))
-                if m['t']=='time':
-                    valid = raw[raw > pd.Timedelta(0)]
-                    avgs_team[k] = valid.mean() if not valid.empty else pd.Timedelta(0)
-                else:
-                    valid = raw[raw > 0]
-                    avgs_team[k] = valid.mean() if not valid.empty else 0.0
-            else: avgs_team[k] = None
-
-        avgs_hist = {}
-        for k, m in M.items():
-            target = next((s for s in dfs_hist if m['h'].lower() in s.lower()), None)
-            if target:
-                cols = [c for c in dfs_hist[target].columns if 'sem' in c.lower()]
-                vals = []
-                for c in cols:
-                    raw = dfs_hist[target][c].apply(lambda x: clean_time(x) if m['t']=='time' else clean_float(x))
-                    if m['t']=='time': vals.extend([x.total_seconds() for x in raw if x.total_seconds()>0])
-                    else: vals.extend([x for x in raw if x>0])
-                if vals:
-                    avgs_hist[k] = pd.Timedelta(seconds=sum(vals)/len(vals)) if m['t']=='time' else sum(vals)/len(vals)
-                else: avgs_hist[k] = None
-            else: avgs_hist[k] = None
-
-        # Atletas
-        data = []
-        c_nom = next((c for c in df_sem.columns if c in ['Deportista', 'Nombre']), None)
-        if c_nom:
-            for _, r in df_sem.iterrows():
-                nom = str(r[c_nom]).strip()
-                if nom.lower() in ['nan', 'totales', 'promedio']: continue
-                row_data = {'name': nom, 'metrics': {}}
-                for k, m in M.items():
-                    val = clean_time(r.get(m['c'])) if m['t']=='time' else clean_float(r.get(m['c']))
-                    val_str = (fmt_time(val) if m['t']=='time' else fmt_decimal(val)) + (" " + m['u'] if val!=0 and m['t']!='time' else "")
-                    
-                    hist_val = None
-                    target = next((s for s in dfs_hist if m['h'].lower() in s.lower()), None)
-                    if target:
-                        dfh = dfs_hist[target]
-                        cnh = next((c for c in dfh.columns if c.lower() in ['nombre','deportista']), None)
-                        if cnh:
-                            rh = dfh[dfh[cnh].astype(str).str.lower().str.strip() == nom.lower()]
-                            if not rh.empty:
-                                cols = [c for c in dfh.columns if 'sem' in c.lower()]
-                                v_h = [clean_time(rh.iloc[0][c]) if m['t']=='time' else clean_float(rh.iloc[0][c]) for c in cols]
-                                if m['t']=='time':
-                                    valid = [x.total_seconds() for x in v_h if x.total_seconds()>0]
-                                    if valid: hist_val = pd.Timedelta(seconds=sum(valid)/len(valid))
-                                else:
-                                    valid = [x for x in v_h if x>0]
-                                    if valid: hist_val = sum(valid)/len(valid)
-
-                    txt_eq, col_eq = calc_diff(val, avgs_team.get(k), m['t']=='time', m['inv'])
-                    txt_hist, col_hist = calc_diff(val, hist_val, m['t']=='time', m['inv'])
-                    if not hist_val: txt_hist = "New"; col_hist = "blue"
-
-                    row_data['metrics'][k] = {
-                        'val': val_str, 'meta': m,
-                        'eq_txt': txt_eq, 'eq_col': col_eq,
-                        'hist_txt': txt_hist, 'hist_col': col_hist,
-                        'raw_val': val, 'raw_type': m['t']
-                    }
-                data.append(row_data)
-        return data, avgs_team, avgs_hist, None
+@medido("logic_procesar_cubo")
+def procesar_con_cubo(cubo, url_s, excluir=()):
+    """Como procesar_datos, con el histórico tomado del cubo (cli: el almacén ya lo tiene armado)."""
+    try: return _procesar(_leer_semana(url_s), bloques_cubo(cubo, excluir))
     except Exception as e:
         return [], {}, {}, str(e)
 
+def _leer_semana(url_s):
+    df_sem = pd.read_excel(_abrir(url_s), engine='openpyxl')
+    df_sem.columns = [str(c).strip() for c in df_sem.columns]
+    return df_sem
+
+def _procesar(df_sem, bloques):
+    M = METRICAS_V25
+
+    # Semana actual: una pasada del kernel por columna
+    sem_vals = {}
+    for k, m in M.items():
+        if m['c'] in df_sem.columns: sem_vals[k] = parse_col(df_sem[m['c']], m['t']=='time')[0]
+        else: sem_vals[k] = np.zeros(len(df_sem))
+
+    # Promedios
+    avgs_team = {}
+    for k, m in M.items():
+        if m['c'] in df_sem.columns:
+            avgs_team[k] = media_positiva(sem_vals[k], m['t']=='time')
+            if avgs_team[k] is None: avgs_team[k] = a_valor(0, m['t']=='time')
+        else: avgs_team[k] = None
+
+    # Histórico: por métrica, el bloque atletas × semanas da los promedios de todos los atletas de una vez
+    avgs_hist = {k: None for k in M}; hist_atleta = {}; hist_carga = {}; plantel = {}
+    for k, (nombres, vals) in bloques.items():
+        avgs_hist[k] = media_positiva(vals.ravel(), M[k]['t']=='time')
+        if nombres is not None:
+            hist_atleta[k] = promedios_por_atleta(nombres, vals)
+            if k in dict(CARGAS_V25): hist_carga[k] = cargas_por_atleta(nombres, vals)
+            plantel.update(dict.fromkeys(nombres))
+
+    # Atletas
+    data = []
+    c_nom = next((c for c in df_sem.columns if c in ['Deportista', 'Nombre']), None)
+    if c_nom:
+        # Nombres de la semana -> nombres del histórico (acentos, orden de palabras, parecidos)
+        noms = df_sem[c_nom].astype(str).str.strip()
+        mapa, _ = resolver_lote(IndiceNombres(plantel), noms)
+        claves = [normalizar_nombre(mapa[n]) for n in noms]
+        # Carga: un paso de la EWMA desde el estado del histórico (atletas nuevos parten de 0)
+        carga_sem = {}
+        for k, _ in CARGAS_V25:
+            est = hist_carga[k].reindex(claves).fillna(0) if k in hist_carga else pd.DataFrame({'ag': 0.0, 'cr': 0.0}, index=claves)
+            c = Carga.desde(sem_vals[k][None], inicial=(est['ag'].to_numpy(), est['cr'].to_numpy()))
+            carga_sem[k] = (c.aguda[0], c.cronica[0], c.razon()[0])
+        for i, nom in enumerate(noms):
+            if nom.lower() in ['nan', 'totales', 'promedio']: continue
+            row_data = {'name': nom, 'metrics': {}, 'carga': []}
+            clave = claves[i]
+            for k, l in CARGAS_V25:
+                ag, cr, r = (float(x[i]) for x in carga_sem[k]); is_t = M[k]['t']=='time'
+                fmt = (lambda x: fmt_time(a_valor(x, True))) if is_t else (lambda x: fmt_decimal(x) + (" km" if x else ""))
+                row_data['carga'].append((l, fmt(ag), fmt(cr), f"{r:.2f} {zona_carga(r)}" if r > 0 else "-", zona_carga(r)))
+            for k, m in M.items():
+                val = a_valor(sem_vals[k][i], m['t']=='time')
+                val_str = (fmt_time(val) if m['t']=='time' else fmt_decimal(val)) + (" " + m['u'] if val!=0 and m['t']!='time' else "")
+                
+                h = hist_atleta[k].get(clave, np.nan) if k in hist_atleta else np.nan
+                hist_val = None if np.isnan(h) else a_valor(h, m['t']=='time')
+
+                txt_eq, col_eq = calc_diff(val, avgs_team.get(k), m['t']=='time', m['inv'])
+                txt_hist, col_hist = calc_diff(val, hist_val, m['t']=='time', m['inv'])
+                if not hist_val: txt_hist = "New"; col_hist = "blue"
+
+                row_data['metrics'][k] = {
+                    'val': val_str, 'meta': m,
+                    'eq_txt': txt_eq, 'eq_col': col_eq,
+                    'hist_txt': txt_hist, 'hist_col': col_hist,
+                    'raw_val': val, 'raw_type': m['t']
+                }
+            data.append(row_data)
+    return data, avgs_team, avgs_hist, None
+
 # --- GENERADOR WORD V35 ---
-def generar_word_v35(data, avs_team, avs_hist):
+def _documento():
     doc = Document()
     style = doc.styles['Normal']; style.font.name = 'Calibri'; style.font.size = Pt(10)
-    
+    return doc
+
+def _guardar(doc):
+    bio = io.BytesIO()
+    doc.save(bio); bio.seek(0)
+    return bio
+
+def _resumen_equipo(doc, data, avs_team, avs_hist):
     h1 = doc.add_heading("🦅 RESUMEN GLOBAL EQUIPO", 0)
     h1.alignment = WD_ALIGN_PARAGRAPH.CENTER; h1.runs[0].font.color.rgb = RGBColor(0, 51, 102)
     doc.add_paragraph("Reporte Semanal").alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -172,52 +286,137 @@ def generar_word_v35(data, avs_team, avs_hist):
         v_t = avs_team.get(k); v_h = avs_hist.get(k)
         r[1].text = fmt_time(v_t) if m['t']=='time' else fmt_decimal(v_t)
         r[2].text = fmt_time(v_h) if m['t']=='time' else fmt_decimal(v_h)
-    doc.add_page_break()
 
+# --- PLANTILLAS XML: bloques del atleta armados UNA vez con python-docx y clonados por atleta ---
+VERDE, ROJO, AZUL, GRIS, MARINO = RGBColor(0,100,0), RGBColor(180,0,0), RGBColor(0,0,128), RGBColor(150,150,150), RGBColor(0,51,102)
+COLOR_ZONA = {'Baja': AZUL, 'Óptima': VERDE, 'Alta': RGBColor(230,110,0), 'Riesgo': ROJO}
+_PLANTILLAS = {}
+
+def _plantillas():
+    if _PLANTILLAS: return _PLANTILLAS
+    doc = _documento(); X = "x"
+    doc.add_heading(X, 1).alignment = WD_ALIGN_PARAGRAPH.CENTER
+    doc.add_paragraph("─"*40).alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p = doc.add_paragraph(); p.alignment = WD_ALIGN_PARAGRAPH.CENTER; p.add_run(X).bold = True
+    p = doc.add_paragraph(); p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    p.add_run(X).font.color.rgb = VERDE; p.add_run(X).font.color.rgb = VERDE
+    p = doc.add_paragraph(); r = p.add_run(X); r.bold = True; r.font.color.rgb = MARINO
+    p = doc.add_paragraph(); r = p.add_run(X); r.bold = True; r.font.color.rgb = MARINO
+    p.add_run(" (Sin actividad)").font.color.rgb = GRIS
+    tb = doc.add_table(rows=1, cols=4); tb.autofit = True
+    hd = tb.rows[0].cells
+    hd[0].text="Métrica"; hd[1].text="Dato"; hd[2].text="Vs Promedio del Equipo"; hd[3].text="Vs tu Promedio Histórico"
+    row = tb.add_row().cells
+    row[0].text = X; row[1].text = X
+    row[2].paragraphs[0].add_run(X).font.color.rgb = VERDE; row[3].paragraphs[0].add_run(X).font.color.rgb = VERDE
+    doc.add_paragraph("")
+    doc.add_paragraph("💡 Insight: La consistencia es el camino al éxito.")
+    tb = doc.add_table(rows=1, cols=4); tb.autofit = True
+    hd = tb.rows[0].cells
+    hd[0].text="Carga"; hd[1].text="Aguda (7d)"; hd[2].text="Crónica (28d)"; hd[3].text="Razón A:C"
+    row = tb.add_row().cells
+    row[0].text = X; row[1].text = X; row[2].text = X
+    row[3].paragraphs[0].add_run(X).font.color.rgb = VERDE
+    body = list(doc.element.body.iterchildren(qn('w:p'), qn('w:tbl')))
+    claves = ['titulo', 'linea', 'kpis', 'vs', 'disciplina', 'sin_actividad', 'tabla', 'vacio', 'insight', 'tabla_carga']
+    _PLANTILLAS.update(zip(claves, body))
+    for t, f in (('tabla', 'fila'), ('tabla_carga', 'fila_carga')):
+        tabla = _PLANTILLAS[t]; fila = tabla.findall(qn('w:tr'))[-1]
+        tabla.remove(fila); _PLANTILLAS[f] = fila
+    return _PLANTILLAS
+
+def _clonar(nombre, textos=(), colores=()):
+    """Copia de la plantilla con el texto de cada run (en orden) y el color de los runs coloreados."""
+    el = copy.deepcopy(_plantillas()[nombre])
+    for r, t in zip(el.iter(qn('w:r')), textos): r.text = t
+    for c, rgb in zip(el.iter(qn('w:color')), colores): c.set(qn('w:val'), str(rgb))
+    return el
+
+def _color_hist(col):
+    return VERDE if col=='green' else (AZUL if col=='blue' else ROJO)
+
+def _pagina_atleta(body, d):
+    body._insert_p(_clonar('titulo', [f"🦅 {d['name']}"]))
+    body._insert_p(_clonar('linea'))
+    m = d['metrics']
+    body._insert_p(_clonar('kpis', [f"⏱️ {m['tot_tiempo']['val']} | 📏 {m['tot_dist']['val']} | ⛰️ {m['tot_elev']['val']}"]))
+    body._insert_p(_clonar('vs', [f"Vs Promedio del Equipo: {m['tot_tiempo']['eq_txt']}   ", f"Vs tu Promedio Histórico: {m['tot_tiempo']['hist_txt']}"],
+                           [VERDE if m['tot_tiempo']['eq_col']=='green' else ROJO, _color_hist(m['tot_tiempo']['hist_col'])]))
+
+    def tabla_v35(titulo, keys):
+        activos = [k for k in keys if (m[k]['raw_type']=='time' and m[k]['raw_val'].total_seconds()>0) or (m[k]['raw_type']!='time' and m[k]['raw_val']>0)]
+        if not activos: body._insert_p(_clonar('sin_actividad', [titulo])); return
+        body._insert_p(_clonar('disciplina', [titulo]))
+
+        tb = _clonar('tabla')
+        for k in keys:
+            item = m[k]
+            if (item['raw_type']=='time' and item['raw_val'].total_seconds()==0) or (item['raw_type']!='time' and item['raw_val']==0): continue
+            tb.append(_clonar('fila', [item['meta']['l'], item['val'], item['eq_txt'], item['hist_txt']],
+                              [VERDE if item['eq_col']=='green' else ROJO, _color_hist(item['hist_col'])]))
+        body._insert_tbl(tb)
+        body._insert_p(_clonar('vacio'))
+
+    tabla_v35("🏊 NATACIÓN", ['nat_tiempo','nat_dist','nat_ritmo'])
+    tabla_v35("🚴 CICLISMO", ['bike_tiempo','bike_dist','bike_elev','bike_vel'])
+    tabla_v35("🏃 TROTE", ['run_tiempo','run_dist','run_elev','run_ritmo'])
+
+    if d.get('carga'):
+        body._insert_p(_clonar('disciplina', ["⚖️ CARGA DE ENTRENAMIENTO"]))
+        tb = _clonar('tabla_carga')
+        for l, ag, cr, r, z in d['carga']: tb.append(_clonar('fila_carga', [l, ag, cr, r], [COLOR_ZONA.get(z, GRIS)]))
+        body._insert_tbl(tb)
+        body._insert_p(_clonar('vacio'))
+    
+    body._insert_p(_clonar('linea'))
+    body._insert_p(_clonar('insight'))
+
+@medido("word")
+def generar_word_v35(data, avs_team, avs_hist):
+    doc = _documento()
+    _resumen_equipo(doc, data, avs_team, avs_hist)
+    doc.add_page_break()
     for d in data:
-        doc.add_heading(f"🦅 {d['name']}", 1).alignment = WD_ALIGN_PARAGRAPH.CENTER
-        doc.add_paragraph("─"*40).alignment = WD_ALIGN_PARAGRAPH.CENTER
-        m = d['metrics']
-        p = doc.add_paragraph(); p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.add_run(f"⏱️ {m['tot_tiempo']['val']} | 📏 {m['tot_dist']['val']} | ⛰️ {m['tot_elev']['val']}").bold = True
-        
-        p2 = doc.add_paragraph(); p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run1 = p2.add_run(f"Vs Promedio del Equipo: {m['tot_tiempo']['eq_txt']}   ")
-        run1.font.color.rgb = RGBColor(0,100,0) if m['tot_tiempo']['eq_col']=='green' else RGBColor(180,0,0)
-        run2 = p2.add_run(f"Vs tu Promedio Histórico: {m['tot_tiempo']['hist_txt']}")
-        run2.font.color.rgb = RGBColor(0,100,0) if m['tot_tiempo']['hist_col']=='green' else (RGBColor(0,0,128) if m['tot_tiempo']['hist_col']=='blue' else RGBColor(180,0,0))
-
-        def tabla_v35(titulo, keys):
-            has_act = False
-            for k in keys:
-                if (m[k]['raw_type']=='time' and m[k]['raw_val'].total_seconds()>0) or (m[k]['raw_type']!='time' and m[k]['raw_val']>0): has_act=True
-            
-            p_tit = doc.add_paragraph(); r = p_tit.add_run(titulo); r.bold=True; r.font.color.rgb=RGBColor(0,51,102)
-            if not has_act: p_tit.add_run(" (Sin actividad)").font.color.rgb = RGBColor(150,150,150); return
-
-            tb = doc.add_table(rows=1, cols=4); tb.autofit = True
-            hd = tb.rows[0].cells
-            hd[0].text="Métrica"; hd[1].text="Dato"; hd[2].text="Vs Promedio del Equipo"; hd[3].text="Vs tu Promedio Histórico"
-            
-            for k in keys:
-                item = m[k]
-                if (item['raw_type']=='time' and item['raw_val'].total_seconds()==0) or (item['raw_type']!='time' and item['raw_val']==0): continue
-                row = tb.add_row().cells
-                row[0].text = item['meta']['l']; row[1].text = item['val']
-                req = row[2].paragraphs[0].add_run(item['eq_txt'])
-                req.font.color.rgb = RGBColor(0,100,0) if item['eq_col']=='green' else RGBColor(180,0,0)
-                rhist = row[3].paragraphs[0].add_run(item['hist_txt'])
-                rhist.font.color.rgb = RGBColor(0,100,0) if item['hist_col']=='green' else (RGBColor(0,0,128) if item['hist_col']=='blue' else RGBColor(180,0,0))
-            doc.add_paragraph("")
-
-        tabla_v35("🏊 NATACIÓN", ['nat_tiempo','nat_dist','nat_ritmo'])
-        tabla_v35("🚴 CICLISMO", ['bike_tiempo','bike_dist','bike_elev','bike_vel'])
-        tabla_v35("🏃 TROTE", ['run_tiempo','run_dist','run_elev','run_ritmo'])
-        
-        doc.add_paragraph("─"*40).alignment = WD_ALIGN_PARAGRAPH.CENTER
-        doc.add_paragraph("💡 Insight: La consistencia es el camino al éxito.").italic = True
+        _pagina_atleta(doc.element.body, d)
         if d != data[-1]: doc.add_page_break()
+    return _guardar(doc)
 
+# --- LOTE: UN WORD POR ATLETA + RESUMEN, EN UN ZIP ---
+_BASE_DOCX = {}
+
+def _word_atleta(d):
+    # Paquete .docx en blanco leído una vez por proceso: por atleta solo se serializa word/document.xml
+    if not _BASE_DOCX:
+        doc = _documento()
+        with zipfile.ZipFile(_guardar(doc)) as z: _BASE_DOCX['partes'] = [(i, z.read(i)) for i in z.infolist()]
+        _BASE_DOCX['raiz'] = doc.element
+    raiz = copy.deepcopy(_BASE_DOCX['raiz'])
+    _pagina_atleta(raiz.body, d)
     bio = io.BytesIO()
-    doc.save(bio); bio.seek(0)
-    return bio
\ No newline at end of file
+    with zipfile.ZipFile(bio, 'w', zipfile.ZIP_DEFLATED) as z:
+        for info, contenido in _BASE_DOCX['partes']:
+            z.writestr(info, serialize_part_xml(raiz) if info.filename == 'word/document.xml' else contenido)
+    return bio.getvalue()
+
+_RE_ARCHIVO = re.compile(r'[\\/:*?"<>|]')
+
+def _nombre_archivo(i, nom):
+    return f"{i:03d} {_RE_ARCHIVO.sub('', nom).strip() or 'Atleta'}.docx"
+
+@medido("word_lote")
+def generar_lote_v35(data, avs_team, avs_hist, procesos=None):
+    """ZIP con 'Resumen Equipo.docx' y un Word por atleta, generados en paralelo (procesos=1: en serie)."""
+    bio = io.BytesIO()
+    with zipfile.ZipFile(bio, 'w', zipfile.ZIP_DEFLATED) as z:
+        doc = _documento(); _resumen_equipo(doc, data, avs_team, avs_hist)
+        z.writestr("Resumen Equipo.docx", _guardar(doc).getvalue())
+        procesos = procesos or os.cpu_count() or 1
+        if procesos > 1 and len(data) > 1:
+            with ProcessPoolExecutor(max_workers=procesos) as ex:
+                # map respeta el orden: cada documento se escribe al ZIP apenas llega, sin acumularlos
+                docs = ex.map(_word_atleta, data, chunksize=max(1, len(data) // (procesos * 4)))
+                for i, (d, contenido) in enumerate(zip(data, docs), 1): z.writestr(_nombre_archivo(i, d['name']), contenido)
+        else:
+            for i, d in enumerate(data, 1): z.writestr(_nombre_archivo(i, d['name']), _word_atleta(d))
+    bio.seek(0)
+    return bio
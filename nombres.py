@@ -0,0 +1,94 @@
+# =============================================================================
+# 🪪 RESOLUCIÓN DE NOMBRES: acentos, espacios, orden de palabras y alias persistentes
+# Índice por bloques: un nombre nuevo solo se compara con los del plantel que comparten una clave
+# =============================================================================
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from datos import normalizar_nombre
+from rendimiento import medido
+
+UMBRAL = 0.85   # Similitud mínima para sugerir un nombre parecido (nunca se une solo: 'Mario' ≈ 'María')
+MARGEN = 0.05   # El mejor candidato debe ganarle al segundo por al menos esto (si no: ambiguo)
+PRIORIDAD = {'exacto': 0, 'alias': 1, 'normalizado': 2}  # Tipos que se unen al plantel sin preguntar
+
+def plegar(nombre):
+    """'  José  PÉREZ-Díaz ' -> 'jose perez diaz' (sin acentos ni mayúsculas; puntuación = espacio)."""
+    s = unicodedata.normalize('NFKD', str(nombre).casefold())
+    s = ''.join(c if c.isalnum() else ' ' for c in s if not unicodedata.combining(c))
+    return ' '.join(s.split())
+
+def clave_tokens(plegado):
+    # Independiente del orden: 'perez jose' == 'jose perez'
+    return ' '.join(sorted(plegado.split()))
+
+def claves_bloque(plegado):
+    # Palabra completa + inicial de otra palabra: 'Jose Peres' cae en el bloque 'jose|p' de 'José Pérez'
+    # aunque el apellido tenga un error, y el bloque no junta a todos los 'José' del club
+    t = plegado.split()
+    if len(t) < 2: return set(t)
+    return {f"{a}|{b[0]}" for i, a in enumerate(t) for j, b in enumerate(t) if i != j}
+
+class IndiceNombres:
+    """Nombres del plantel indexados por nombre exacto, clave normalizada, clave de palabras y bloques."""
+    def __init__(self, plantel=(), alias=None):
+        self._exactos = set()
+        self._norm = {}                    # normalizar_nombre -> nombre (gana el primero)
+        self._tokens = defaultdict(list)   # clave de palabras -> nombres
+        self._bloques = defaultdict(set)   # clave de bloque -> claves de palabras
+        self.alias = {plegar(a): n for a, n in (alias or {}).items()}  # alias plegado -> nombre del plantel
+        for n in plantel: self.agregar(n)
+
+    def agregar(self, nombre):
+        if nombre in self._exactos: return
+        self._exactos.add(nombre)
+        self._norm.setdefault(normalizar_nombre(nombre), nombre)
+        p = plegar(nombre); k = clave_tokens(p)
+        self._tokens[k].append(nombre)
+        for b in claves_bloque(p): self._bloques[b].add(k)
+
+    def resolver(self, nombre):
+        """-> (nombre del plantel o None, tipo, candidatos). Tipos: exacto, alias, normalizado, aproximado, ambiguo, nuevo."""
+        if nombre in self._exactos: return nombre, 'exacto', [nombre]
+        n = self._norm.get(normalizar_nombre(nombre))
+        if n is not None: return n, 'exacto', [n]
+        p = plegar(nombre)
+        if p in self.alias: return self.alias[p], 'alias', [self.alias[p]]
+        k = clave_tokens(p)
+        cand = self._tokens.get(k)
+        if cand: return (cand[0], 'normalizado', cand) if len(cand) == 1 else (None, 'ambiguo', list(cand))
+        return self._parecido(p, k)
+
+    def _parecido(self, p, k):
+        # Solo claves del mismo bloque; quick_ratio descarta barato antes de la comparación completa
+        sm = SequenceMatcher(None, autojunk=False); sm.set_seq2(k)
+        puntajes = []
+        for c in set().union(*(self._bloques.get(b, ()) for b in claves_bloque(p))):
+            sm.set_seq1(c)
+            if sm.real_quick_ratio() < UMBRAL or sm.quick_ratio() < UMBRAL: continue
+            r = sm.ratio()
+            if r >= UMBRAL: puntajes.append((r, c))
+        if not puntajes: return None, 'nuevo', []
+        puntajes.sort(reverse=True)
+        cerca = [self._tokens[c][0] for r, c in puntajes if puntajes[0][0] - r < MARGEN]
+        if len(cerca) > 1 or len(self._tokens[puntajes[0][1]]) > 1: return None, 'ambiguo', cerca
+        return cerca[0], 'aproximado', cerca
+
+@medido("resolucion_nombres")
+def resolver_lote(indice, nombres):
+    """Nombres de una carga -> ({nombre: nombre del plantel}, reporte). Solo se unen coincidencias seguras (mismo nombre,
+    alias, mismas palabras con otros acentos u orden); un parecido queda como vino y se reporta en 'sugeridos' para
+    que el admin lo confirme. Si dos nombres de la carga caen en el mismo deportista, lo conserva el de mejor
+    coincidencia y el otro es ambiguo."""
+    res = {n: indice.resolver(n) for n in dict.fromkeys(nombres)}
+    dueño = {}
+    for n, (c, tipo, _) in sorted(res.items(), key=lambda e: PRIORIDAD.get(e[1][1], 9)):
+        if c is None or tipo not in PRIORIDAD: continue
+        if c in dueño: res[n] = (None, 'ambiguo', [c])
+        else: dueño[c] = n
+    mapa = {n: c if t in PRIORIDAD else n for n, (c, t, _) in res.items()}
+    reporte = {'unidos': {n: c for n, (c, t, _) in res.items() if t == 'normalizado'},
+               'sugeridos': {n: c for n, (c, t, _) in res.items() if t == 'aproximado'},
+               'ambiguos': {n: cand for n, (_, t, cand) in res.items() if t == 'ambiguo'},
+               'nuevos': [n for n, (_, t, _) in res.items() if t == 'nuevo']}
+    return mapa, reporte
@@ -0,0 +1,91 @@
+# =============================================================================
+# ⚙️ PRECÁLCULO EN SEGUNDO PLANO: tras una fusión se arman los derivados de la versión nueva
+# Resumen y Ficha leen lo que ya esté listo; lo que falte lo calculan al vuelo, como siempre
+# =============================================================================
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import rendimiento as rend
+from datos import VISTAS
+from snapshot import agregados_versionados
+
+_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="precalculo")  # Un club a la vez: no compite con los reruns
+_lock = threading.Lock()
+_estado = {}  # club -> {'version', 'hecho', 'total', 'etapa', 'error', 'inicio', 'fin'}
+_kpis = {}    # club -> (versión, KPIs del Resumen): solo la última versión precalculada
+
+def tareas(nombre_club, cubo):
+    """[(etapa, fn)] que dejan en el cubo todo lo que leen Resumen y Ficha para la última semana. Los derivados
+    se arman bajo el lock del cubo, así una sesión que pide lo mismo espera el resultado en vez de rehacerlo."""
+    base = cubo.hoja(VISTAS['Global']['D'])
+    if base is None or not base.semanas: return []
+    sem = base.semanas[-1]; w = cubo.pos_sem[sem]
+    n_hist = len(cubo.semanas) - cubo.pos_sem[base.semanas[0]]
+    hojas = [h for v in cubo.vistas().values() for h in v.values() if h is not None]
+
+    def kpis():
+        tiempo = cubo.hoja(VISTAS['Global']['T'])
+        k = {'T': float(tiempo.col(sem).sum()) if tiempo is not None and tiempo.tiene(sem) else 0,
+             'D': float(base.col(sem).sum()), 'activos': int((base.col(sem) > 0.1).sum())}
+        with _lock: _kpis[nombre_club] = (cubo.version, k)
+
+    def ranking(h):
+        def fn():
+            if not h.tiene(sem): return
+            h.top(sem); cubo.ranking.rangos(h.m, w)
+        return fn
+
+    def trayectoria():
+        for s in base.semanas: cubo.ranking.rangos(base.m, cubo.pos_sem[s])
+
+    def medias(h):
+        def fn():
+            a = cubo.acum(h.m)
+            for ultimas in (n_hist, 4, 12): a.media(ultimas)  # Ventanas de la Ficha
+        return fn
+
+    def semaforo():
+        cubo.cumplimiento.alertas(w, base.filas); cubo.cumplimiento.temporada()
+
+    def cargas():
+        for cat, k in (('Global', 'T'), ('Global', 'D'), ('Nat', 'T'), ('Bici', 'T'), ('Trote', 'T')):
+            m = cubo.pos_met.get(VISTAS[cat][k])
+            if m is not None: cubo.carga(m).razon()
+
+    return ([("KPIs", kpis)] + [(f"Top 10 {h.metrica}", ranking(h)) for h in hojas] + [("Trayectorias", trayectoria)]
+            + [(f"Promedios {h.metrica}", medias(h)) for h in hojas] + [("Semáforo", semaforo), ("Carga", cargas)]
+            + [("Fichas", lambda: agregados_versionados(cubo))])  # Media y puestos del plantel: cada Ficha lee solo su fila
+
+def _correr(almacen, club):
+    e = {'version': None, 'hecho': 0, 'total': 1, 'etapa': "Carga de datos", 'error': None, 'inicio': time.time(), 'fin': None}
+    with _lock: _estado[club.nombre] = e
+    try:
+        with rend.etapa("precalculo"):
+            cubo = almacen.obtener(club)
+            e['version'] = cubo.version
+            ts = tareas(club.nombre, cubo)
+            e['total'] = len(ts) + 1; e['hecho'] = 1
+            for etapa, fn in ts:
+                e['etapa'] = etapa; fn(); e['hecho'] += 1
+    except Exception as ex: e['error'] = str(ex)
+    e['etapa'] = None; e['fin'] = time.time()
+
+def lanzar(almacen, club):
+    """Encola el precálculo del club (vuelve enseguida; el trabajo sigue aunque la sesión termine)."""
+    with _lock: _estado[club.nombre] = {'version': None, 'hecho': 0, 'total': 1, 'etapa': "En cola", 'error': None, 'inicio': time.time(), 'fin': None}
+    return _pool.submit(_correr, almacen, club)
+
+def estado(nombre_club):
+    """Copia del estado del último precálculo del club (None si nunca se lanzó)."""
+    with _lock:
+        e = _estado.get(nombre_club)
+        return dict(e) if e is not None else None
+
+def en_curso(nombre_club):
+    e = estado(nombre_club)
+    return e is not None and e['fin'] is None
+
+def kpis(nombre_club, version):
+    """KPIs del Resumen ya calculados para esa versión, o None (la vista los calcula)."""
+    with _lock: v, k = _kpis.get(nombre_club, (None, None))
+    return k if v == version else None
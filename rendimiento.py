@@ -0,0 +1,81 @@
+# =============================================================================
+# 📈 INSTRUMENTACIÓN: tiempos por etapa, aciertos de caché y memoria por rerun
+# Sin dependencias de Streamlit: datos.py / historial.py / logic.py también miden
+# =============================================================================
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+MAX_CORRIDAS = 50
+
+_lock = threading.Lock()
+_local = threading.local()  # Streamlit corre cada rerun en su propio hilo
+_corridas = deque(maxlen=MAX_CORRIDAS)
+_totales = {}  # etapa -> [veces, segundos, máximo]
+_cache = {}    # nombre -> {'aciertos': n, 'fallos': n}
+
+def memoria_mb():
+    """RSS actual del proceso en MB (None si el sistema no lo expone)."""
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Pico (KB en Linux)
+        except ImportError: return None
+
+def nueva_corrida(vista):
+    """Abre el registro de un rerun; las etapas medidas en este hilo quedan asociadas a él."""
+    c = {'inicio': time.strftime("%H:%M:%S"), 'vista': vista, 'etapas': {}, 'mem_mb': memoria_mb()}
+    _local.corrida = c
+    with _lock: _corridas.append(c)
+    return c
+
+def registrar(etapa, seg):
+    with _lock:
+        t = _totales.setdefault(etapa, [0, 0.0, 0.0])
+        t[0] += 1; t[1] += seg; t[2] = max(t[2], seg)
+        c = getattr(_local, 'corrida', None)
+        if c is not None:
+            c['etapas'][etapa] = c['etapas'].get(etapa, 0.0) + seg
+            c['mem_mb'] = memoria_mb()
+
+@contextmanager
+def etapa(nombre):
+    t = time.perf_counter()
+    try: yield
+    finally: registrar(nombre, time.perf_counter() - t)
+
+def medido(nombre):
+    """Decorador: mide cada llamada de la función como la etapa `nombre`."""
+    def deco(fn):
+        @wraps(fn)
+        def envuelta(*args, **kwargs):
+            with etapa(nombre): return fn(*args, **kwargs)
+        return envuelta
+    return deco
+
+def cache(nombre, acierto):
+    with _lock:
+        c = _cache.setdefault(nombre, {'aciertos': 0, 'fallos': 0})
+        c['aciertos' if acierto else 'fallos'] += 1
+
+def resumen():
+    """Foto del estado: últimas corridas, totales por etapa, cachés y memoria."""
+    with _lock:
+        return {
+            'mem_mb': memoria_mb(),
+            'corridas': [dict(c, etapas=dict(c['etapas'])) for c in _corridas],
+            'etapas': {k: {'veces': v[0], 'total_s': v[1], 'prom_s': v[1] / v[0], 'max_s': v[2]} for k, v in _totales.items()},
+            'cache': {k: dict(v, tasa=v['aciertos'] / max(1, v['aciertos'] + v['fallos'])) for k, v in _cache.items()},
+        }
+
+def exportar_json():
+    return json.dumps(resumen(), indent=2, ensure_ascii=False)
+
+def reiniciar():
+    with _lock: _corridas.clear(); _totales.clear(); _cache.clear()
@@ -0,0 +1,132 @@
+# =============================================================================
+# 💾 SNAPSHOTS BINARIOS DEL CUBO (clave = versión del almacén) Y DE LA SEMILLA (clave = hash del Excel)
+# Un proceso nuevo mapea en memoria los .npy en vez de volver a parsear con openpyxl
+# =============================================================================
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from datos import Cubo, agregados_ficha
+from rendimiento import cache, etapa, medido
+
+DIR_SNAPSHOTS = os.path.join(".cache", "snapshots")
+LIMITE_BYTES = 256 * 1024 * 1024
+FORMATO = "cubo-v1"  # Cambiar si cambia la estructura del Cubo: invalida los snapshots viejos
+FORMATO_TABLA = "tabla-v1"  # Ídem para la tabla de la semilla
+
+def hash_archivo(ruta, formato=FORMATO):
+    h = hashlib.sha256(formato.encode())
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""): h.update(bloque)
+    return h.hexdigest()[:24]
+
+def _tamano(ruta):
+    return sum(os.path.getsize(os.path.join(ruta, f)) for f in os.listdir(ruta))
+
+def _publicar(clave, directorio, arreglos, meta):
+    destino = os.path.join(directorio, clave)
+    if os.path.isdir(destino): return destino
+    tmp = destino + f".tmp{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+    for nombre, x in arreglos.items(): np.save(os.path.join(tmp, f"{nombre}.npy"), x)
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f: json.dump(meta, f, ensure_ascii=False)
+    try: os.replace(tmp, destino)  # Publicación atómica: otro proceso nunca ve un snapshot a medias
+    except OSError: shutil.rmtree(tmp, ignore_errors=True)
+    limpiar(directorio, conservar=clave)
+    return destino
+
+@medido("snapshot_guardar")
+def guardar(cubo, clave, directorio=DIR_SNAPSHOTS):
+    return _publicar(clave, directorio, {'valores': np.ascontiguousarray(cubo.valores), 'tiene_sem': cubo.tiene_sem,
+                                         'filas': np.concatenate(cubo.filas).astype(np.intp)},
+                     {'nombres': [str(n) for n in cubo.nombres], 'semanas': cubo.semanas, 'metricas': cubo.metricas,
+                      'largos': [len(x) for x in cubo.filas]})
+
+@medido("snapshot_carga")
+def cargar(clave, directorio=DIR_SNAPSHOTS):
+    ruta = os.path.join(directorio, clave)
+    if not os.path.isdir(ruta): return None
+    try:
+        with open(os.path.join(ruta, "meta.json"), encoding="utf-8") as f: meta = json.load(f)
+        valores = np.load(os.path.join(ruta, "valores.npy"), mmap_mode='r')
+        tiene_sem = np.load(os.path.join(ruta, "tiene_sem.npy"))
+        filas = np.split(np.load(os.path.join(ruta, "filas.npy")), np.cumsum(meta['largos'])[:-1])
+    except (OSError, ValueError, KeyError): return None
+    os.utime(ruta)  # Marca de uso para la limpieza LRU
+    return Cubo(np.array(meta['nombres'], dtype=object), meta['semanas'], meta['metricas'], valores, filas, tiene_sem)
+
+def limpiar(directorio=DIR_SNAPSHOTS, limite=LIMITE_BYTES, conservar=None):
+    """Borra snapshots menos usados hasta quedar bajo el límite (el recién escrito se conserva)."""
+    if not os.path.isdir(directorio): return
+    snaps = [os.path.join(directorio, d) for d in os.listdir(directorio)]
+    for s in [s for s in snaps if ".tmp" in os.path.basename(s)]:
+        if time.time() - os.path.getmtime(s) > 3600: shutil.rmtree(s, ignore_errors=True)  # Escrituras interrumpidas
+    snaps = sorted((s for s in snaps if os.path.isdir(s) and ".tmp" not in os.path.basename(s)), key=os.path.getmtime)
+    total = sum(_tamano(s) for s in snaps)
+    for s in snaps:
+        if total <= limite: break
+        if os.path.basename(s) == conservar: continue
+        total -= _tamano(s); shutil.rmtree(s, ignore_errors=True)
+
+def clave_version(version):
+    return hashlib.sha256(f"{FORMATO}|{version}".encode()).hexdigest()[:24]
+
+def cubo_versionado(version, construir, directorio=DIR_SNAPSHOTS):
+    """Cubo de una versión conocida del almacén (sin hashear el archivo): su snapshot o construir().
+    construir() devuelve el cubo con la versión que efectivamente leyó, y se guarda con esa."""
+    cubo = cargar(clave_version(version), directorio)
+    cache("snapshot", cubo is not None)
+    if cubo is not None:
+        cubo.version = version
+        return cubo
+    cubo = construir()
+    try: guardar(cubo, clave_version(cubo.version), directorio)
+    except OSError: pass
+    return cubo
+
+TEXTOS_TABLA = ('semana', 'hoja', 'nombre')
+
+def tabla_cacheada(ruta, construir, directorio=DIR_SNAPSHOTS):
+    """(tabla larga, semanas, clave) del Excel `ruta` desde su snapshot; si el contenido cambió, construir(ruta)
+    y se escribe uno nuevo. Se guarda la tabla y no el cubo: la semilla conserva celdas vacías y filas repetidas."""
+    with etapa("snapshot_hash"): clave = hash_archivo(ruta, FORMATO_TABLA)
+    ruta_snap = os.path.join(directorio, clave)
+    try:
+        with open(os.path.join(ruta_snap, "meta.json"), encoding="utf-8") as f: meta = json.load(f)
+        tabla = pd.DataFrame({c: np.array(meta[c], dtype=object)[np.load(os.path.join(ruta_snap, f"{c}.npy"))] for c in TEXTOS_TABLA})
+        tabla['valor'] = np.load(os.path.join(ruta_snap, "valor.npy"))
+        os.utime(ruta_snap)
+        cache("snapshot_tabla", True)
+        return tabla, meta['semanas'], clave
+    except (OSError, ValueError, KeyError): cache("snapshot_tabla", False)
+    tabla, semanas = construir(ruta)
+    codigos = {c: pd.factorize(tabla[c]) for c in TEXTOS_TABLA}
+    try: _publicar(clave, directorio, {**{c: k.astype(np.int32) for c, (k, _) in codigos.items()}, 'valor': tabla['valor'].to_numpy(dtype=float)},
+                   {**{c: [str(x) for x in u] for c, (_, u) in codigos.items()}, 'semanas': semanas})
+    except OSError: pass  # Sin disco escribible: se sigue sin snapshot
+    return tabla, semanas, clave
+
+def agregados_versionados(cubo, directorio=DIR_SNAPSHOTS):
+    """Agregados de la Ficha (media, puestos) de la versión del cubo: se guardan junto a su snapshot y los
+    puestos se mapean en memoria, así cada Ficha lee solo la fila de su atleta."""
+    if cubo._agregados is not None: return cubo._agregados
+    with cubo._lock:  # El precálculo y una Ficha abierta no los arman dos veces
+        if cubo._agregados is not None: return cubo._agregados
+        ruta = os.path.join(directorio, clave_version(cubo.version))
+        try:
+            agregados = np.load(os.path.join(ruta, "media.npy")), np.load(os.path.join(ruta, "puestos.npy"), mmap_mode='r')
+            cache("agregados", True)
+        except (OSError, ValueError):
+            cache("agregados", False)
+            with etapa("agregados_ficha"): agregados = agregados_ficha(cubo)
+            if os.path.isdir(ruta):
+                try:
+                    for nombre, x in zip(("puestos", "media"), agregados[::-1]):  # media.npy al final: marca de listo
+                        tmp = os.path.join(ruta, f"{nombre}.tmp{os.getpid()}.npy"); np.save(tmp, x)
+                        os.replace(tmp, os.path.join(ruta, f"{nombre}.npy"))
+                except OSError: pass
+        cubo._agregados = agregados
+    return agregados
@@ -0,0 +1,6 @@
+# Los módulos de la app viven en la raíz del repo (sin paquete): se importan desde ahí
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path: sys.path.insert(0, RAIZ)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datos import Acumulados, Carga, cubo_desde_tabla, parse_numeros, parse_tiempos, rachas, top_k
+
+def cubo(celdas, semanas):
+    return cubo_desde_tabla(pd.DataFrame(celdas, columns=['semana', 'hoja', 'nombre', 'valor']), semanas)
+
+CELDAS = [('Sem 01', 'Distancia Total', 'Ana', 10.0), ('Sem 01', 'Distancia Total', 'Beto', 0.0),
+          ('Sem 02', 'Distancia Total', 'Ana', 20.0), ('Sem 02', 'Distancia Total', 'Beto', 5.0),
+          ('Sem 01', 'Tiempo Total', 'Ana', 3600.0)]
+
+def test_acumulados_agregar_igual_a_desde():
+    v = np.random.default_rng(0).uniform(0, 10, (7, 4)); v[v < 3] = 0
+    a = Acumulados.desde(v[:3], True)
+    for x in v[3:]: a.agregar(x)
+    b = Acumulados.desde(v, True)
+    for u in (None, 2, 5):
+        for pos in (False, True):
+            assert np.allclose(a.media(u, positiva=pos), b.media(u, positiva=pos), equal_nan=True)
+
+def test_heredar_extiende_acumulados_y_cargas_con_semanas_y_atletas_nuevos():
+    viejo = cubo(CELDAS, ['Sem 01', 'Sem 02'])
+    antes = [(viejo.acum(m).media().copy(), viejo.carga(m).razon().copy()) for m in range(len(viejo.metricas))]
+    celdas = CELDAS + [('Sem 03', 'Distancia Total', 'Ana', 7.0), ('Sem 03', 'Distancia Total', 'Caro', 4.0)]
+    nuevo, fresco = cubo(celdas, ['Sem 01', 'Sem 02', 'Sem 03']), cubo(celdas, ['Sem 01', 'Sem 02', 'Sem 03'])
+    assert nuevo.heredar(viejo, {'Sem 03'})
+    for m, (media, razon) in enumerate(antes):  # Quien sigue leyendo el cubo anterior no ve la semana nueva
+        assert np.array_equal(viejo.acum(m).media(), media, equal_nan=True) and np.array_equal(viejo.carga(m).razon(), razon)
+    for m in range(len(nuevo.metricas)):
+        for u in (None, 1, 2):
+            assert np.allclose(nuevo._acum[m].media(u), fresco.acum(m).media(u), equal_nan=True)
+        assert np.allclose(nuevo._carga[m].aguda, fresco.carga(m).aguda) and np.allclose(nuevo._carga[m].razon(), fresco.carga(m).razon())
+
+def test_carga_agregar_igual_a_desde():
+    v = np.random.default_rng(1).uniform(0, 10, (9, 3))
+    a = Carga.desde(v[:4])
+    for x in v[4:]: a.agregar(x)
+    b = Carga.desde(v)
+    assert np.allclose(a.aguda, b.aguda) and np.allclose(a.cronica, b.cronica) and np.allclose(a.razon(), b.razon())
+
+def test_heredar_rechaza_semana_re_subida_o_intercalada():
+    viejo = cubo(CELDAS, ['Sem 01', 'Sem 02'])
+    assert not cubo(CELDAS, ['Sem 01', 'Sem 02']).heredar(viejo, {'Sem 02'})
+    assert not cubo(CELDAS, ['Sem 01', 'Sem 15', 'Sem 02']).heredar(viejo, {'Sem 15'})
+
+def test_rachas():
+    f = np.array([[1, 1, 0, 1, 1, 1], [0, 0, 0, 0, 0, 0]], dtype=bool)
+    assert rachas(f).tolist() == [[1, 2, 0, 1, 2, 3], [0, 0, 0, 0, 0, 0]]
+
+def test_cumplimiento_faltas_y_rachas():
+    celdas = [(s, 'Distancia Total', 'Ana', 10.0) for s in ('Sem 01', 'Sem 02', 'Sem 03')]
+    celdas += [(s, h, 'Ana', 0.0) for s in ('Sem 01', 'Sem 02', 'Sem 03') for h in ('Nat Distancia', 'Ciclismo Distancia', 'Trote Distancia')]
+    c = cubo(celdas, ['Sem 01', 'Sem 02', 'Sem 03']).cumplimiento
+    assert c.rachas[0, :, 0].tolist() == [1, 2, 3]
+    assert c.alertas(2, np.array([0])) == [(0, [('Agua', 3), ('Bici', 3), ('Trote', 3)])]
+    assert c.temporada(k=1) == [(0, 'Agua', 3)]
+
+def test_cumplimiento_ignora_semanas_que_la_disciplina_no_tiene():
+    celdas = [(s, 'Distancia Total', 'Ana', 10.0) for s in ('Sem 01', 'Sem 02')]
+    celdas += [('Sem 01', 'Nat Distancia', 'Ana', 0.0), ('Sem 01', 'Ciclismo Distancia', 'Ana', 5.0), ('Sem 01', 'Trote Distancia', 'Ana', 5.0)]
+    c = cubo(celdas, ['Sem 01', 'Sem 02']).cumplimiento  # 'Sem 02' no está en las hojas de disciplina
+    assert not c.faltas[0, 1].any()
+    assert c.faltas[0, 0].tolist() == [True, False, False]
+
+def test_nbytes_mientras_otro_hilo_llena_rankings_y_acumulados():
+    import threading
+    c = cubo([(f'Sem {w:02d}', h, f'A{a}', float(a * w)) for w in range(1, 30) for a in range(20) for h in ('Distancia Total', 'Tiempo Total')],
+             [f'Sem {w:02d}' for w in range(1, 30)])
+    def llenar():
+        for w in range(len(c.semanas)):
+            for m in range(len(c.metricas)): c.ranking.rangos(m, w); c.ranking.top(m, w)
+        for m in range(len(c.metricas)): c.acum(m); c.carga(m)
+    hilo = threading.Thread(target=llenar); hilo.start()
+    while hilo.is_alive(): c.nbytes()  # Antes: "dictionary changed size during iteration"
+    hilo.join()
+    assert c.nbytes() > c.valores.nbytes
+
+def test_derivados_se_arman_una_vez_aunque_los_pidan_varios_hilos():
+    from concurrent.futures import ThreadPoolExecutor
+    c = cubo([(f'Sem {w:02d}', 'Distancia Total', f'A{a}', float(a * w)) for w in range(1, 30) for a in range(50)], [f'Sem {w:02d}' for w in range(1, 30)])
+    with ThreadPoolExecutor(8) as pool:
+        r = list(pool.map(lambda _: (c.acum(0), c.carga(0), c.cumplimiento, c.ranking.rangos(0, 5), c.acum(0).media(4)), range(32)))
+    assert all(x is y for fila in r for x, y in zip(fila, r[0]))  # Todos los hilos leen el mismo derivado
+
+@pytest.mark.parametrize("celda, seg", [('01:02:03', 3723), ('12:30', 750), ('1 day, 02:00:00', 93600), ('1900-01-01 14:48:00', 53280),
+                                        ('0,5', 43200), ('NC', None), ('-', None), ('', None), (None, None), ('basura', None)])
+def test_parse_tiempos_texto(celda, seg):
+    v, ok = parse_tiempos([celda])
+    assert (int(v[0]), bool(ok[0])) == ((seg, True) if seg is not None else (0, False))
+
+def test_parse_tiempos_columnas_tipadas():
+    assert parse_tiempos(pd.Series([0.5, 0.25, None]))[0].tolist() == [43200, 21600, 0]  # Hora de Excel: fracción de día
+    assert parse_tiempos(pd.Series(pd.to_timedelta(['01:00:00', '26:00:00'])))[0].tolist() == [3600, 93600]
+    assert parse_tiempos(pd.Series(pd.to_datetime(['1900-01-01 14:48:00'])))[0].tolist() == [53280]
+
+def test_parse_numeros():
+    v, ok = parse_numeros(['3,5', '12.25', 'NC', 7, None, ' 4 '])
+    assert v.tolist() == [3.5, 12.25, 0, 7, 0, 4] and ok.tolist() == [True, True, False, True, False, True]
+    v, ok = parse_numeros(pd.Series([1.5, None]))
+    assert v.tolist() == [1.5, 0] and ok.tolist() == [True, False]
+
+def test_top_k_empates_y_umbral():
+    v = np.array([5, 3, 5, 0, 3, 3, 1, 0.0005])
+    assert top_k(v, k=2).tolist() == [0, 2]
+    assert top_k(v, k=3).tolist() == [0, 2, 1]  # Empatados con el k-ésimo: gana el orden de la hoja
+    assert top_k(v, k=10).tolist() == [0, 2, 1, 4, 5, 6]  # Sin actividad (<= umbral) no entra al podio
+
+def test_rangos_empatados_comparten_puesto():
+    c = cubo([('Sem 01', 'Distancia Total', n, x) for n, x in zip('ABCDE', [5.0, 3.0, 5.0, 0.0, 3.0])], ['Sem 01'])
+    m = c.pos_met['Distancia Total']
+    assert c.ranking.rangos(m, 0).tolist() == [1, 3, 1, 5, 3]
+    assert c.ranking.top(m, 0, 3).tolist() == [0, 2, 1]
@@ -0,0 +1,43 @@
+import functools
+import os
+import shutil
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from conftest import RAIZ
+import descargas
+from logic import cargar_procesar_datos, procesar_datos
+
+class Registro(SimpleHTTPRequestHandler):
+    codigos = []
+    def log_request(self, code='-', size='-'):
+        self.codigos.append(int(code))
+
+@pytest.fixture
+def servidor(tmp_path):
+    shutil.copy(os.path.join(RAIZ, "historico.xlsx"), tmp_path / "h.xlsx")
+    shutil.copy(os.path.join(RAIZ, "06 Sem (tst).xlsx"), tmp_path / "s.xlsx")
+    Registro.codigos = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Registro, directory=str(tmp_path)))
+    hilo = threading.Thread(target=srv.serve_forever, daemon=True); hilo.start()
+    descargas.olvidar(); procesar_datos.limpiar()
+    yield f"http://127.0.0.1:{srv.server_address[1]}", tmp_path
+    srv.shutdown(); srv.server_close()
+    descargas.olvidar(); procesar_datos.limpiar()
+
+def test_sin_cambios_responde_304_y_reusa_la_copia(servidor):
+    url, _ = servidor
+    d = descargas.obtener(f"{url}/h.xlsx")
+    assert descargas.obtener(f"{url}/h.xlsx") is d
+    assert Registro.codigos == [200, 304]
+
+def test_reusa_el_procesado_hasta_que_el_archivo_cambia(servidor):
+    url, carpeta = servidor
+    r = cargar_procesar_datos(f"{url}/h.xlsx", f"{url}/s.xlsx")
+    assert r[3] is None and len(r[0]) > 0
+    assert cargar_procesar_datos(f"{url}/h.xlsx", f"{url}/s.xlsx") is r  # Dos 304: mismo resultado, sin re-parsear
+    assert Registro.codigos == [200, 200, 304, 304]
+    t = os.stat(carpeta / "h.xlsx").st_mtime + 60; os.utime(carpeta / "h.xlsx", (t, t))  # Last-Modified nuevo
+    r2 = cargar_procesar_datos(f"{url}/h.xlsx", f"{url}/s.xlsx")
+    assert r2 is not r and r2[3] is None
+    assert sorted(Registro.codigos[4:]) == [200, 304]
@@ -0,0 +1,145 @@
+import io
+import os
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+from snapshot import agregados_versionados, tabla_cacheada
+from conftest import RAIZ
+from datos import VISTAS, cubo_ficha, leer_xlsx, cubo_desde_tabla
+from historial import AgregadorSemana, cargar_cubo_db, inicializar, agregar_semana, agregar_semanas, clave_temporada, inferir_semana, exportar_xlsx, respaldo_pendiente, marcar_respaldo, version_db, semanas_cambiadas, leer_alias, unir_nombres, _leer_celdas
+
+HISTORICO = os.path.join(RAIZ, "historico.xlsx")
+
+def semana(filas):
+    return pd.DataFrame(filas, columns=['hoja', 'nombre', 'valor'])
+
+@pytest.fixture
+def db(tmp_path):
+    ruta = str(tmp_path / "h.db")
+    inicializar(ruta, HISTORICO, str(tmp_path / "snaps"))
+    return ruta
+
+def test_exportar_relee_lo_mismo_que_la_semilla(db, tmp_path):
+    salida = tmp_path / "e.xlsx"; salida.write_bytes(exportar_xlsx(db, HISTORICO))
+    (t1, s1), (t2, s2) = leer_xlsx(HISTORICO), leer_xlsx(str(salida))
+    assert s1 == s2
+    pd.testing.assert_frame_equal(t1, t2)  # Celdas vacías siguen vacías (no 0 / '00:00:00')
+
+def test_exportar_conserva_hojas_y_columnas_de_la_plantilla(db):
+    wb = openpyxl.load_workbook(io.BytesIO(exportar_xlsx(db, HISTORICO)))
+    assert wb.sheetnames == openpyxl.load_workbook(HISTORICO).sheetnames
+    assert [c.value for c in wb['Tiempo Total'][1]][:4] == ['Posición', 'Nombre', 'Promedio', 'Tiempo Acumulado']
+
+def test_fusion_exportada_vuelve_a_sembrar_el_mismo_cubo(db, tmp_path):
+    agregar_semana(db, "Sem 08", semana([('Distancia Total', 'Rodrigo Araya', 12.5), ('Distancia Total', 'Atleta Nuevo', 3.0),
+                                         ('Tiempo Total', 'Atleta Nuevo', 3600.0), ('Tiempo Total', 'Rodrigo Araya', np.nan)]))
+    salida = tmp_path / "e.xlsx"; salida.write_bytes(exportar_xlsx(db, HISTORICO))
+    db2 = str(tmp_path / "h2.db"); inicializar(db2, str(salida))
+    (_, s1, t1), (_, s2, t2) = _leer_celdas(db), _leer_celdas(db2)
+    c1, c2 = cubo_desde_tabla(t1, s1), cubo_desde_tabla(t2, s2)
+    assert c1.semanas == c2.semanas and list(c1.nombres) == list(c2.nombres)
+    assert np.array_equal(c1.valores, c2.valores) and np.array_equal(c1.tiene_sem, c2.tiene_sem)
+
+def test_resembrar_el_mismo_excel_reusa_los_snapshots(db, tmp_path):
+    snaps = str(tmp_path / "snaps"); cubo = cargar_cubo_db(db, snaps)
+    db2 = str(tmp_path / "h2.db"); inicializar(db2, HISTORICO, snaps)
+    assert version_db(db2) == version_db(db)
+    assert isinstance(cargar_cubo_db(db2, snaps).valores, np.memmap)  # El cubo del primer almacén sirve al segundo
+    (t1, s1), (_, s2, t2) = leer_xlsx(HISTORICO), _leer_celdas(db2)
+    assert s1 == s2 and np.array_equal(cargar_cubo_db(db2, snaps).valores, cubo.valores)
+    pd.testing.assert_frame_equal(t1, tabla_cacheada(HISTORICO, None, snaps)[0])  # Semilla desde el snapshot, sin openpyxl
+    agregar_semana(db2, "Sem 08", semana([('Distancia Total', 'Rodrigo Araya', 12.5)]))
+    assert version_db(db2) != version_db(db) and semanas_cambiadas(db2, version_db(db), version_db(db2)) == {"Sem 08"}
+    assert semanas_cambiadas(db, version_db(db), version_db(db2)) is None
+
+def test_respaldo_pendiente_hasta_exportar(db):
+    assert respaldo_pendiente(db) == 0
+    agregar_semana(db, "Sem 08", semana([('Distancia Total', 'Rodrigo Araya', 12.5)]))
+    version = version_db(db)
+    agregar_semana(db, "Sem 09", semana([('Distancia Total', 'Rodrigo Araya', 10.0)]))
+    assert respaldo_pendiente(db) == 2
+    marcar_respaldo(db, version)  # Exportación anterior a la última fusión
+    assert respaldo_pendiente(db) == 1
+    marcar_respaldo(db, version_db(db))
+    assert respaldo_pendiente(db) == 0
+
+def test_semanas_cambiadas_entre_versiones(db):
+    v0 = version_db(db)
+    agregar_semana(db, "Sem 08", semana([('Distancia Total', 'Rodrigo Araya', 12.5)]))
+    agregar_semana(db, "Sem 09", semana([('Distancia Total', 'Rodrigo Araya', 10.0)]))
+    assert semanas_cambiadas(db, v0, version_db(db)) == {"Sem 08", "Sem 09"}
+    assert semanas_cambiadas(db, "otro:0", version_db(db)) is None
+
+def test_semana_recuperada_queda_en_su_lugar(db):
+    agregar_semanas(db, [("Sem 09", semana([('Distancia Total', 'Rodrigo Araya', 10.0)]))])
+    agregar_semanas(db, [("Sem 08", semana([('Distancia Total', 'Rodrigo Araya', 12.5)]))])
+    assert _leer_celdas(db)[1][-3:] == ['Sem 07', 'Sem 08', 'Sem 09']
+
+def test_lote_en_cualquier_orden_y_cruce_de_anio(db):
+    t = semana([('Distancia Total', 'Rodrigo Araya', 1.0)])
+    agregar_semanas(db, [("Sem 10", t), ("Sem 49", t), ("Sem 8", t), ("Pretemporada", t)])
+    s = _leer_celdas(db)[1]
+    assert s[0] == 'Sem 49' and s[-4:] == ['Sem 07', 'Sem 8', 'Sem 10', 'Pretemporada']
+
+def test_clave_temporada_cruza_el_anio():
+    c = clave_temporada(['Sem 02', 'Sem 51', 'Sem 52', 'Sem 01', 'Sem 10', 'Sem 6', 'Libre'])
+    assert sorted((k, s) for s, k in c.items() if k is not None) == [(0, 'Sem 51'), (1, 'Sem 52'), (3, 'Sem 01'), (4, 'Sem 02'), (8, 'Sem 6'), (12, 'Sem 10')]
+    assert c['Libre'] is None
+
+@pytest.mark.parametrize("archivo, semana_", [("06 Sem (tst).xlsx", "Sem 06"), ("semana_6.xlsx", "Sem 06"), ("Sem 10.csv", "Sem 10"),
+                                              ("reportes/Sem-52.xlsx", "Sem 52"), ("resumen.xlsx", None)])
+def test_inferir_semana(archivo, semana_):
+    assert inferir_semana(archivo) == semana_
+
+def test_parecido_no_se_une_hasta_confirmarlo(db):
+    rep = agregar_semana(db, "Sem 08", semana([('Distancia Total', 'Rodrigo Arayaa', 12.5)]))
+    assert rep['sugeridos'] == {'Rodrigo Arayaa': 'Rodrigo Araya'}
+    assert leer_alias(db).empty
+    nombres = set(_leer_celdas(db)[2]['nombre'])
+    assert 'Rodrigo Arayaa' in nombres
+    unir_nombres(db, {'Rodrigo Arayaa': 'Rodrigo Araya'})
+    c = _leer_celdas(db)[2]
+    assert 'Rodrigo Arayaa' not in set(c['nombre'])
+    assert c[(c['semana'] == 'Sem 08') & (c['nombre'] == 'Rodrigo Araya')]['valor'].tolist() == [12.5]
+    assert agregar_semana(db, "Sem 09", semana([('Distancia Total', 'Rodrigo Arayaa', 3.0)]))['sugeridos'] == {}  # Ahora es alias
+
+def test_agregador_combina_filas_del_mismo_deportista():
+    bloque = pd.DataFrame({'Deportista': ['Ana', 'Beto', 'ana ', 'Totales', 'Promedio'],
+                           'Distancia Total (km)': [10.0, 7.0, 5.0, 22.0, 7.3], 'Trote: Más larga (km)': [12.0, 8.0, 15.0, 15.0, 0],
+                           'CV (Equilibrio)': [0.8, 0.5, 0.6, 0, 0], 'Trote: Distancia (km)': [10.0, 0.0, 5.0, 15.0, 0],
+                           'Trote: Ritmo (min/km)': ['05:00', '04:30', '06:00', '05:20', '05:20']})
+    def valores(ag):
+        t = ag.tabla(); return {(h, n): v for h, n, v in t[['hoja', 'nombre', 'valor']].itertuples(index=False)}
+    ag = AgregadorSemana(); ag.agregar(bloque.copy())
+    v = valores(ag)
+    assert {n for _, n in v} == {'Ana', 'Beto'}  # Totales/promedio fuera; nombres repetidos se juntan
+    assert v[('Distancia Total', 'Ana')] == 15 and v[('Trote Max', 'Ana')] == 15 and v[('CV', 'Ana')] == pytest.approx(0.6)  # CV: el último
+    assert v[('Trote Ritmo', 'Ana')] == 320  # (300·10 + 360·5) / 15: ponderado por distancia
+    assert v[('Trote Ritmo', 'Beto')] == 270  # Sin distancia: queda el último ritmo
+    por_bloques = AgregadorSemana(); por_bloques.agregar(bloque.iloc[:2].copy()); por_bloques.agregar(bloque.iloc[2:].copy())
+    assert valores(por_bloques) == v
+
+def test_ficha_de_un_atleta_igual_al_cubo_completo(db, tmp_path):
+    snaps = str(tmp_path / "snaps")
+    cubo = cargar_cubo_db(db, snaps)
+    mapeado = cargar_cubo_db(db, snaps)  # Desde el snapshot: valores y puestos mapeados en memoria
+    agregados_versionados(mapeado, snaps); agregados = agregados_versionados(cargar_cubo_db(db, snaps), snaps)
+    assert isinstance(agregados[1], np.memmap)
+    vc = cubo.vistas(); base = vc['Global']['D']
+    for nombre in base.nombres:
+        ficha = cubo_ficha(mapeado, agregados, nombre); vf = ficha.vistas()
+        a, b = cubo.buscar(nombre), ficha.buscar(nombre)
+        assert len(ficha.nombres) == 1 and ficha.nombres[b] == cubo.nombres[a]
+        for cat, claves in VISTAS.items():
+            for k in claves:
+                h, f = vc[cat][k], vf[cat][k]
+                assert (h is None) == (f is None)
+                if h is None: continue
+                assert list(h.nombres) == list(f.nombres) and h.semanas == f.semanas and h.contiene(a) == f.contiene(b)
+                assert all(h.media_semana(s) == f.media_semana(s) for s in h.semanas)
+                if not h.contiene(a): continue
+                assert h.trayectoria(a) == f.trayectoria(b)
+                assert all(h.valor(a, s) == f.valor(b, s) and h.carga(a, s) == f.carga(b, s) for s in h.semanas)
+                assert all(h.media(a, u) == f.media(b, u) for u in (None, 4, 12))
+    assert cubo_ficha(mapeado, agregados).buscar(base.nombres[0]) is None  # Sin atleta: solo el buscador
@@ -0,0 +1,64 @@
+import io
+import os
+import pandas as pd
+from datos import cubo_desde_tabla
+from descargas import Descarga
+from logic import memo_versionado, procesar_datos, procesar_con_cubo
+
+SEMANAS = ['Sem 50', 'Sem 51', 'Sem 52', 'Sem 01']
+ATLETAS = {'Ana Pérez': ([3600, 0, 5400, 4000], [30.0, 0.0, 45.5, 20.0]),
+           'Rodrigo Araya': ([7200, 6300, 0, 1800], [60.0, 52.0, 0.0, 10.0]),
+           'Luis Soto': ([0, 1200, 2400, 3000], [0.0, 8.0, 16.0, 21.0])}
+
+def hms(s):
+    return f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+
+def historico_xlsx(ruta, semanas):
+    ws = [SEMANAS.index(s) for s in semanas]
+    with pd.ExcelWriter(ruta) as w:
+        pd.DataFrame([[n] + [hms(t[i]) for i in ws] for n, (t, _) in ATLETAS.items()], columns=['Nombre'] + semanas).to_excel(w, sheet_name='Tiempo Total', index=False)
+        pd.DataFrame([[n] + [d[i] for i in ws] for n, (_, d) in ATLETAS.items()], columns=['Nombre'] + semanas).to_excel(w, sheet_name='Distancia Total', index=False)
+
+def cubo():
+    tabla = pd.DataFrame([(s, h, n, v[k][i]) for n, v in ATLETAS.items() for k, h in enumerate(['Tiempo Total', 'Distancia Total'])
+                          for i, s in enumerate(SEMANAS)], columns=['semana', 'hoja', 'nombre', 'valor'])
+    return cubo_desde_tabla(tabla, SEMANAS)
+
+def test_cubo_da_el_mismo_reporte_que_el_excel(tmp_path):
+    semanal = tmp_path / "s.xlsx"
+    pd.DataFrame({'Nombre': ['ana perez', 'Rodrigo Araya', 'Atleta Nuevo'], 'Tiempo Total (hh:mm:ss)': ['01:30:00', '02:00:00', '00:45:00'],
+                  'Distancia Total (km)': [40.0, 55.0, 12.0]}).to_excel(semanal, index=False)
+    historico = tmp_path / "h.xlsx"; historico_xlsx(historico, SEMANAS[:-1])  # El reporte no ve la semana que se reemplaza
+    a = procesar_datos.__wrapped__(str(historico), str(semanal))
+    b = procesar_con_cubo(cubo(), str(semanal), excluir={'Sem 01'})
+    assert a[3] is None and b[3] is None
+    assert a[1:] == b[1:] and a[0] == b[0]
+    assert [r['metrics']['tot_dist']['hist_txt'] for r in b[0]] == ['+2.2', '-1.0', 'New']  # Medias de semanas con actividad: 37.75 y 56
+
+def contador(maximo=8):
+    llamadas = []
+    @memo_versionado(maximo)
+    def fn(*args):
+        llamadas.append(args); return object()
+    return fn, llamadas
+
+def test_memo_reusa_mientras_el_archivo_no_cambia(tmp_path):
+    fn, llamadas = contador(); ruta = tmp_path / "h.xlsx"; ruta.write_bytes(b"v1")
+    r = fn(str(ruta))
+    assert fn(str(ruta)) is r and len(llamadas) == 1
+    ruta.write_bytes(b"v2 con otro largo"); os.utime(ruta, ns=(1, 1))
+    assert fn(str(ruta)) is not r and len(llamadas) == 2
+
+def test_memo_no_cachea_archivos_en_memoria():
+    fn, llamadas = contador(); buf = io.BytesIO(b"v1")
+    fn(buf); buf.seek(0); buf.truncate(); buf.write(b"v2")
+    fn(buf); fn(io.BytesIO(b"v1"))  # Mismo objeto con otro contenido, y contenido igual en otro objeto
+    assert len(llamadas) == 3
+
+def test_memo_descargas_por_version_y_tope():
+    fn, llamadas = contador(maximo=2)
+    a, a2, b = Descarga("http://x/h.xlsx", b"1", etag='"1"'), Descarga("http://x/h.xlsx", b"1", etag='"1"'), Descarga("http://x/h.xlsx", b"2", etag='"2"')
+    r = fn(a)
+    assert fn(a2) is r and len(llamadas) == 1  # Otra bajada de la misma versión (304)
+    fn(b); fn("otra"); fn(a)  # Con tope 2, la versión más vieja ya salió
+    assert len(llamadas) == 4
@@ -0,0 +1,32 @@
+from nombres import IndiceNombres, plegar, resolver_lote
+
+PLANTEL = ['Maria Gonzalez', 'Juan Perez', 'José Pérez Díaz', 'Ana Soto', 'Ana Sotomayor']
+
+def test_plegar():
+    assert plegar("  José  PÉREZ-Díaz ") == "jose perez diaz"
+
+def test_resolver_seguros():
+    i = IndiceNombres(PLANTEL, alias={'Jota Perez': 'José Pérez Díaz'})
+    assert i.resolver('Juan Perez')[:2] == ('Juan Perez', 'exacto')
+    assert i.resolver('  juan   PEREZ ')[:2] == ('Juan Perez', 'exacto')
+    assert i.resolver('Perez Diaz Jose')[:2] == ('José Pérez Díaz', 'normalizado')
+    assert i.resolver('jota pérez')[:2] == ('José Pérez Díaz', 'alias')
+
+def test_parecidos_se_sugieren_sin_unir():
+    i = IndiceNombres(PLANTEL)
+    assert i.resolver('Mario Gonzalez')[:2] == ('Maria Gonzalez', 'aproximado')
+    mapa, rep = resolver_lote(i, ['Mario Gonzalez', 'Juana Perez', 'Perez Juan'])
+    assert mapa == {'Mario Gonzalez': 'Mario Gonzalez', 'Juana Perez': 'Juana Perez', 'Perez Juan': 'Juan Perez'}
+    assert rep['sugeridos'] == {'Mario Gonzalez': 'Maria Gonzalez', 'Juana Perez': 'Juan Perez'}
+    assert rep['unidos'] == {'Perez Juan': 'Juan Perez'} and rep['nuevos'] == []
+
+def test_nuevo_y_ambiguo():
+    i = IndiceNombres(PLANTEL + ['Soto Ana'])
+    assert i.resolver('Pedro Rojas')[:2] == (None, 'nuevo')
+    assert i.resolver('ana soto')[:2] == ('Ana Soto', 'exacto')
+    assert i.resolver('Soto, Ana.')[1] == 'ambiguo'  # Mismas palabras que dos deportistas del plantel
+
+def test_dos_nombres_de_la_carga_no_se_quedan_con_el_mismo_deportista():
+    mapa, rep = resolver_lote(IndiceNombres(PLANTEL), ['Juan Perez', 'Perez Juan'])
+    assert mapa['Juan Perez'] == 'Juan Perez' and mapa['Perez Juan'] == 'Perez Juan'
+    assert 'Perez Juan' in rep['ambiguos']
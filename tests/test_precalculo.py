@@ -0,0 +1,15 @@
+import pandas as pd
+import precalculo
+from datos import cubo_desde_tabla
+
+def cubo(version, km):
+    c = cubo_desde_tabla(pd.DataFrame([('Sem 01', 'Distancia Total', 'Ana', km)], columns=['semana', 'hoja', 'nombre', 'valor']), ['Sem 01'])
+    c.version = version
+    return c
+
+def test_kpis_guarda_solo_la_ultima_version_del_club():
+    for version, km in (('x:1', 10.0), ('x:2', 12.0)):
+        dict(precalculo.tareas("Club Test", cubo(version, km)))["KPIs"]()
+    assert precalculo.kpis("Club Test", 'x:2')['D'] == 12.0
+    assert precalculo.kpis("Club Test", 'x:1') is None
+    assert [c for c in precalculo._kpis if "Club Test" in str(c)] == ["Club Test"]  # Una entrada por club, no por versión